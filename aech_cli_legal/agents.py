@@ -0,0 +1,224 @@
+"""Shared pydantic-ai agents and keep-alive HTTP clients for LLM-powered commands.
+
+Agents are cached per (model name, result type, model settings) and every
+provider gets one pooled `httpx.AsyncClient`. All LLM calls run on a single
+long-lived event loop so pooled connections survive between calls; running
+each call under its own `asyncio.run` would orphan them and force a fresh
+TLS handshake every time.
+
+Validated results can be cached on disk (see `llm_cache_key`): a repeated
+classify/analyze/extract-edits call for the same model, settings, prompt
+version and input text is answered from the cache without an LLM round trip.
+
+pydantic-ai and httpx are imported on first use to keep CLI startup light.
+"""
+
+import asyncio
+import atexit
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Coroutine, Optional, TypeVar
+
+from .cache import DiskCache, shared_cache
+from .cache import cache_key as _cache_key
+from .model_utils import get_model_settings, parse_model_string
+
+if TYPE_CHECKING:
+    import httpx
+    from pydantic_ai import Agent
+
+DEFAULT_MODEL = "openai:gpt-4o"
+
+# Connection pool sizing per provider; keep-alive connections idle longer
+# than KEEPALIVE_EXPIRY seconds are closed.
+MAX_CONNECTIONS = 32
+MAX_KEEPALIVE_CONNECTIONS = 16
+KEEPALIVE_EXPIRY = 120.0
+
+# LLM response cache bounds, overridable via AECH_LEGAL_LLM_CACHE_MAX_MB / _TTL (seconds).
+LLM_CACHE_MAX_MB = 256
+LLM_CACHE_TTL = 7 * 24 * 3600
+
+T = TypeVar("T")
+
+_LOCK = threading.Lock()
+_AGENTS: dict[tuple[str, type, str], "Agent"] = {}
+_HTTP_CLIENTS: dict[str, "httpx.AsyncClient"] = {}
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_RATE_LIMITERS: dict[tuple[str, float], "RateLimiter"] = {}
+
+
+class RateLimiter:
+    """Async limiter that spaces requests evenly to stay under per_minute."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until the next request slot is available."""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def get_model_string() -> str:
+    """Get the configured LLM model string (with @settings) from environment."""
+    return os.environ.get("AECH_LLM_WORKER_MODEL", DEFAULT_MODEL)
+
+
+def _settings_key(settings: Any) -> str:
+    """Hashable form of a ModelSettings dict."""
+    return json.dumps(settings, sort_keys=True, default=str) if settings else ""
+
+
+def http_client(name: str, timeout: Optional["httpx.Timeout"] = None) -> "httpx.AsyncClient":
+    """Return the pooled keep-alive HTTP client registered under name (an LLM provider or another service).
+
+    The client must be used on the shared event loop (see `run_coroutine`).
+    timeout (default: 600 s, 5 s to connect) applies when the client is created.
+    """
+    import httpx
+
+    client = _HTTP_CLIENTS.get(name)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=timeout or httpx.Timeout(600, connect=5),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
+        _HTTP_CLIENTS[name] = client
+    return client
+
+
+def _provider(provider_name: str):
+    """Build a provider that uses the pooled HTTP client where the provider supports one."""
+    from pydantic_ai.providers import infer_provider, infer_provider_class
+
+    if provider_name.startswith(("gateway/", "google-")):
+        return infer_provider(provider_name)
+    try:
+        return infer_provider_class(provider_name)(http_client=http_client(provider_name))
+    except TypeError:
+        return infer_provider(provider_name)
+
+
+def get_agent(result_type: type[T], model_string: Optional[str] = None) -> "Agent[None, T]":
+    """Return the shared agent for result_type under the configured model."""
+    from pydantic_ai import Agent
+    from pydantic_ai.models import infer_model
+
+    model_string = model_string or get_model_string()
+    model_name, _ = parse_model_string(model_string)
+    model_settings = get_model_settings(model_string)
+    key = (model_name, result_type, _settings_key(model_settings))
+
+    with _LOCK:
+        agent = _AGENTS.get(key)
+        if agent is None:
+            model = infer_model(model_name, provider_factory=_provider)
+            agent = Agent(model, output_type=result_type, model_settings=model_settings)
+            _AGENTS[key] = agent
+    return agent
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop that owns all LLM I/O, starting it if needed."""
+    global _LOOP
+    with _LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            thread = threading.Thread(target=_LOOP.run_forever, name="aech-llm-loop", daemon=True)
+            thread.start()
+            atexit.register(_shutdown)
+    return _LOOP
+
+
+def run_coroutine(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the shared LLM event loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop()).result()
+
+
+def llm_cache() -> DiskCache:
+    """Return the on-disk cache of validated LLM results."""
+    max_mb = float(os.environ.get("AECH_LEGAL_LLM_CACHE_MAX_MB", LLM_CACHE_MAX_MB))
+    ttl = float(os.environ.get("AECH_LEGAL_LLM_CACHE_TTL", LLM_CACHE_TTL))
+    return shared_cache("llm", max_bytes=int(max_mb * 1024 * 1024), ttl=ttl)
+
+
+def llm_cache_key(result_type: type, prompt_version: str, text: str) -> str:
+    """Key a result by model string, settings, result type, prompt template version and input text."""
+    model_string = get_model_string()
+    model_name, _ = parse_model_string(model_string)
+    settings = _settings_key(get_model_settings(model_string))
+    return _cache_key(model_name, settings, result_type.__name__, prompt_version, text)
+
+
+def rate_limiter(per_minute: float, model_string: Optional[str] = None) -> RateLimiter:
+    """Return the shared limiter for the model's provider at the given requests per minute."""
+    model_name, _ = parse_model_string(model_string or get_model_string())
+    key = (model_name.split(":", 1)[0], per_minute)
+    with _LOCK:
+        limiter = _RATE_LIMITERS.get(key)
+        if limiter is None:
+            limiter = _RATE_LIMITERS[key] = RateLimiter(per_minute)
+    return limiter
+
+
+async def run_async(
+    result_type: type[T],
+    prompt: str,
+    cache_key: Optional[str] = None,
+    rate_limit: Optional[float] = None,
+) -> T:
+    """Async form of `run_sync`; must be awaited on the shared loop (see `run_coroutine`).
+
+    rate_limit caps LLM requests per minute for the configured provider;
+    cache hits do not count against it.
+    """
+    if cache_key is not None:
+        cached = llm_cache().get(cache_key)
+        if cached is not None:
+            return result_type.model_validate(cached)
+
+    if rate_limit:
+        await rate_limiter(rate_limit).acquire()
+    output = (await get_agent(result_type).run(prompt)).output
+
+    if cache_key is not None:
+        llm_cache().put(cache_key, output.model_dump(mode="json"))
+    return output
+
+
+def run_sync(result_type: type[T], prompt: str, cache_key: Optional[str] = None) -> T:
+    """Run prompt through the shared agent for result_type and return the validated output.
+
+    When cache_key is given (see `llm_cache_key`) a cached result is returned
+    if present, and a fresh result is stored under that key.
+    """
+    return run_coroutine(run_async(result_type, prompt, cache_key=cache_key))
+
+
+def _shutdown() -> None:
+    """Close pooled HTTP clients and stop the loop at interpreter exit."""
+    if _LOOP is None:
+        return
+
+    async def close_clients():
+        for client in _HTTP_CLIENTS.values():
+            await client.aclose()
+
+    try:
+        asyncio.run_coroutine_threadsafe(close_clients(), _LOOP).result(timeout=5)
+    except Exception:
+        pass
+    _LOOP.call_soon_threadsafe(_LOOP.stop)
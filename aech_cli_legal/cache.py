@@ -0,0 +1,166 @@
+"""On-disk, content-addressed JSON cache with LRU eviction and TTL.
+
+Entries live under $AECH_LEGAL_CACHE_DIR (default ~/.cache/aech-cli-legal),
+one directory per namespace, sharded by the first two hex digits of the key:
+
+    <root>/<namespace>/ab/abcdef....json
+
+Each entry records its creation time (for TTL); the file mtime is bumped on
+every hit and serves as the last-access time for LRU eviction.
+
+Eviction lists every entry of the namespace, so put() does not run it every
+time: an entry of n bytes triggers it with probability n / (EVICT_SLACK *
+max_bytes), decided by the entry's key. On average one scan runs per
+EVICT_SLACK of the budget written, from however many processes, and a
+namespace overshoots max_bytes by about that much before it is trimmed.
+
+Commands get their caches from `shared_cache`, keyed by the resolved cache
+directory and settings, so a daemon request that sets AECH_LEGAL_CACHE_DIR
+or a cache limit gets a cache that honours it.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Share of max_bytes written, on average, between two eviction scans.
+EVICT_SLACK = 0.1
+
+_SHARED: dict[tuple, "DiskCache"] = {}
+
+
+def cache_root() -> Path:
+    """Return the root cache directory (AECH_LEGAL_CACHE_DIR overrides the default)."""
+    default = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "aech-cli-legal"
+    return Path(os.environ.get("AECH_LEGAL_CACHE_DIR", default))
+
+
+def cache_key(*parts: Any) -> str:
+    """Hash arbitrary JSON-serializable parts into a hex cache key."""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """Size-bounded JSON key/value store under one cache namespace."""
+
+    def __init__(self, namespace: str, max_bytes: int = DEFAULT_MAX_BYTES, ttl: Optional[float] = None):
+        self.namespace = namespace
+        self.directory = cache_root() / namespace
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _entries(self) -> list[tuple[Path, os.stat_result]]:
+        if not self.directory.exists():
+            return []
+        entries = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    try:
+                        entries.append((Path(entry.path), entry.stat()))
+                    except FileNotFoundError:
+                        continue
+        return entries
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on miss or expiry."""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if self.ttl is not None and time.time() - entry.get("created", 0) > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            pass
+        return entry["value"]
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under key, evicting old entries if over budget (amortized)."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        payload = json.dumps({"created": time.time(), "value": value}, separators=(",", ":")).encode("utf-8")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(payload)
+        os.replace(tmp, path)
+
+        draw = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=4).digest(), "big") / 2**32
+        if draw < len(payload) / (EVICT_SLACK * self.max_bytes):
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop least-recently-used entries until the namespace fits max_bytes."""
+        entries = self._entries()
+        total = sum(st.st_size for _, st in entries)
+        if total <= self.max_bytes:
+            return 0
+
+        removed = 0
+        for path, st in sorted(entries, key=lambda item: item[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= st.st_size
+            removed += 1
+        return removed
+
+    def prune(self) -> dict:
+        """Remove expired entries, then evict down to max_bytes."""
+        expired = 0
+        if self.ttl is not None:
+            now = time.time()
+            for path, _ in self._entries():
+                try:
+                    created = json.loads(path.read_text(encoding="utf-8")).get("created", 0)
+                except (FileNotFoundError, ValueError):
+                    created = 0
+                if now - created > self.ttl:
+                    path.unlink(missing_ok=True)
+                    expired += 1
+        return {"expired": expired, "evicted": self.evict()}
+
+    def clear(self) -> int:
+        """Remove every entry in the namespace."""
+        entries = self._entries()
+        for path, _ in entries:
+            path.unlink(missing_ok=True)
+        return len(entries)
+
+    def stats(self) -> dict:
+        """Return entry count and size for the namespace."""
+        entries = self._entries()
+        return {
+            "namespace": self.namespace,
+            "directory": str(self.directory),
+            "entries": len(entries),
+            "bytes": sum(st.st_size for _, st in entries),
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+        }
+
+
+def shared_cache(namespace: str, max_bytes: int = DEFAULT_MAX_BYTES, ttl: Optional[float] = None) -> DiskCache:
+    """Return the process-wide cache of namespace for the current cache root and these settings."""
+    key = (namespace, str(cache_root().expanduser().resolve()), max_bytes, ttl)
+    cache = _SHARED.get(key)
+    if cache is None:
+        cache = _SHARED[key] = DiskCache(namespace, max_bytes=max_bytes, ttl=ttl)
+    return cache
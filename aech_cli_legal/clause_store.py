@@ -0,0 +1,1298 @@
+"""On-disk precedent clause store: memory-mapped embeddings plus SQLite metadata.
+
+Layout under clause_store_dir() ($AECH_LEGAL_CLAUSE_STORE, default
+$XDG_DATA_HOME/aech-cli-legal/clauses):
+
+    vectors.f32     row-major float32 matrix, one L2-normalized row per clause
+    lengths.u32     clause lengths in terms, parallel to the vectors (BM25)
+    minhash.u32     MinHash signatures, parallel to the vectors (see minhash.py)
+    lexicon/        BM25 posting-list segments (see lexical.py)
+    text.blob       UTF-8 text of every indexed document, one line per
+                    paragraph or table, appended as documents are indexed
+    clauses.sqlite  clause text (one row per distinct text; clauses.row is its
+                    vector row) and near-duplicate cluster, the deal references
+                    to each clause, LSH buckets, and the digest of every
+                    indexed document
+    ivf/            optional IVF index (see ivf.py), built by `clauses build-index`
+                    into a new directory per build; meta "ivf_build" names
+                    the current one
+    filters/        metadata columns and bitmaps for search filters (see
+                    filters.py), rebuilt on first use after each write
+
+Search maps vectors.f32 read-only, so opening a store costs nothing and
+the OS pages rows in as the dot product touches them. Flat search scores
+every row with one matrix-vector product; IVF search scores only the rows
+of the nprobe nearest k-means lists, plus any rows added since the index
+was built. Either way the top k are picked with argpartition, which is
+O(n) rather than a full sort. Lexical search scores BM25 from the posting
+lists alone, without embedding the query; hybrid search fuses the vector
+and lexical rankings with reciprocal rank fusion.
+
+Clauses are deduplicated by a hash of their normalized text (case,
+punctuation and numbering ignored), so boilerplate that recurs across
+deals is embedded and stored once, with one clause_refs row per deal
+and document it appears in.
+
+Near-duplicates (the same boilerplate with different party names, say) are
+grouped into clusters as they are indexed: each new clause's LSH buckets
+are looked up and it joins the cluster of its most similar confirmed
+candidate, or starts its own (clauses.cluster is the row that started
+it). That is a fixed amount of work per clause, so clustering stays
+linear as deals are added and earlier assignments never change. Search
+returns the best-ranked clause of each cluster with a count of its
+variants.
+
+Writes hold SQLite's write lock for a whole batch of documents, append
+vectors, lengths and one posting segment first and then commit the
+metadata together with the new row count and segment list. A crash in
+between leaves trailing rows, which the next writer truncates, and an
+unlisted segment, which the next merge removes. A merge keeps the
+segments it replaced until the following merge, as a search that read
+the old segment list may still open them. Re-indexing a
+document replaces its references; clauses no longer referenced by any
+document are deleted and their vectors and lengths zeroed, so they drop
+out of both rankings.
+
+clause_refs and documents hold byte offsets into text.blob, so a clause's
+surrounding lines are read with one seek into a memory map (context())
+rather than by reopening the DOCX. The blob is append-only: re-indexing a
+document appends its new text and leaves the old copy unreferenced.
+
+Every write that can change search results bumps meta "generation".
+Search results are cached on disk (search_cache()) under the store's id,
+its generation and the search parameters, so a repeated search is one
+small file read and is never served once the store has changed. Query
+embeddings are also kept in memory per process, which the daemon
+(`aech-cli-legal serve`) reuses across requests.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import shutil
+import sqlite3
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+from .cache import DiskCache, cache_key, shared_cache
+from .embeddings import DEFAULT_EMBEDDER, Embedder, create_embedder
+from .filters import FORMAT as FILTERS_FORMAT, ClauseFilter, FilterColumns
+from .ivf import DEFAULT_NPROBE, KMEANS_ITERATIONS, IVFIndex, default_nlist
+from .lexical import MAX_SEGMENTS, Segment, merge
+from .lexical import search as bm25_search
+from .minhash import DTYPE as SIGNATURE_DTYPE
+from .minhash import NUM_PERM, THRESHOLD, band_keys, is_empty, signatures, similarity
+from .ooxml import Block, block_to_markdown
+from .section_index import outline
+
+VECTORS_FILE = "vectors.f32"
+LENGTHS_FILE = "lengths.u32"
+MINHASH_FILE = "minhash.u32"
+LEXICON_DIR = "lexicon"
+TEXT_FILE = "text.blob"
+FILTERS_DIR = "filters"
+DB_FILE = "clauses.sqlite"
+# Bumped when the SQLite layout changes; older stores must be re-indexed.
+SCHEMA_VERSION = "2"
+DTYPE = np.float32
+LENGTH_DTYPE = np.uint32
+IVF_DIR = "ivf"
+INDEX_TYPES = ("flat", "ivf")
+SEARCH_MODES = ("vector", "lexical", "hybrid")
+
+# New clauses are embedded this many at a time.
+EMBED_BATCH = 1024
+# Documents per worker process before a pool is worth its start-up cost.
+PARALLEL_MIN_DOCUMENTS = 2
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# Reciprocal rank fusion: score = sum of 1 / (RRF_K + rank) over the rankings.
+RRF_K = 60
+# Candidates taken from each ranking before fusion (at least 4 * top_k).
+HYBRID_CANDIDATES = 50
+# Search ranks this many times top_k rows before keeping one per cluster,
+# and widens by the same factor while clusters leave fewer than top_k.
+CLUSTER_OVERFETCH = 4
+# Most recent rows of one LSH bucket compared against a new clause; bounds
+# the work per clause when a boilerplate cluster grows large.
+BUCKET_SAMPLE = 32
+
+# Search result cache bound, overridable via AECH_LEGAL_SEARCH_CACHE_MAX_MB.
+SEARCH_CACHE_MAX_MB = 64
+# Query embeddings kept in memory per process, least recently used dropped first.
+QUERY_CACHE_SIZE = 256
+
+# Sections whose text (subsections included) fits in this many characters
+# are stored as one clause; larger ones are split into their subsections.
+MAX_CLAUSE_CHARS = 4000
+
+# Canonical clause types and the phrases that identify them, checked
+# against the clause heading first and then the opening of its text.
+CLAUSE_TYPES = {
+    "definitions": ("definition", "interpretation"),
+    "indemnification": ("indemnif", "hold harmless"),
+    "limitation of liability": ("limitation of liability", "limitations on liability", "liability cap", "aggregate liability"),
+    "representations and warranties": ("representation", "warrant"),
+    "covenants": ("covenant",),
+    "conditions": ("conditions to", "condition precedent", "closing condition"),
+    "purchase price": ("purchase price", "consideration", "payment"),
+    "termination": ("terminat",),
+    "confidentiality": ("confidential", "non-disclosure"),
+    "non-competition": ("non-compet", "noncompet", "non-solicit", "restrictive covenant"),
+    "intellectual property": ("intellectual property",),
+    "governing law": ("governing law", "choice of law"),
+    "dispute resolution": ("arbitrat", "dispute", "jurisdiction", "venue"),
+    "assignment": ("assignment", "successors and assigns"),
+    "notices": ("notice",),
+    "force majeure": ("force majeure",),
+    "insurance": ("insurance",),
+    "miscellaneous": ("miscellaneous", "general provisions", "entire agreement", "severab", "counterpart"),
+}
+_TYPE_PROBE_CHARS = 300
+
+_META_SCHEMA = "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS clauses (
+    row INTEGER PRIMARY KEY,
+    text_hash TEXT NOT NULL UNIQUE,
+    heading TEXT NOT NULL,
+    clause_type TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS clause_refs (
+    clause_id TEXT PRIMARY KEY,
+    row INTEGER NOT NULL,
+    deal_name TEXT NOT NULL,
+    deal_date TEXT,
+    source TEXT NOT NULL,
+    section TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS clause_refs_by_row ON clause_refs (row);
+CREATE INDEX IF NOT EXISTS clause_refs_by_source ON clause_refs (deal_name, source);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    bucket INTEGER NOT NULL,
+    row INTEGER NOT NULL,
+    PRIMARY KEY (bucket, row)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS documents (
+    deal_name TEXT NOT NULL,
+    source TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    clauses INTEGER NOT NULL,
+    PRIMARY KEY (deal_name, source)
+);
+"""
+# Columns added after SCHEMA_VERSION 2 was released; NULL for rows written before.
+_ADDED_COLUMNS = (
+    ("clause_refs", "text_start", "INTEGER"),  # Byte span of the clause in text.blob
+    ("clause_refs", "text_end", "INTEGER"),
+    ("documents", "text_start", "INTEGER"),  # Byte span of the whole document
+    ("documents", "text_end", "INTEGER"),
+    ("clause_refs", "contract_type", "TEXT"),
+    ("clause_refs", "jurisdiction", "TEXT"),
+    ("clauses", "cluster", "INTEGER"),  # Near-duplicate cluster; NULL until signed (see cluster_rows)
+)
+_ADDED_INDEXES = "CREATE INDEX IF NOT EXISTS clauses_by_cluster ON clauses (cluster);"
+# Bump when _SCHEMA, _ADDED_COLUMNS or _ADDED_INDEXES change, so existing databases are upgraded on open.
+_LAYOUT = 4
+
+_REF_COLUMNS = ("deal_name", "deal_date", "contract_type", "jurisdiction", "clause_id", "section", "source")
+# SQLite's default limit on host parameters per statement is 999.
+_IN_CHUNK = 500
+
+_EMBEDDERS: dict[tuple[str, str], Embedder] = {}  # By embedder name and recorded config
+_QUERY_VECTORS: "OrderedDict[tuple[str, str, str], np.ndarray]" = OrderedDict()
+
+
+def clause_store_dir() -> Path:
+    """Return the clause store directory (AECH_LEGAL_CLAUSE_STORE overrides the default)."""
+    default = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share")) / "aech-cli-legal" / "clauses"
+    return Path(os.environ.get("AECH_LEGAL_CLAUSE_STORE", default))
+
+
+def search_cache() -> DiskCache:
+    """Return the on-disk cache of clause search results."""
+    max_mb = float(os.environ.get("AECH_LEGAL_SEARCH_CACHE_MAX_MB", SEARCH_CACHE_MAX_MB))
+    return shared_cache("clause-search", max_bytes=int(max_mb * 1024 * 1024))
+
+
+def normalize_query(query: str) -> str:
+    """Query text as searched and cached: leading, trailing and repeated whitespace collapsed."""
+    return " ".join(query.split())
+
+
+@dataclass
+class Clause:
+    """One clause extracted from a document."""
+    section: str  # Qualified section number, e.g. "2.1(a)"; "" for unnumbered sections
+    heading: str  # Own title, or the nearest enclosing heading
+    clause_type: str
+    text: str
+    start: int  # Block range in the source document
+    end: int
+    text_hash: str = ""  # See text_hash(); computed from embedding_text() if not given
+
+    def __post_init__(self):
+        if not self.text_hash:
+            self.text_hash = text_hash(self.embedding_text())
+
+    def embedding_text(self) -> str:
+        return f"{self.heading}\n{self.text}" if self.heading else self.text
+
+
+@dataclass
+class IndexedDocument:
+    """A document's clauses, ready to be written to the store."""
+    source: Path
+    digest: str  # parsed.content_digest of the file
+    clauses: list[Clause]
+    text: bytes = b""  # See render_document()
+    offsets: list[int] = field(default_factory=list)
+
+
+def render_document(blocks: list[Block]) -> tuple[bytes, list[int]]:
+    """UTF-8 text of a document, one line per non-empty block, and the byte offset of each block.
+
+    offsets has len(blocks) + 1 entries; blocks[start:end] render to
+    text[offsets[start]:offsets[end]] (with a trailing newline), matching
+    the text of a clause spanning those blocks.
+    """
+    lines, offsets, position = [], [], 0
+    for block in blocks:
+        offsets.append(position)
+        line = block_to_markdown(block, preserve_structure=False)
+        if line:
+            lines.append(line.encode("utf-8") + b"\n")
+            position += len(lines[-1])
+    offsets.append(position)
+    return b"".join(lines), offsets
+
+
+def text_hash(text: str) -> str:
+    """Hash of text's words, casefolded, so whitespace and punctuation changes do not matter."""
+    words = " ".join(re.findall(r"[^\W_]+", text.casefold()))
+    return hashlib.blake2b(words.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def classify(heading: str, text: str) -> str:
+    """Canonical clause type for a heading and text, or the heading itself if none matches."""
+    for probe in (heading.casefold(), text[:_TYPE_PROBE_CHARS].casefold()):
+        for clause_type, phrases in CLAUSE_TYPES.items():
+            if any(phrase in probe for phrase in phrases):
+                return clause_type
+    return " ".join(re.findall(r"[^\W_]+", heading.casefold()))
+
+
+def _render(blocks: list[Block]) -> str:
+    return "\n".join(md for md in (block_to_markdown(b, preserve_structure=False) for b in blocks) if md)
+
+
+def extract_clauses(blocks: list[Block], max_chars: int = MAX_CLAUSE_CHARS) -> list[Clause]:
+    """Split a document into clauses along its outline.
+
+    A section is one clause if its whole text fits in max_chars; otherwise
+    its own text (up to its first subsection) becomes a clause and each
+    subsection is considered in turn. Text before the first section is
+    kept as a "preamble" clause.
+    """
+    sections = outline(blocks)
+    offsets = [0]
+    for block in blocks:
+        offsets.append(offsets[-1] + len(block.text) + sum(len(cell) for row in block.rows for cell in row))
+
+    clauses: list[Clause] = []
+
+    def add(start: int, end: int, section: str, heading: str) -> None:
+        text = _render(blocks[start:end])
+        body = _render(blocks[start + 1:end]) if blocks[start].is_heading else text
+        if body.strip():
+            # Hash the words without numbering labels, so a clause renumbered
+            # in another deal's agreement is still recognized as the same.
+            span = blocks[start:end]
+            words = [heading] + [b.text for b in span] + [cell for b in span for row in b.rows for cell in row]
+            clauses.append(Clause(section, heading, classify(heading, text), text, start, end, text_hash("\n".join(words))))
+
+    first = sections[0].start if sections else len(blocks)
+    if first:
+        add(0, first, "", "Preamble")
+
+    headings: list[tuple[int, str]] = []  # (end, heading) of enclosing sections
+    i = 0
+    while i < len(sections):
+        section = sections[i]
+        while headings and headings[-1][0] <= section.start:
+            headings.pop()
+        heading = section.title or (headings[-1][1] if headings else "")
+        label = section.qualified if section.number else ""
+
+        subtree_end = i + 1
+        while subtree_end < len(sections) and sections[subtree_end].start < section.end:
+            subtree_end += 1
+        if subtree_end == i + 1 or offsets[section.end] - offsets[section.start] <= max_chars:
+            add(section.start, section.end, label, heading)
+            i = subtree_end
+        else:
+            add(section.start, sections[i + 1].start, label, heading)
+            headings.append((section.end, heading))
+            i += 1
+    return clauses
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^0-9a-z]+", "-", text.casefold()).strip("-") or "x"
+
+
+def clause_ids(deal_name: str, source: Path, clauses: list[Clause], taken: Optional[set[str]] = None) -> list[str]:
+    """Stable ids like "acme-acquisition_spa_3.2(a)"; unnumbered clauses use their block index.
+
+    Ids in taken (e.g. from another document with the same file name) get a
+    "-n" suffix; the new ids are added to it.
+    """
+    prefix = f"{_slug(deal_name)}_{_slug(source.stem)}"
+    ids, seen = [], taken if taken is not None else set()
+    for clause in clauses:
+        base = f"{prefix}_{clause.section or f'p{clause.start}'}"
+        clause_id, n = base, 1
+        while clause_id in seen:
+            n += 1
+            clause_id = f"{base}-{n}"
+        seen.add(clause_id)
+        ids.append(clause_id)
+    return ids
+
+
+def extract_file(path: Path) -> IndexedDocument:
+    """Read a DOCX (through the parsed-document cache) and extract its clauses.
+
+    Raises ValueError if it is not a readable DOCX.
+    """
+    import zipfile
+
+    from lxml import etree
+
+    from .parsed import content_digest, read_docx_cached
+
+    try:
+        blocks = read_docx_cached(path)
+    except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError) as e:
+        raise ValueError(f"Failed to read DOCX: {e}") from e
+    return IndexedDocument(path, content_digest(path), extract_clauses(blocks), *render_document(blocks))
+
+
+def _extract_file(path: Path) -> Union[IndexedDocument, str]:
+    # Pool worker: errors come back as values so one bad file does not stop the batch.
+    try:
+        return extract_file(path)
+    except ValueError as e:
+        return str(e)
+
+
+def pool_size(documents: int, workers: int = DEFAULT_WORKERS) -> int:
+    """Processes extract_files uses for documents: up to workers, each with PARALLEL_MIN_DOCUMENTS or more."""
+    return max(1, min(workers, documents // PARALLEL_MIN_DOCUMENTS))
+
+
+def extract_files(paths: list[Path], workers: int = DEFAULT_WORKERS) -> list[Union[IndexedDocument, str]]:
+    """Extract clauses from each path, in a pool of pool_size() processes when that is more than one.
+
+    Results are in path order; a file that cannot be read yields its error message instead.
+    """
+    workers = pool_size(len(paths), workers)
+    if workers == 1:
+        return [_extract_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_extract_file, paths))
+
+
+def _chunks(items: list, size: int = _IN_CHUNK) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _append(path: Path, committed_bytes: int, data: bytes) -> None:
+    """Write data after the committed bytes of path, dropping any uncommitted tail first."""
+    with open(path, "ab") as handle:
+        handle.truncate(committed_bytes)
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+class ClauseStore:
+    """Precedent clauses and their embeddings in one directory."""
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory) if directory is not None else clause_store_dir()
+        self.vectors_path = self.directory / VECTORS_FILE
+        self.lengths_path = self.directory / LENGTHS_FILE
+        self.minhash_path = self.directory / MINHASH_FILE
+        self.lexicon_dir = self.directory / LEXICON_DIR
+        self.text_path = self.directory / TEXT_FILE
+        self.filters_dir = self.directory / FILTERS_DIR
+        self.ivf_dir = self.directory / IVF_DIR
+        self.db_path = self.directory / DB_FILE
+
+    def exists(self) -> bool:
+        return self.db_path.exists()
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            # user_version marks a database already on the current layout, so
+            # the common case skips the schema script (a large share of a
+            # context lookup's cost).
+            if conn.execute("PRAGMA user_version").fetchone()[0] != _LAYOUT:
+                self._create(conn)
+            yield conn
+        finally:
+            conn.close()
+
+    def _create(self, conn: sqlite3.Connection) -> None:
+        """Create missing tables and columns; raises ValueError for a store of an older SCHEMA_VERSION."""
+        conn.execute(_META_SCHEMA)
+        meta = self._meta(conn)
+        if "rows" in meta and meta.get("schema") != SCHEMA_VERSION:
+            raise ValueError(f"Clause store {self.directory} was written by an older version; delete it and re-index")
+        conn.executescript(_SCHEMA)
+        for table, column, kind in _ADDED_COLUMNS:
+            if column not in {info[1] for info in conn.execute(f"PRAGMA table_info({table})")}:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+        conn.executescript(_ADDED_INDEXES)
+        conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('schema', ?)", (SCHEMA_VERSION,))
+        # Distinguishes this store from a deleted and recreated one in the search cache.
+        conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('store_id', ?)", (uuid.uuid4().hex,))
+        conn.execute(f"PRAGMA user_version = {_LAYOUT}")
+
+    @staticmethod
+    def _meta(conn: sqlite3.Connection) -> dict[str, str]:
+        return dict(conn.execute("SELECT key, value FROM meta"))
+
+    def embedder(self, conn: sqlite3.Connection, name: Optional[str] = None) -> Embedder:
+        """The embedder the stored vectors were built with, or for an empty store a new `name` backend.
+
+        Raises ValueError if name is not the store's backend.
+        """
+        meta = self._meta(conn)
+        if "embedder" not in meta:
+            return create_embedder(name or DEFAULT_EMBEDDER)
+        if name and name != meta["embedder"]:
+            raise ValueError(f"Clause store {self.directory} was built with the {meta['embedder']} embedder, not {name}")
+        # Backends are stateless once built; an onnx model is loaded once per process.
+        key = (meta["embedder"], meta.get("embedder_config", "{}"))
+        if key not in _EMBEDDERS:
+            _EMBEDDERS[key] = create_embedder(key[0], json.loads(key[1]))
+        return _EMBEDDERS[key]
+
+    def _query_vector(
+        self, conn: sqlite3.Connection, meta: dict[str, str], query: str, use_cache: bool = True
+    ) -> np.ndarray:
+        """Embedding of query, from the per-process LRU of the last QUERY_CACHE_SIZE queries when possible."""
+        if not use_cache:
+            return self.embedder(conn).embed([query])[0]
+        key = (meta.get("embedder", ""), meta.get("embedder_config", "{}"), query)
+        vector = _QUERY_VECTORS.get(key)
+        if vector is not None:
+            _QUERY_VECTORS.move_to_end(key)
+            return vector
+        vector = self.embedder(conn).embed([query])[0]
+        _QUERY_VECTORS[key] = vector
+        if len(_QUERY_VECTORS) > QUERY_CACHE_SIZE:
+            _QUERY_VECTORS.popitem(last=False)
+        return vector
+
+    def matrix(self, conn: sqlite3.Connection) -> np.ndarray:
+        """Read-only memory map of the committed vector rows."""
+        meta = self._meta(conn)
+        rows, dim = int(meta.get("rows", 0)), int(meta.get("dim", 0))
+        if not rows:
+            return np.zeros((0, dim), dtype=DTYPE)
+        return np.memmap(self.vectors_path, dtype=DTYPE, mode="r", shape=(rows, dim))
+
+    def count(self) -> int:
+        """Number of distinct live clauses."""
+        if not self.exists():
+            return 0
+        with self.connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM clauses").fetchone()[0]
+
+    def document_digests(self, deal_name: str) -> dict[str, str]:
+        """Content digest of each document indexed under deal_name, by source path."""
+        if not self.exists():
+            return {}
+        with self.connect() as conn:
+            return dict(conn.execute("SELECT source, digest FROM documents WHERE deal_name = ?", (deal_name,)))
+
+    def add_documents(
+        self,
+        deal_name: str,
+        deal_date: Optional[str],
+        documents: list[IndexedDocument],
+        embedder: Embedder,
+        contract_type: Optional[str] = None,
+        jurisdiction: Optional[str] = None,
+    ) -> dict[str, int]:
+        """Store documents' clauses in one transaction, replacing earlier indexes of the same deal and source.
+
+        Only clauses whose text hash is not already stored are embedded
+        (EMBED_BATCH at a time), appended and clustered; the rest just gain
+        a deal reference. Returns counts of "new" and "duplicate" clauses,
+        of new clauses that joined an existing cluster ("near_duplicate"),
+        and of clauses "replaced" (stored before, now referenced by no
+        document).
+        """
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                meta = self._meta(conn)
+                config = json.dumps(embedder.config(), sort_keys=True)
+                if (meta.get("embedder", embedder.name), meta.get("embedder_config", config)) != (embedder.name, config):
+                    raise ValueError(
+                        f"Clause store was built with {meta['embedder']} {meta['embedder_config']}, "
+                        f"not {embedder.name} {config}"
+                    )
+                rows = int(meta.get("rows", 0))
+                segments = json.loads(meta.get("lex_segments", "[]"))
+
+                previous: set[int] = set()
+                for document in documents:
+                    key = (deal_name, str(document.source))
+                    previous.update(row for (row,) in conn.execute(
+                        "SELECT row FROM clause_refs WHERE deal_name = ? AND source = ?", key
+                    ))
+                    conn.execute("DELETE FROM clause_refs WHERE deal_name = ? AND source = ?", key)
+
+                # Existing rows by text hash; new clauses get rows in order of first appearance.
+                hashes = list(dict.fromkeys(c.text_hash for d in documents for c in d.clauses))
+                known: dict[str, int] = {}
+                for chunk in _chunks(hashes):
+                    known.update(conn.execute(
+                        f"SELECT text_hash, row FROM clauses WHERE text_hash IN ({', '.join('?' * len(chunk))})", chunk
+                    ))
+                new: list[Clause] = []
+                for clause in (c for d in documents for c in d.clauses):
+                    if clause.text_hash not in known:
+                        known[clause.text_hash] = rows + len(new)
+                        new.append(clause)
+
+                for start in range(0, len(new), EMBED_BATCH):
+                    batch = new[start:start + EMBED_BATCH]
+                    vectors = embedder.embed(c.embedding_text() for c in batch)
+                    _append(self.vectors_path, (rows + start) * embedder.dim * DTYPE().itemsize, vectors.astype(DTYPE).tobytes())
+                if new:
+                    segment, lengths = Segment.build((c.embedding_text() for c in new), rows)
+                    name = f"seg-{rows:010d}"
+                    segment.save(self.lexicon_dir / name)
+                    segments.append(name)
+                    _append(self.lengths_path, rows * LENGTH_DTYPE().itemsize, lengths.tobytes())
+                conn.executemany(
+                    "INSERT INTO clauses (row, text_hash, heading, clause_type, text) VALUES (?, ?, ?, ?, ?)",
+                    [(rows + n, c.text_hash, c.heading, c.clause_type, c.text) for n, c in enumerate(new)],
+                )
+                near_duplicates = self._cluster_rows(conn, meta, rows, [c.embedding_text() for c in new])
+
+                # Document text goes to the blob; spans are absolute byte offsets into it.
+                text_bytes = int(meta.get("text_bytes", 0))
+                spans, position = [], text_bytes
+                for document in documents:
+                    spans.append((position, position + len(document.text)) if document.text else (None, None))
+                    position += len(document.text)
+                if position > text_bytes:
+                    _append(self.text_path, text_bytes, b"".join(d.text for d in documents))
+
+                # One id set per prefix for the whole batch, so same-named files in
+                # different folders also avoid each other's (not yet inserted) ids.
+                refs, taken_by_prefix = [], {}
+                for document, (start, _) in zip(documents, spans):
+                    prefix = f"{_slug(deal_name)}_{_slug(document.source.stem)}_"
+                    taken = taken_by_prefix.get(prefix)
+                    if taken is None:
+                        taken = taken_by_prefix[prefix] = {clause_id for (clause_id,) in conn.execute(
+                            "SELECT clause_id FROM clause_refs WHERE substr(clause_id, 1, ?) = ?", (len(prefix), prefix)
+                        )}
+                    ids = clause_ids(deal_name, document.source, document.clauses, taken)
+                    refs.extend(
+                        (
+                            clause_id, known[c.text_hash], deal_name, deal_date, contract_type, jurisdiction,
+                            str(document.source), c.section,
+                            None if start is None else start + document.offsets[c.start],
+                            None if start is None else start + document.offsets[c.end],
+                        )
+                        for clause_id, c in zip(ids, document.clauses)
+                    )
+                conn.executemany(
+                    "INSERT INTO clause_refs (clause_id, row, deal_name, deal_date, contract_type, jurisdiction, "
+                    "source, section, text_start, text_end) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    refs,
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO documents (deal_name, source, digest, clauses, text_start, text_end) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(deal_name, str(d.source), d.digest, len(d.clauses), *span) for d, span in zip(documents, spans)],
+                )
+
+                stale = []
+                for chunk in _chunks(sorted(previous)):
+                    stale.extend(row for (row,) in conn.execute(
+                        f"SELECT row FROM clauses WHERE row IN ({', '.join('?' * len(chunk))}) "
+                        "AND NOT EXISTS (SELECT 1 FROM clause_refs WHERE clause_refs.row = clauses.row)",
+                        chunk,
+                    ))
+                for chunk in _chunks(stale):
+                    conn.execute(f"DELETE FROM clauses WHERE row IN ({', '.join('?' * len(chunk))})", chunk)
+                total = rows + len(new)
+                if stale:
+                    keys = band_keys(np.asarray(self._signatures(total)[stale]))
+                    conn.executemany(
+                        "DELETE FROM lsh_buckets WHERE bucket = ? AND row = ?",
+                        [(key, row) for row, row_keys in zip(stale, keys.tolist()) for key in row_keys],
+                    )
+
+                conn.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [
+                        ("rows", str(total)),
+                        ("dim", str(embedder.dim)),
+                        ("embedder", embedder.name),
+                        ("embedder_config", config),
+                        ("lex_rows", str(total)),
+                        ("lex_segments", json.dumps(segments)),
+                        ("text_bytes", str(position)),
+                        ("minhash_rows", str(total)),
+                        ("generation", str(int(meta.get("generation", 0)) + 1)),
+                    ],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        self._zero_rows(stale, rows, embedder.dim)
+        if len(segments) > MAX_SEGMENTS:
+            self.merge_lexicon()
+        clauses = sum(len(d.clauses) for d in documents)
+        return {
+            "new": len(new),
+            "duplicate": clauses - len(new),
+            "near_duplicate": near_duplicates,
+            "replaced": len(stale),
+        }
+
+    def _signatures(self, rows: int) -> np.ndarray:
+        """Read-only memory map of the MinHash signatures of the first `rows` rows."""
+        if not rows:
+            return np.zeros((0, NUM_PERM), dtype=SIGNATURE_DTYPE)
+        return np.memmap(self.minhash_path, dtype=SIGNATURE_DTYPE, mode="r", shape=(rows, NUM_PERM))
+
+    def _cluster_rows(self, conn: sqlite3.Connection, meta: dict[str, str], first: int, texts: list[str]) -> int:
+        """Sign, bucket and cluster rows first, first + 1, ... (texts), after any older unsigned rows.
+
+        Call inside the write transaction, once the rows are in clauses.
+        Each row joins the cluster of its most similar earlier row sharing
+        an LSH bucket (comparing at most BUCKET_SAMPLE rows per bucket) if
+        that similarity reaches THRESHOLD, and otherwise starts its own.
+        Returns how many of the rows in texts joined an existing cluster.
+        """
+        signed_rows = int(meta.get("minhash_rows", 0))
+        backlog = []
+        if signed_rows < first:
+            # Rows stored before clustering existed; replaced rows have no text and stay unclustered.
+            stored = dict(conn.execute(
+                "SELECT row, CASE WHEN heading = '' THEN text ELSE heading || char(10) || text END "
+                "FROM clauses WHERE row >= ? AND row < ?",
+                (signed_rows, first),
+            ))
+            backlog = [stored.get(row, "") for row in range(signed_rows, first)]
+        signed = signatures(backlog + texts)
+        if not len(signed):
+            return 0
+        _append(self.minhash_path, signed_rows * NUM_PERM * SIGNATURE_DTYPE().itemsize, signed.tobytes())
+        earlier = self._signatures(signed_rows)
+        keys = band_keys(signed)
+        empty = is_empty(signed)
+
+        members: dict[int, list[int]] = {}  # Bucket -> rows, oldest first
+        for chunk in _chunks(np.unique(keys[~empty]).tolist()):
+            for bucket, row in conn.execute(
+                f"SELECT bucket, row FROM lsh_buckets WHERE bucket IN ({', '.join('?' * len(chunk))})", chunk
+            ):
+                members.setdefault(bucket, []).append(row)
+        candidates = sorted({row for rows in members.values() for row in rows[-BUCKET_SAMPLE:]})
+        cluster_of: dict[int, int] = {}
+        for chunk in _chunks(candidates):
+            cluster_of.update(conn.execute(
+                f"SELECT row, COALESCE(cluster, row) FROM clauses WHERE row IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+
+        assignments, buckets, joined = [], [], 0
+        for i, row_keys in enumerate(keys.tolist()):
+            row = signed_rows + i
+            cluster = row
+            if not empty[i]:
+                near = sorted({c for key in row_keys for c in members.get(key, [])[-BUCKET_SAMPLE:]})
+                if near:
+                    old = [c for c in near if c < signed_rows]
+                    near = old + [c for c in near if c >= signed_rows]
+                    scores = similarity(
+                        np.concatenate([earlier[old], signed[[c - signed_rows for c in near[len(old):]]]]), signed[i]
+                    )
+                    best = int(np.argmax(scores))
+                    if scores[best] >= THRESHOLD:
+                        cluster = cluster_of.get(near[best], near[best])
+                        joined += row >= first
+                for key in row_keys:
+                    members.setdefault(key, []).append(row)
+                    buckets.append((key, row))
+            cluster_of[row] = cluster
+            assignments.append((cluster, row))
+        conn.executemany("UPDATE clauses SET cluster = ? WHERE row = ?", assignments)
+        # In key order, so the inserts walk the bucket index once rather than seeking per row.
+        conn.executemany("INSERT OR IGNORE INTO lsh_buckets (bucket, row) VALUES (?, ?)", sorted(buckets))
+        return joined
+
+    def cluster_rows(self) -> None:
+        """Cluster rows stored before clustering existed (add_documents clusters what it writes).
+
+        Takes the write lock only when a read shows unclustered rows.
+        """
+        with self.connect() as conn:
+            meta = self._meta(conn)
+            if int(meta.get("minhash_rows", 0)) >= int(meta.get("rows", 0)):
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                meta = self._meta(conn)
+                rows = int(meta.get("rows", 0))
+                if int(meta.get("minhash_rows", 0)) < rows:
+                    self._cluster_rows(conn, meta, rows, [])
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                        [("minhash_rows", str(rows)), ("generation", str(int(meta.get("generation", 0)) + 1))],
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def lengths(self, meta: dict[str, str]) -> np.ndarray:
+        """Read-only memory map of the committed clause lengths."""
+        rows = int(meta.get("lex_rows", 0))
+        if not rows:
+            return np.zeros(0, dtype=LENGTH_DTYPE)
+        return np.memmap(self.lengths_path, dtype=LENGTH_DTYPE, mode="r", shape=(rows,))
+
+    def merge_lexicon(self) -> None:
+        """Merge all posting segments into one, retiring the merged segments.
+
+        Readers that loaded lex_segments before the merge may still open the
+        retired segments, so they are kept (as lex_retired) until the next
+        merge deletes them. Files are only deleted under the write lock:
+        writers save new segments inside their transaction, so anything
+        neither listed nor retired then is left over from a rolled-back write.
+        """
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                meta = self._meta(conn)
+                segments = json.loads(meta.get("lex_segments", "[]"))
+                if len(segments) > 1:
+                    merged = merge([Segment.load(self.lexicon_dir / name) for name in segments], self.lengths(meta))
+                    name = f"merged-{int(meta['lex_rows']):010d}"
+                    merged.save(self.lexicon_dir / name)
+                    for path in self.lexicon_dir.iterdir():
+                        if path.name != name and path.name not in segments:
+                            shutil.rmtree(path, ignore_errors=True)
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                        [("lex_segments", json.dumps([name])), ("lex_retired", json.dumps(segments))],
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _zero_rows(self, rows: list[int], committed: int, dim: int) -> None:
+        if not rows:
+            return
+        matrix = np.memmap(self.vectors_path, dtype=DTYPE, mode="r+", shape=(committed, dim))
+        matrix[rows] = 0
+        matrix.flush()
+        lengths = np.memmap(self.lengths_path, dtype=LENGTH_DTYPE, mode="r+", shape=(committed,))
+        lengths[rows] = 0
+        lengths.flush()
+        if not self.ivf_dir.exists():
+            return
+        # Each IVF build keeps its own list-ordered copy of the vectors.
+        for build in self.ivf_dir.iterdir():
+            if ".tmp" in build.name:
+                continue
+            try:
+                index = IVFIndex.load(build)
+            except FileNotFoundError:
+                continue
+            positions = np.flatnonzero(np.isin(index.rows, rows))
+            if len(positions):
+                copy = np.load(build / "vectors.npy", mmap_mode="r+")
+                copy[positions] = 0
+                copy.flush()
+
+    def _ivf(self, meta: dict[str, str]) -> IVFIndex:
+        """Load the saved IVF index, checking it matches what the metadata says was built."""
+        missing = ValueError("No IVF index for this clause store; run `clauses build-index` first")
+        if not meta.get("ivf_build"):
+            raise missing
+        try:
+            index = IVFIndex.load(self.ivf_dir / meta["ivf_build"])
+        except FileNotFoundError:
+            raise missing from None
+        if len(index.rows) != int(meta["ivf_rows"]) or index.nlist != int(meta["ivf_nlist"]):
+            raise missing
+        return index
+
+    def build_ivf(self, nlist: Optional[int] = None, iterations: int = KMEANS_ITERATIONS, seed: int = 0) -> dict:
+        """Train and save an IVF index over the current vectors.
+
+        Rows added later are still searched, by brute force, until the
+        next build. Raises ValueError if the store is empty.
+
+        The index is written to its own directory without the write lock and
+        switched to by one metadata update, so a search sees either the old
+        build or the new one. The replaced build is kept (as ivf_retired)
+        until the next build, as a search that read the old metadata may
+        still open it.
+        """
+        with self.connect() as conn:
+            matrix = self.matrix(conn)
+            if not len(matrix):
+                raise ValueError("Clause store is empty; index some documents first")
+            nlist = min(nlist or default_nlist(len(matrix)), len(matrix))
+            name = f"build-{uuid.uuid4().hex}"
+            index = IVFIndex.build(matrix, self.ivf_dir / name, nlist, iterations, seed)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                meta = self._meta(conn)
+                if meta.get("ivf_retired"):
+                    shutil.rmtree(self.ivf_dir / meta["ivf_retired"], ignore_errors=True)
+                for path in self.directory.glob("ivf.*.npy"):
+                    path.unlink()  # Index files of the single-build layout
+                generation = int(meta.get("generation", 0)) + 1  # IVF search results change
+                conn.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [
+                        ("ivf_build", name),
+                        ("ivf_retired", meta.get("ivf_build", "")),
+                        ("ivf_rows", str(len(matrix))),
+                        ("ivf_nlist", str(nlist)),
+                        ("generation", str(generation)),
+                    ],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                shutil.rmtree(self.ivf_dir / name, ignore_errors=True)
+                raise
+        sizes = np.diff(index.offsets)
+        return {"rows": len(matrix), "nlist": nlist, "largest_list": int(sizes.max()), "empty_lists": int((sizes == 0).sum())}
+
+    def _vector_hits(
+        self,
+        conn: sqlite3.Connection,
+        meta: dict[str, str],
+        query: str,
+        k: int,
+        index_type: str,
+        nprobe: int,
+        mask: Optional[np.ndarray] = None,
+        use_cache: bool = True,
+    ) -> tuple[np.ndarray, np.ndarray, int]:
+        """Top-k rows by cosine similarity, their scores, and the number of rows scored.
+
+        mask (a search filter over rows) is applied before scoring. When
+        fewer rows match than an IVF probe would scan, they are scored
+        exactly instead, so selective filters never lose recall.
+        """
+        matrix = self.matrix(conn)
+        if not len(matrix):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=DTYPE), 0
+        vector = self._query_vector(conn, meta, query, use_cache)
+        candidates = None if mask is None else np.flatnonzero(mask[:len(matrix)])
+        if index_type == "ivf" and (
+            candidates is None or len(candidates) > len(matrix) * nprobe / int(meta.get("ivf_nlist", 1))
+        ):
+            ids, scores = self._ivf(meta).search(vector, nprobe)
+            # Rows added since the index was built are scored directly.
+            indexed = int(meta["ivf_rows"])
+            if indexed < len(matrix):
+                ids = np.concatenate([ids, np.arange(indexed, len(matrix))])
+                scores = np.concatenate([scores, matrix[indexed:] @ vector])
+            if mask is not None:
+                keep = mask[ids]
+                ids, scores = ids[keep], scores[keep]
+        elif candidates is not None:
+            ids = candidates
+            # Gathering rows costs more per row than a sequential scan; past a
+            # quarter of the matrix, score everything and pick the matches.
+            scores = matrix[ids] @ vector if len(ids) < len(matrix) // 4 else (matrix @ vector)[ids]
+        else:
+            ids = np.arange(len(matrix))
+            scores = matrix @ vector
+        if not len(scores):
+            return ids, scores, 0
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        # Clauses sharing nothing with the query, and replaced rows, score <= 0.
+        top = top[scores[top] > 0]
+        return ids[top], scores[top], len(scores)
+
+    def _lexical_hits(
+        self, meta: dict[str, str], query: str, k: int, mask: Optional[np.ndarray] = None
+    ) -> tuple[np.ndarray, np.ndarray, int]:
+        """Top-k rows by BM25, their scores, and the number of clauses in the ranking."""
+        segments = [Segment.load(self.lexicon_dir / name) for name in json.loads(meta.get("lex_segments", "[]"))]
+        rows, scores = bm25_search(segments, self.lengths(meta), query, k, mask)
+        searched = int(meta.get("lex_rows", 0)) if mask is None else int(mask.sum())
+        return rows, scores, searched
+
+    def filter_columns(self, conn: sqlite3.Connection) -> FilterColumns:
+        """Filter columns for the store's current generation, building and saving them on first use."""
+        generation = self._meta(conn).get("generation", "0")
+        directory = self.filters_dir / f"v{FILTERS_FORMAT}-gen-{int(generation):010d}"
+        try:
+            return FilterColumns.load(directory)
+        except FileNotFoundError:
+            pass
+        conn.execute("BEGIN")  # One snapshot for the metadata and both tables
+        try:
+            meta = self._meta(conn)
+            columns = FilterColumns.build(conn, int(meta.get("rows", 0)))
+        finally:
+            conn.execute("COMMIT")
+        if meta.get("generation", "0") != generation:
+            return columns  # A write landed meanwhile; do not save under the old generation
+        columns.save(directory)
+        # Keep the previous generation too: a search in another process may
+        # have loaded it and still map its arrays on first use.
+        older = [p.name for p in self.filters_dir.iterdir() if p.name < directory.name and ".tmp" not in p.name]
+        for path in self.filters_dir.iterdir():
+            if older and path.name < max(older):
+                shutil.rmtree(path, ignore_errors=True)
+        return columns
+
+    def deals(self, criteria: Optional[ClauseFilter] = None) -> list[dict]:
+        """Indexed deals with at least one clause matching criteria, most recent first (see FilterColumns.deals)."""
+        if not self.exists():
+            return []
+        with self.connect() as conn:
+            columns = self.filter_columns(conn)
+        return columns.deals(columns.ref_mask(criteria or ClauseFilter()))
+
+    def clusters(
+        self, min_size: int = 2, limit: int = 20, clause_type: Optional[str] = None
+    ) -> tuple[list[dict], int, int]:
+        """The largest near-duplicate clusters, the number of clusters of at least min_size, and the clauses in them.
+
+        Clusters rows stored before clustering existed first. Each cluster
+        is represented by its most widely used clause (most references;
+        the oldest on ties) and lists every clause with its estimated
+        similarity to the representative, most similar first.
+        """
+        if not self.exists():
+            return [], 0, 0
+        self.cluster_rows()
+        with self.connect() as conn:
+            conn.execute("BEGIN")  # One snapshot for the metadata and all tables
+            try:
+                where, args = ("WHERE cluster IS NOT NULL AND clause_type = ?", [clause_type]) if clause_type else (
+                    "WHERE cluster IS NOT NULL", []
+                )
+                grouped = f"SELECT cluster, COUNT(*) AS size FROM clauses {where} GROUP BY cluster HAVING size >= ?"
+                total, clustered = conn.execute(
+                    f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ({grouped})", [*args, min_size]
+                ).fetchone()
+                largest = conn.execute(
+                    f"{grouped} ORDER BY size DESC, cluster LIMIT ?", [*args, min_size, limit]
+                ).fetchall()
+                members: dict[int, list[int]] = {}
+                for chunk in _chunks([cluster for cluster, _ in largest]):
+                    for cluster, row in conn.execute(
+                        f"SELECT cluster, row FROM clauses WHERE cluster IN ({', '.join('?' * len(chunk))}) ORDER BY row",
+                        chunk,
+                    ):
+                        members.setdefault(cluster, []).append(row)
+                found = {}
+                for chunk in _chunks([row for rows in members.values() for row in rows]):
+                    found.update(self._fetch(conn, chunk))
+                signed = self._signatures(int(self._meta(conn).get("minhash_rows", 0)))
+            finally:
+                conn.execute("COMMIT")
+
+        result = []
+        for cluster, size in largest:
+            rows = [row for row in members.get(cluster, []) if row in found]
+            if not rows:
+                continue
+            representative = max(rows, key=lambda row: (found[row]["deal_count"], -row))
+            scores = similarity(np.asarray(signed[rows]), signed[representative]).tolist()
+            variants = sorted(zip(rows, scores), key=lambda item: (item[0] != representative, -item[1], item[0]))
+            head = found[representative]
+            result.append({
+                "cluster_id": cluster,
+                "size": size,
+                "deal_count": len({deal["deal_name"] for row in rows for deal in found[row]["deals"]}),
+                "clause_type": head["clause_type"],
+                "heading": head["heading"],
+                "clause_id": head["clause_id"],
+                "text": head["text"],
+                "variants": [
+                    {
+                        "clause_id": found[row]["clause_id"],
+                        "deal_name": found[row]["deal_name"],
+                        "deal_count": found[row]["deal_count"],
+                        "similarity": round(score, 3),
+                    }
+                    for row, score in variants
+                ],
+            })
+        return result, total, clustered
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        mode: str = "vector",
+        index_type: str = "flat",
+        nprobe: int = DEFAULT_NPROBE,
+        criteria: Optional[ClauseFilter] = None,
+        all_variants: bool = False,
+        use_cache: bool = True,
+    ) -> tuple[list[dict], int, bool]:
+        """Return the top_k clauses for query, best first, the number of clauses searched, and whether cached.
+
+        mode "vector" ranks by embedding similarity (index_type "ivf"
+        searches only the nprobe nearest lists of the IVF index), "lexical"
+        by BM25 without embedding the query, and "hybrid" fuses both
+        rankings by reciprocal rank. criteria restricts both rankings to
+        matching clauses before scoring, and each result is attributed to
+        its first matching deal. Only the best-ranked clause of each
+        near-duplicate cluster is returned unless all_variants is set.
+        Results carry "similarity", "bm25" and, for hybrid, "rrf_score",
+        plus "cluster_id" and "variants" (the other clauses in the
+        cluster). Whitespace in query is normalized (normalize_query). With
+        use_cache, a search already run against the store's current
+        generation is answered from search_cache() without embedding or
+        scoring, and query embeddings come from a per-process LRU. Raises ValueError for an unknown mode or index type, or a
+        missing IVF index.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode} (expected one of {', '.join(SEARCH_MODES)})")
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type: {index_type} (expected one of {', '.join(INDEX_TYPES)})")
+        if not self.exists():
+            return [], 0, False
+
+        query = normalize_query(query)
+        depth = top_k if all_variants else CLUSTER_OVERFETCH * top_k
+        with self.connect() as conn:
+            meta = self._meta(conn)
+            key = None
+            if use_cache:
+                key = cache_key(
+                    "clauses search", meta.get("store_id"), meta.get("generation", "0"), query, top_k, mode,
+                    index_type, nprobe if index_type == "ivf" else None,
+                    criteria.describe() if criteria else {}, all_variants,
+                )
+                cached = search_cache().get(key)
+                if cached is not None:
+                    return cached["results"], cached["searched"], True
+            columns, ref_mask, mask = None, None, None
+            if criteria is not None and criteria.active:
+                columns = self.filter_columns(conn)
+                ref_mask = columns.ref_mask(criteria)
+                mask = columns.row_mask(ref_mask)
+            while True:
+                hits, searched, exhausted = self._rank(
+                    conn, meta, query, mode, depth, index_type, nprobe, mask, use_cache
+                )
+                order = sorted(hits, key=lambda row: -hits[row].get("rrf_score", 0.0)) if mode == "hybrid" else list(hits)
+                clusters = self._clusters(conn, order)
+                if not all_variants:
+                    # Keep the best-ranked clause of each cluster.
+                    representatives, seen = [], set()
+                    for row in order:
+                        if row in clusters and clusters[row][0] not in seen:
+                            seen.add(clusters[row][0])
+                            representatives.append(row)
+                    order = representatives
+                if len(order) >= top_k or exhausted:
+                    break
+                depth *= CLUSTER_OVERFETCH
+            order = order[:top_k]
+            found = {}
+            if order:
+                found = self._fetch(conn, order, columns.first_refs(ref_mask, order) if columns else None)
+        results = []
+        for row in order:
+            # Rows of replaced documents have no metadata.
+            if row in found:
+                hit = hits[row]
+                if "rrf_score" in hit:
+                    hit["rrf_score"] = round(hit["rrf_score"], 6)
+                cluster, size = clusters[row]
+                results.append({**found[row], **hit, "cluster_id": cluster, "variants": size - 1})
+        if key is not None:
+            # The cache is an optimization; an unwritable cache dir must not fail the search.
+            try:
+                search_cache().put(key, {"results": results, "searched": searched})
+            except OSError:
+                pass
+        return results, searched, False
+
+    def _rank(
+        self,
+        conn: sqlite3.Connection,
+        meta: dict[str, str],
+        query: str,
+        mode: str,
+        depth: int,
+        index_type: str,
+        nprobe: int,
+        mask: Optional[np.ndarray],
+        use_cache: bool,
+    ) -> tuple[dict[int, dict], int, bool]:
+        """Scores of the top `depth` rows of each ranking by row, the rows searched, and whether every ranking ran out.
+
+        Hybrid search fuses deeper rankings (at least HYBRID_CANDIDATES).
+        """
+        candidates = max(HYBRID_CANDIDATES, 4 * depth) if mode == "hybrid" else depth
+        rankings: list[tuple[str, np.ndarray, np.ndarray]] = []
+        searched = 0
+        if mode in ("vector", "hybrid"):
+            rows, scores, searched = self._vector_hits(
+                conn, meta, query, candidates, index_type, nprobe, mask, use_cache
+            )
+            rankings.append(("similarity", rows, scores))
+        if mode in ("lexical", "hybrid"):
+            rows, scores, lexical_searched = self._lexical_hits(meta, query, candidates, mask)
+            searched = max(searched, lexical_searched)
+            rankings.append(("bm25", rows, scores))
+
+        hits: dict[int, dict] = {}
+        for score_name, rows, scores in rankings:
+            for rank, (row, score) in enumerate(zip(rows.tolist(), scores.tolist()), 1):
+                hit = hits.setdefault(row, {})
+                hit[score_name] = round(score, 4)
+                if mode == "hybrid":
+                    hit["rrf_score"] = hit.get("rrf_score", 0.0) + 1.0 / (RRF_K + rank)
+        return hits, searched, all(len(rows) < candidates for _, rows, _ in rankings)
+
+    @staticmethod
+    def _clusters(conn: sqlite3.Connection, rows: list[int]) -> dict[int, tuple[int, int]]:
+        """(cluster id, clauses in the cluster) of each live row; unclustered rows are their own cluster of one."""
+        clusters = {}
+        for chunk in _chunks(rows):
+            for row, cluster, size in conn.execute(
+                "SELECT row, COALESCE(cluster, row), "
+                "(SELECT COUNT(*) FROM clauses members WHERE members.cluster = clauses.cluster) "
+                f"FROM clauses WHERE row IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ):
+                clusters[row] = (cluster, max(size, 1))
+        return clusters
+
+    @staticmethod
+    def _fetch(conn: sqlite3.Connection, rows: list[int], preferred: Optional[dict[int, int]] = None) -> dict[int, dict]:
+        """Clause metadata by row, attributed to the reference preferred[row] (a clause_refs rowid) or the first.
+
+        "deals" lists every reference (deal, document and section) to the
+        clause's text, oldest first.
+        """
+        placeholders = ", ".join("?" * len(rows))
+        deals: dict[int, list[dict]] = {}
+        attributed: dict[int, dict] = {}
+        for ref_id, row, *ref in conn.execute(
+            f"SELECT rowid, row, {', '.join(_REF_COLUMNS)} FROM clause_refs WHERE row IN ({placeholders}) ORDER BY rowid",
+            rows,
+        ):
+            deals.setdefault(row, []).append(dict(zip(_REF_COLUMNS, ref)))
+            if row not in attributed or (preferred and preferred.get(row) == ref_id):
+                attributed[row] = deals[row][-1]
+        found = {}
+        for row, heading, clause_type, text in conn.execute(
+            f"SELECT row, heading, clause_type, text FROM clauses WHERE row IN ({placeholders})", rows
+        ):
+            if row in deals:
+                first = attributed[row]
+                found[row] = {
+                    "clause_id": first["clause_id"],
+                    "deal_name": first["deal_name"],
+                    "deal_date": first["deal_date"],
+                    "contract_type": first["contract_type"],
+                    "jurisdiction": first["jurisdiction"],
+                    "section": first["section"],
+                    "heading": heading,
+                    "clause_type": clause_type,
+                    "source": first["source"],
+                    "text": text,
+                    "deal_count": len(deals[row]),
+                    "deals": deals[row],
+                }
+        return found
+
+    def context(self, clause_id: str, lines: int) -> Optional[dict]:
+        """A clause's text with up to `lines` lines of its document before and after it.
+
+        Reads only the needed bytes of text.blob through a memory map.
+        Clauses indexed without document text (before the blob existed)
+        come back with empty "before" and "after". Returns None for an
+        unknown clause id.
+        """
+        if not self.exists():
+            return None
+        with self.connect() as conn:
+            found = conn.execute(
+                "SELECT r.deal_name, r.deal_date, r.source, r.section, c.heading, c.clause_type, c.text, "
+                "r.text_start, r.text_end, d.text_start, d.text_end "
+                "FROM clause_refs r JOIN clauses c ON c.row = r.row "
+                "LEFT JOIN documents d ON d.deal_name = r.deal_name AND d.source = r.source "
+                "WHERE r.clause_id = ?",
+                (clause_id,),
+            ).fetchone()
+        if found is None:
+            return None
+        deal_name, deal_date, source, section, heading, clause_type, text, start, end, low, high = found
+        result = {
+            "clause_id": clause_id, "deal_name": deal_name, "deal_date": deal_date, "source": source,
+            "section": section, "heading": heading, "clause_type": clause_type,
+            "before": "", "text": text, "after": "",
+        }
+        if start is None or low is None:
+            return result
+
+        with open(self.text_path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as blob:
+            # Spans start and end on line boundaries; widen them a line at a time.
+            first, last = start, end
+            for _ in range(lines):
+                if first <= low:
+                    break
+                newline = blob.rfind(b"\n", low, first - 1)
+                first = low if newline < 0 else newline + 1
+            for _ in range(lines):
+                if last >= high:
+                    break
+                newline = blob.find(b"\n", last, high)
+                last = high if newline < 0 else newline + 1
+            result["before"] = blob[first:start].decode("utf-8").rstrip("\n")
+            result["text"] = blob[start:end].decode("utf-8").rstrip("\n")
+            result["after"] = blob[end:last].decode("utf-8").rstrip("\n")
+        return result
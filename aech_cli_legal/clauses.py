@@ -1,69 +1,500 @@
-"""Clauses subcommand group: search, index."""
+"""Clauses subcommand group: search, index, build-index, get-context, deals, clusters."""
 
 import json
+import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, NoReturn, Optional
 
 import typer
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from .filters import ClauseFilter
 
 app = typer.Typer()
 
 
+class ClauseSearchResult(BaseModel):
+    """Result of a precedent clause search."""
+    status: str
+    action: str = "clauses search"
+    query: str
+    top_k: int
+    results: list[dict]
+    mode: str = "vector"
+    index_type: str = "flat"
+    nprobe: Optional[int] = None  # IVF lists searched
+    searched: int = 0  # Clause vectors scored
+    filters: dict = {}  # Active filter criteria
+    all_variants: bool = False  # Every near-duplicate returned, not one per cluster
+    cached: bool = False  # Answered from the search result cache
+    elapsed_ms: float = 0.0
+
+
+class ClauseIndexResult(BaseModel):
+    """Result of indexing documents into the precedent database."""
+    status: str
+    action: str = "clauses index"
+    input: str
+    deal_name: str
+    deal_date: Optional[str]
+    contract_type: Optional[str] = None
+    jurisdiction: Optional[str] = None
+    documents: int = 1  # DOCX files found
+    documents_indexed: int = 1
+    documents_unchanged: int = 0  # Already indexed with the same content; skipped
+    failed: list[dict] = []  # {"path", "error"} per unreadable file
+    clauses_indexed: int  # Extracted from the indexed documents
+    clauses_new: int = 0  # Embedded and stored
+    clauses_duplicate: int = 0  # Text already stored (e.g. boilerplate from another deal); reference added
+    clauses_near_duplicate: int = 0  # New, but joined the cluster of a similar stored clause
+    clauses_replaced: int = 0  # From earlier indexes of these documents, no longer referenced
+    workers: int = 1
+    embedder: Optional[str] = None  # Backend that embedded the clauses (see embeddings.py)
+    elapsed_seconds: float = 0.0
+    clauses_per_second: float = 0.0
+    store: Optional[str] = None
+
+
+class ClauseContextResult(BaseModel):
+    """A stored clause with the lines around it in its source document."""
+    status: str
+    action: str = "clauses get-context"
+    clause_id: str
+    deal_name: str
+    deal_date: Optional[str]
+    source: str
+    section: str
+    heading: str
+    clause_type: str
+    context_lines: int
+    before: str  # Up to context_lines lines preceding the clause
+    text: str
+    after: str  # Up to context_lines lines following the clause
+    elapsed_ms: float = 0.0
+
+
+class ClauseDealsResult(BaseModel):
+    """Deals in the precedent database, optionally filtered."""
+    status: str
+    action: str = "clauses deals"
+    filters: dict = {}
+    deals: list[dict]  # deal_name, deal_date, contract_types, jurisdictions, documents, clauses
+    elapsed_ms: float = 0.0
+
+
+class ClauseClustersResult(BaseModel):
+    """The largest groups of near-duplicate clauses in the precedent database."""
+    status: str
+    action: str = "clauses clusters"
+    min_size: int
+    clause_type: Optional[str] = None
+    clusters: list[dict]  # cluster_id, size, deal_count, representative clause, variants
+    total_clusters: int  # Clusters of at least min_size
+    clustered_clauses: int  # Clauses in those clusters
+    elapsed_ms: float = 0.0
+
+
+class ClauseBuildIndexResult(BaseModel):
+    """Result of building an approximate nearest-neighbour index over the clause store."""
+    status: str
+    action: str = "clauses build-index"
+    index_type: str
+    rows: int
+    nlist: int
+    largest_list: int
+    empty_lists: int
+    elapsed_seconds: float
+
+
+def _fail(message: str) -> NoReturn:
+    """Print a JSON error and exit with status 1."""
+    print(json.dumps({"error": message}))
+    raise typer.Exit(code=1)
+
+
+# --- In-process API ---
+#
+# The store lives in clause_store.py (see there for the on-disk layout);
+# numpy is only imported once a command touches it.
+
+def search_clauses(
+    query: str,
+    top_k: int = 5,
+    index_type: str = "flat",
+    nprobe: Optional[int] = None,
+    mode: str = "vector",
+    filters: Optional["ClauseFilter"] = None,
+    all_variants: bool = False,
+    use_cache: bool = True,
+) -> ClauseSearchResult:
+    """Search the precedent database for clauses similar to query.
+
+    mode is "vector" (embedding similarity), "lexical" (BM25 on exact
+    terms, no query embedding) or "hybrid" (both, fused by reciprocal
+    rank). index_type "ivf" uses the index from `build_clause_index` for
+    the vector ranking, scanning nprobe lists (more lists: higher recall,
+    slower). filters (see filters.py) restrict the search to matching
+    clauses before ranking. Near-duplicate clauses are collapsed to the
+    best-ranked one per cluster, with a variant count, unless
+    all_variants is set. Repeating a search before the store changes is
+    answered from the result cache unless use_cache is False. Raises
+    ValueError for an unknown mode or index type, or a missing IVF index.
+    """
+    from .clause_store import ClauseStore
+    from .ivf import DEFAULT_NPROBE
+
+    nprobe = nprobe or DEFAULT_NPROBE
+    started = time.perf_counter()
+    results, searched, cached = ClauseStore().search(
+        query, top_k, mode, index_type, nprobe, filters, all_variants, use_cache
+    )
+    return ClauseSearchResult(
+        status="complete",
+        query=query,
+        top_k=top_k,
+        results=results,
+        mode=mode,
+        index_type=index_type,
+        nprobe=nprobe if index_type == "ivf" and mode != "lexical" else None,
+        searched=searched,
+        filters=filters.describe() if filters else {},
+        all_variants=all_variants,
+        cached=cached,
+        elapsed_ms=round(1000 * (time.perf_counter() - started), 2),
+    )
+
+
+def list_deals(filters: Optional["ClauseFilter"] = None) -> ClauseDealsResult:
+    """List indexed deals with at least one clause matching filters, most recent first."""
+    from .clause_store import ClauseStore
+
+    started = time.perf_counter()
+    deals = ClauseStore().deals(filters)
+    return ClauseDealsResult(
+        status="complete",
+        filters=filters.describe() if filters else {},
+        deals=deals,
+        elapsed_ms=round(1000 * (time.perf_counter() - started), 2),
+    )
+
+
+def index_document(
+    input_path: str,
+    deal_name: str,
+    deal_date: Optional[str] = None,
+    workers: Optional[int] = None,
+    embedder: Optional[str] = None,
+    contract_type: Optional[str] = None,
+    jurisdiction: Optional[str] = None,
+) -> ClauseIndexResult:
+    """Add the clauses of a DOCX, or of every DOCX under a directory, to the precedent database.
+
+    Documents already indexed under the deal with unchanged content are
+    skipped; changed ones replace their earlier clauses. Clauses are
+    extracted in up to `workers` processes and written in one transaction;
+    clause text already in the store (boilerplate shared across deals) is
+    not embedded again but referenced. embedder picks the backend
+    (hashing, onnx or stub) for a new store; an existing store keeps the
+    one it was built with. contract_type and jurisdiction tag every
+    clause for `clauses search`/`clauses deals` filters. Raises
+    FileNotFoundError if the path does not
+    exist and ValueError if it is not a DOCX or directory of DOCX files,
+    a single input file is unreadable, or embedder differs from the store's.
+    """
+    from .clause_store import DEFAULT_WORKERS, ClauseStore, IndexedDocument, extract_files, pool_size
+    from .parsed import content_digest
+
+    input_file = Path(input_path)
+    if not input_file.exists():
+        raise FileNotFoundError(f"File not found: {input_path}")
+    if input_file.is_dir():
+        # "~$" files are Word's lock files for open documents.
+        paths = sorted(p for p in input_file.rglob("*.docx") if p.is_file() and not p.name.startswith("~$"))
+        if not paths:
+            raise ValueError(f"No .docx files found in {input_path}")
+    elif input_file.suffix.lower() != ".docx":
+        raise ValueError(f"Unsupported file type: {input_file.suffix}")
+    else:
+        paths = [input_file]
+
+    started = time.perf_counter()
+    store = ClauseStore()
+    with store.connect() as conn:
+        backend = store.embedder(conn, embedder)
+    paths = [path.resolve() for path in paths]
+    indexed = store.document_digests(deal_name)
+    pending = [path for path in paths if indexed.get(str(path)) != content_digest(path)]
+    workers = workers or DEFAULT_WORKERS
+
+    documents, failed = [], []
+    for path, extracted in zip(pending, extract_files(pending, workers)):
+        if isinstance(extracted, IndexedDocument):
+            documents.append(extracted)
+        else:
+            failed.append({"path": str(path), "error": extracted})
+    if failed and not input_file.is_dir():
+        raise ValueError(failed[0]["error"])
+
+    counts = {"new": 0, "duplicate": 0, "near_duplicate": 0, "replaced": 0}
+    if documents:
+        counts = store.add_documents(deal_name, deal_date, documents, backend, contract_type, jurisdiction)
+    elapsed = time.perf_counter() - started
+    clauses = sum(len(document.clauses) for document in documents)
+
+    return ClauseIndexResult(
+        status="partial" if failed else "complete",
+        input=str(input_file),
+        deal_name=deal_name,
+        deal_date=deal_date,
+        contract_type=contract_type,
+        jurisdiction=jurisdiction,
+        documents=len(paths),
+        documents_indexed=len(documents),
+        documents_unchanged=len(paths) - len(pending),
+        failed=failed,
+        clauses_indexed=clauses,
+        clauses_new=counts["new"],
+        clauses_duplicate=counts["duplicate"],
+        clauses_near_duplicate=counts["near_duplicate"],
+        clauses_replaced=counts["replaced"],
+        workers=pool_size(len(pending), workers),
+        embedder=backend.name,
+        elapsed_seconds=round(elapsed, 3),
+        clauses_per_second=round(clauses / elapsed, 1) if elapsed > 0 else 0.0,
+        store=str(store.directory),
+    )
+
+
+def get_clause_context(clause_id: str, context_lines: int = 20) -> ClauseContextResult:
+    """Return a clause and up to context_lines lines either side of it, read from the clause store.
+
+    The source DOCX is not opened. Raises ValueError for an unknown clause id.
+    """
+    from .clause_store import ClauseStore
+
+    started = time.perf_counter()
+    found = ClauseStore().context(clause_id, context_lines)
+    if found is None:
+        raise ValueError(f"Unknown clause id: {clause_id}")
+    return ClauseContextResult(
+        status="complete",
+        context_lines=context_lines,
+        elapsed_ms=round(1000 * (time.perf_counter() - started), 3),
+        **found,
+    )
+
+
+def list_clusters(min_size: int = 2, limit: int = 20, clause_type: Optional[str] = None) -> ClauseClustersResult:
+    """Return the largest near-duplicate clusters, optionally of one clause type.
+
+    Clauses indexed before clustering existed are clustered first.
+    """
+    from .clause_store import ClauseStore
+
+    started = time.perf_counter()
+    clusters, total, clustered = ClauseStore().clusters(min_size, limit, clause_type)
+    return ClauseClustersResult(
+        status="complete",
+        min_size=min_size,
+        clause_type=clause_type,
+        clusters=clusters,
+        total_clusters=total,
+        clustered_clauses=clustered,
+        elapsed_ms=round(1000 * (time.perf_counter() - started), 2),
+    )
+
+
+def build_clause_index(nlist: Optional[int] = None, iterations: Optional[int] = None) -> ClauseBuildIndexResult:
+    """Train an IVF (k-means) index over every clause currently in the store.
+
+    nlist defaults to about sqrt(clauses). Raises ValueError if the store is empty.
+    """
+    from .clause_store import ClauseStore
+    from .ivf import KMEANS_ITERATIONS
+
+    started = time.perf_counter()
+    stats = ClauseStore().build_ivf(nlist, iterations or KMEANS_ITERATIONS)
+    return ClauseBuildIndexResult(
+        status="complete",
+        index_type="ivf",
+        elapsed_seconds=round(time.perf_counter() - started, 3),
+        **stats,
+    )
+
+
+# --- Typer commands ---
+
+def _filters(
+    deal_name: Optional[list[str]],
+    contract_type: Optional[list[str]],
+    jurisdiction: Optional[list[str]],
+    clause_type: Optional[list[str]],
+    date_from: Optional[str],
+    date_to: Optional[str],
+) -> "ClauseFilter":
+    from .filters import ClauseFilter
+
+    return ClauseFilter(deal_name or [], contract_type or [], jurisdiction or [], clause_type or [], date_from, date_to)
+
+
+_DEAL_NAME_FILTER = typer.Option(None, "--deal-name", help="Only this deal (repeatable)")
+_CONTRACT_TYPE_FILTER = typer.Option(None, "--contract-type", help="Only deals of this contract type (repeatable)")
+_JURISDICTION_FILTER = typer.Option(None, "--jurisdiction", help="Only deals under this jurisdiction (repeatable)")
+_CLAUSE_TYPE_FILTER = typer.Option(None, "--clause-type", help="Only clauses of this type, e.g. indemnification (repeatable)")
+_DATE_FROM_FILTER = typer.Option(None, "--date-from", help="Only deals dated on or after (ISO-8601, e.g. 2023 or 2023-06-30)")
+_DATE_TO_FILTER = typer.Option(None, "--date-to", help="Only deals dated on or before (ISO-8601)")
+
+
 @app.command()
 def search(
     query: str = typer.Argument(..., help="Clause text or type to search for"),
-    top_k: int = typer.Option(5, "--top-k", "-k", help="Number of results"),
+    top_k: int = typer.Option(5, "--top-k", "-k", min=1, help="Number of results"),
+    mode: str = typer.Option(
+        "vector", "--mode", "-m", help="vector (semantic), lexical (BM25 exact terms) or hybrid (both, rank-fused)"
+    ),
+    index_type: str = typer.Option(
+        "flat", "--index-type", help="flat (exact) or ivf (approximate; run build-index first)"
+    ),
+    nprobe: Optional[int] = typer.Option(
+        None, "--nprobe", min=1, help="IVF lists to search (default 16; higher = better recall, slower)"
+    ),
+    deal_name: Optional[list[str]] = _DEAL_NAME_FILTER,
+    contract_type: Optional[list[str]] = _CONTRACT_TYPE_FILTER,
+    jurisdiction: Optional[list[str]] = _JURISDICTION_FILTER,
+    clause_type: Optional[list[str]] = _CLAUSE_TYPE_FILTER,
+    date_from: Optional[str] = _DATE_FROM_FILTER,
+    date_to: Optional[str] = _DATE_TO_FILTER,
+    all_variants: bool = typer.Option(
+        False, "--all-variants", help="Return every near-duplicate instead of one clause per cluster"
+    ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the search result cache"),
 ):
     """Semantic search for similar clauses in precedent database.
 
-    Input: clause text or type.
-    Output: matching clauses with source deals.
+    Input: clause text or type, optional deal/clause filters.
+    Output: matching clauses with source deals, one per near-duplicate cluster.
     Use when user wants precedent for a provision.
     """
-    # TODO: Implement vector search over clause database
-    print(
-        json.dumps(
-            {
-                "status": "stub",
-                "action": "clauses search",
-                "query": query,
-                "top_k": top_k,
-                "results": [],
-            }
-        )
-    )
+    try:
+        filters = _filters(deal_name, contract_type, jurisdiction, clause_type, date_from, date_to)
+        result = search_clauses(query, top_k, index_type, nprobe, mode, filters, all_variants, use_cache=not no_cache)
+    except ValueError as e:
+        _fail(str(e))
+
+    print(json.dumps(result.model_dump()))
 
 
 @app.command()
 def index(
-    input_path: str = typer.Argument(..., help="Path to DOCX file"),
+    input_path: str = typer.Argument(..., help="Path to a DOCX file or a directory of them"),
     deal_name: str = typer.Option(..., "--deal-name", "-n", help="Name of the deal"),
     deal_date: Optional[str] = typer.Option(
         None, "--deal-date", "-d", help="Date of deal (ISO-8601)"
     ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w", min=1, help="Processes for extracting clauses in parallel (default: up to 4)"
+    ),
+    embedder: Optional[str] = typer.Option(
+        None, "--embedder", "-e", help="hashing (default), onnx ($AECH_LEGAL_ONNX_MODEL) or stub; fixed by the first index"
+    ),
+    contract_type: Optional[str] = typer.Option(
+        None, "--contract-type", "-t", help="Contract type, e.g. asset-purchase or nda (for search filters)"
+    ),
+    jurisdiction: Optional[str] = typer.Option(
+        None, "--jurisdiction", "-j", help="Governing-law jurisdiction, e.g. delaware (for search filters)"
+    ),
 ):
     """Add document clauses to precedent database.
 
-    Input: DOCX path, deal metadata.
-    Output: indexed clause count.
-    Use after closing a deal to build precedent library.
+    Input: DOCX path or directory, deal metadata.
+    Output: indexed, new and duplicate clause counts, throughput.
+    Use after closing a deal to build precedent library; re-running skips unchanged documents.
     """
-    input_file = Path(input_path)
+    try:
+        result = index_document(input_path, deal_name, deal_date, workers, embedder, contract_type, jurisdiction)
+    except (FileNotFoundError, ValueError) as e:
+        _fail(str(e))
 
-    if not input_file.exists():
-        print(json.dumps({"error": f"File not found: {input_path}"}))
-        raise typer.Exit(code=1)
-
-    # TODO: Extract clauses and add to vector database
-    print(
-        json.dumps(
-            {
-                "status": "stub",
-                "action": "clauses index",
-                "input": str(input_file),
-                "deal_name": deal_name,
-                "deal_date": deal_date,
-                "clauses_indexed": 0,
-            }
-        )
-    )
+    print(json.dumps(result.model_dump()))
+
+
+@app.command("build-index")
+def build_index(
+    nlist: Optional[int] = typer.Option(None, "--nlist", min=1, help="Number of IVF lists (default: ~sqrt(clauses))"),
+    iterations: Optional[int] = typer.Option(None, "--iterations", min=1, help="k-means iterations (default 10)"),
+):
+    """Build an approximate nearest-neighbour (IVF) index over the clause store.
+
+    Input: optional list count.
+    Output: index size and list balance.
+    Use when the precedent library is large and `clauses search --index-type ivf` is wanted.
+    """
+    try:
+        result = build_clause_index(nlist, iterations)
+    except ValueError as e:
+        _fail(str(e))
+
+    print(json.dumps(result.model_dump()))
+
+
+@app.command("get-context")
+def get_context(
+    clause_id: str = typer.Option(..., "--clause-id", "-c", help="Clause id from search results"),
+    context_lines: int = typer.Option(20, "--context-lines", "-l", min=0, help="Lines to include before and after"),
+):
+    """Show a precedent clause with the surrounding text of its document.
+
+    Input: clause id from `clauses search`.
+    Output: clause text with the lines before and after it.
+    Use when reviewing a search hit in context.
+    """
+    try:
+        result = get_clause_context(clause_id, context_lines)
+    except ValueError as e:
+        _fail(str(e))
+
+    print(json.dumps(result.model_dump()))
+
+
+@app.command()
+def deals(
+    deal_name: Optional[list[str]] = _DEAL_NAME_FILTER,
+    contract_type: Optional[list[str]] = _CONTRACT_TYPE_FILTER,
+    jurisdiction: Optional[list[str]] = _JURISDICTION_FILTER,
+    clause_type: Optional[list[str]] = _CLAUSE_TYPE_FILTER,
+    date_from: Optional[str] = _DATE_FROM_FILTER,
+    date_to: Optional[str] = _DATE_TO_FILTER,
+):
+    """List deals in the precedent database with their document and clause counts.
+
+    Input: optional contract type, jurisdiction, date range and other filters.
+    Output: one entry per deal, most recent first.
+    Use when user wants to know which precedent deals are available.
+    """
+    try:
+        result = list_deals(_filters(deal_name, contract_type, jurisdiction, clause_type, date_from, date_to))
+    except ValueError as e:
+        _fail(str(e))
+
+    print(json.dumps(result.model_dump()))
+
+
+@app.command()
+def clusters(
+    min_size: int = typer.Option(2, "--min-size", min=2, help="Smallest cluster to report"),
+    limit: int = typer.Option(20, "--limit", min=1, help="Number of clusters to list, largest first"),
+    clause_type: Optional[str] = typer.Option(None, "--clause-type", help="Only clauses of this type"),
+):
+    """List groups of near-duplicate clauses in the precedent database.
+
+    Input: optional minimum size and clause type.
+    Output: largest clusters with a representative clause and its variants.
+    Use when analysing how standard a provision is across deals.
+    """
+    try:
+        result = list_clusters(min_size, limit, clause_type)
+    except ValueError as e:
+        _fail(str(e))
+
+    print(json.dumps(result.model_dump()))
@@ -0,0 +1,101 @@
+"""Thin client for the aech-cli-legal daemon with subprocess fallback.
+
+Skill scripts call `run_cli(["aech-cli-legal", ...])` instead of
+`subprocess.run`. When `aech-cli-legal serve` is listening the command is
+dispatched over the Unix socket to the warm process; otherwise a normal
+subprocess is spawned. Either way a `subprocess.CompletedProcess` comes back.
+
+This module must stay import-light: it is loaded by every skill script.
+"""
+
+import json
+import os
+import socket
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_SOCKET = Path.home() / ".aech" / "aech-cli-legal.sock"
+COMMAND = "aech-cli-legal"
+
+# Environment forwarded to the daemon so it runs with the caller's configuration.
+_FORWARDED_ENV_PREFIXES = ("AECH_",)
+
+
+def socket_path() -> Path:
+    """Return the daemon socket path (AECH_LEGAL_SOCKET overrides the default)."""
+    return Path(os.environ.get("AECH_LEGAL_SOCKET", DEFAULT_SOCKET))
+
+
+def daemon_available(path: Optional[Path] = None) -> bool:
+    """Return True if a daemon is accepting connections on the socket."""
+    path = path or socket_path()
+    if not path.exists():
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+
+
+class ResponseLost(Exception):
+    """The daemon received a request but no valid response came back; the command may have run."""
+
+
+def _request(argv: list[str], path: Path) -> dict:
+    """Send one JSON-lines request to the daemon and read the response.
+
+    Raises OSError if the request could not be delivered, and ResponseLost
+    if it was delivered but the response was lost or malformed.
+    """
+    payload = {
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": {k: v for k, v in os.environ.items() if k.startswith(_FORWARDED_ENV_PREFIXES)},
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path))
+        with sock.makefile("rwb") as stream:
+            stream.write((json.dumps(payload) + "\n").encode("utf-8"))
+            stream.flush()
+            try:
+                line = stream.readline()
+            except OSError as e:
+                raise ResponseLost(f"Lost the connection to the daemon: {e}") from e
+    if not line:
+        raise ResponseLost("Daemon closed the connection without responding")
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        raise ResponseLost(f"Malformed daemon response: {e}") from e
+
+
+def run_cli(cmd: list[str], check: bool = False) -> subprocess.CompletedProcess:
+    """Run an aech-cli-legal command through the daemon, or a subprocess if it is not running.
+
+    Mirrors `subprocess.run(cmd, capture_output=True, text=True, check=check)`.
+    The subprocess fallback is only taken when the request never reached the
+    daemon. If the daemon received it but the response was lost, the command
+    may already have run (edits written, documents indexed), so it is not
+    repeated: the result has exit code 1 and the error on stderr.
+    """
+    if cmd and cmd[0] == COMMAND and os.environ.get("AECH_LEGAL_NO_DAEMON") != "1":
+        path = socket_path()
+        if path.exists():
+            try:
+                response = _request(cmd[1:], path)
+                completed = subprocess.CompletedProcess(
+                    cmd, response["exit_code"], response["stdout"], response["stderr"]
+                )
+            except ResponseLost as e:
+                completed = subprocess.CompletedProcess(cmd, 1, "", f"{e}; the command may have run\n")
+            except OSError:
+                completed = None
+            if completed is not None:
+                if check:
+                    completed.check_returncode()
+                return completed
+
+    return subprocess.run(cmd, capture_output=True, text=True, check=check)
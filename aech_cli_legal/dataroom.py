@@ -2,12 +2,51 @@
 
 import json
 from pathlib import Path
+from typing import Optional
 
 import typer
+from pydantic import BaseModel
 
 app = typer.Typer()
 
 
+class DataroomSession(BaseModel):
+    """Result of authenticating to a data room."""
+    status: str
+    action: str = "dataroom connect"
+    provider: str
+    project_id: str
+    session: Optional[str]
+
+
+class DataroomDownload(BaseModel):
+    """Result of downloading a data room document."""
+    status: str
+    action: str = "dataroom download"
+    doc_id: str
+    output_dir: str
+    local_path: Optional[str]
+
+
+# --- In-process API ---
+
+def connect_dataroom(provider: str, project_id: str) -> DataroomSession:
+    """Authenticate to a data room project."""
+    # TODO: Implement OAuth/auth flow for data room providers
+    return DataroomSession(status="stub", provider=provider, project_id=project_id, session=None)
+
+
+def download_document(doc_id: str, output_dir: str) -> DataroomDownload:
+    """Download a data room document into output_dir."""
+    out_path = Path(output_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    # TODO: Implement data room download
+    return DataroomDownload(status="stub", doc_id=doc_id, output_dir=str(out_path), local_path=None)
+
+
+# --- Typer commands ---
+
 @app.command()
 def connect(
     provider: str = typer.Argument(
@@ -21,18 +60,7 @@ def connect(
     Output: session token.
     Use when user needs to access deal documents in a data room.
     """
-    # TODO: Implement OAuth/auth flow for data room providers
-    print(
-        json.dumps(
-            {
-                "status": "stub",
-                "action": "dataroom connect",
-                "provider": provider,
-                "project_id": project_id,
-                "session": None,
-            }
-        )
-    )
+    print(json.dumps(connect_dataroom(provider, project_id).model_dump()))
 
 
 @app.command()
@@ -48,18 +76,4 @@ def download(
     Output: local file path.
     Use when user needs a specific document from the deal room.
     """
-    out_path = Path(output_dir)
-    out_path.mkdir(parents=True, exist_ok=True)
-
-    # TODO: Implement data room download
-    print(
-        json.dumps(
-            {
-                "status": "stub",
-                "action": "dataroom download",
-                "doc_id": doc_id,
-                "output_dir": str(out_path),
-                "local_path": None,
-            }
-        )
-    )
+    print(json.dumps(download_document(doc_id, output_dir).model_dump()))
@@ -1,13 +1,14 @@
-"""Documents subcommand group: convert, edit, redline, analyze."""
+"""Documents subcommand group: convert, edit, redline, analyze, cache."""
 
 import json
-import os
 from pathlib import Path
-from typing import Literal, Optional
+from typing import TYPE_CHECKING, Literal, NoReturn, Optional
 
 import typer
 from pydantic import BaseModel
-from pydantic_ai import Agent
+
+if TYPE_CHECKING:
+    from .ooxml import Block
 
 app = typer.Typer()
 
@@ -23,6 +24,16 @@ class RegulatoryAnalysis(BaseModel):
     reasoning: str  # Explanation of the analysis
 
 
+RISK_LEVELS = ["none", "low", "medium", "high"]
+
+# Documents longer than this many characters are analyzed in section-aligned chunks.
+ANALYZE_CHUNK_SIZE = 50000
+ANALYZE_PARALLELISM = 4
+# Average chunk size in incremental mode: small enough that an edit re-sends
+# little text, large enough to keep the per-request prompt overhead low.
+INCREMENTAL_CHUNK_SIZE = 8000
+
+
 class EditInstruction(BaseModel):
     """A single edit instruction extracted from text."""
     section: Optional[str]  # Section reference if mentioned (e.g., "3.2")
@@ -37,9 +48,472 @@ class ExtractedEdits(BaseModel):
     summary: str  # Brief summary of the edit requests
 
 
-def _get_model() -> str:
-    """Get the configured LLM model from environment."""
-    return os.environ.get("AECH_LLM_WORKER_MODEL", "openai:gpt-4o")
+# --- Command result models ---
+
+class ConvertResult(BaseModel):
+    """Result of a DOCX-to-Markdown conversion."""
+    status: str
+    action: str = "documents convert"
+    input: str
+    output_dir: str
+    preserve_structure: bool
+    markdown: Optional[str] = None  # Path of the written Markdown file
+    section_map: Optional[str] = None  # Path of the written section-map JSON
+    paragraphs: int = 0
+    tables: int = 0
+    sections: int = 0
+
+
+class EditResult(BaseModel):
+    """Result of a section edit or a batch of edits."""
+    status: str  # complete, partial (some edits skipped) or no_changes
+    action: str = "documents edit"
+    input: str
+    section: Optional[str] = None
+    content: Optional[str] = None
+    output: Optional[str]  # None when no edit applied and nothing was written
+    edits_applied: int = 0
+    conflicts: int = 0
+    not_found: int = 0
+    results: list[dict] = []  # Per-edit outcome: index, section, status, detail
+
+
+class RedlineResult(BaseModel):
+    """Result of a Track Changes comparison."""
+    status: str
+    action: str = "documents redline"
+    original: str
+    modified: str
+    output: str
+    author: Optional[str] = None
+    unchanged: int = 0  # Paragraph/table counts by outcome
+    inserted: int = 0
+    deleted: int = 0
+    modified_blocks: int = 0
+    revisions: int = 0  # w:ins/w:del elements written
+    elapsed_seconds: float = 0.0
+    workers: int = 1
+    units: list[dict] = []  # Per-unit timing: unit, part, old_blocks, new_blocks, revisions, seconds
+
+
+# Bump when a prompt below changes so cached LLM results are not reused.
+ANALYZE_PROMPT_VERSION = "2"
+EXTRACT_EDITS_PROMPT_VERSION = "1"
+
+
+def _require_file(path: str, label: str = "File") -> Path:
+    """Return the path if it exists, else raise FileNotFoundError with the CLI error message."""
+    file = Path(path)
+    if not file.exists():
+        raise FileNotFoundError(f"{label} not found: {path}")
+    return file
+
+
+def _fail(message: str) -> NoReturn:
+    """Print a JSON error and exit with status 1."""
+    print(json.dumps({"error": message}))
+    raise typer.Exit(code=1)
+
+
+# --- In-process API ---
+#
+# Each command's logic lives in a plain function returning a Pydantic model so
+# skill scripts and orchestrators can call it without Typer or stdout JSON.
+# Functions raise FileNotFoundError/ValueError for bad input and RuntimeError
+# when the LLM call fails.
+
+def load_document_text(input_path: str, use_cache: bool = True) -> str:
+    """Read the text of a DOCX, TXT or MD document.
+
+    DOCX parses go through the parsed-document cache unless use_cache is False.
+    """
+    input_file = _require_file(input_path)
+
+    suffix = input_file.suffix.lower()
+    if suffix in [".txt", ".md"]:
+        return input_file.read_text()
+    if suffix == ".docx":
+        from .ooxml import to_markdown
+
+        # Markdown keeps headings, numbering and tables, which the section
+        # splitter used by `analyze_text` relies on.
+        return to_markdown(_read_docx_blocks(input_file, use_cache))
+    raise ValueError(f"Unsupported file type: {suffix}")
+
+
+def _read_docx_blocks(input_file: Path, use_cache: bool = True) -> list["Block"]:
+    """Parse a DOCX into ooxml Blocks, raising ValueError if it cannot be read."""
+    import zipfile
+
+    from lxml import etree
+
+    from .parsed import read_docx_cached
+
+    try:
+        return read_docx_cached(input_file, use_cache)
+    except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError) as e:
+        raise ValueError(f"Failed to read DOCX: {e}") from e
+
+
+def convert_document(
+    input_path: str, output_dir: str, preserve_structure: bool = True, use_cache: bool = True
+) -> ConvertResult:
+    """Convert a DOCX to Markdown plus a section-map JSON in output_dir.
+
+    Writes <stem>.md and <stem>.sections.json. Raises ValueError for
+    non-DOCX input or an unreadable package.
+    """
+    from .ooxml import section_map, to_markdown
+
+    input_file = _require_file(input_path)
+    if input_file.suffix.lower() != ".docx":
+        raise ValueError(f"Unsupported file type: {input_file.suffix.lower()}")
+    out_path = Path(output_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    blocks = _read_docx_blocks(input_file, use_cache)
+    sections = section_map(blocks)
+
+    markdown_file = out_path / f"{input_file.stem}.md"
+    map_file = out_path / f"{input_file.stem}.sections.json"
+    markdown_file.write_text(to_markdown(blocks, preserve_structure), encoding="utf-8")
+    map_file.write_text(json.dumps({"source": str(input_file), "sections": sections}, indent=2), encoding="utf-8")
+
+    return ConvertResult(
+        status="complete",
+        input=str(input_file),
+        output_dir=str(out_path),
+        preserve_structure=preserve_structure,
+        markdown=str(markdown_file),
+        section_map=str(map_file),
+        paragraphs=sum(1 for b in blocks if b.kind == "paragraph"),
+        tables=sum(1 for b in blocks if b.kind == "table"),
+        sections=len(sections),
+    )
+
+
+def _edit_result(input_file: Path, output_file: Path, outcomes: list[dict], **fields) -> EditResult:
+    applied = sum(o["status"] == "applied" for o in outcomes)
+    return EditResult(
+        status="complete" if applied == len(outcomes) else "partial" if applied else "no_changes",
+        input=str(input_file),
+        output=str(output_file) if applied else None,
+        edits_applied=applied,
+        conflicts=sum(o["status"] == "conflict" for o in outcomes),
+        not_found=sum(o["status"] == "not_found" for o in outcomes),
+        results=outcomes,
+        **fields,
+    )
+
+
+def edit_document(input_path: str, section: str, content: Optional[str], output: str) -> EditResult:
+    """Replace (or remove, if content is None) one section of a DOCX.
+
+    Raises ValueError if the section cannot be found.
+    """
+    import zipfile
+
+    from lxml import etree
+
+    from .editing import Edit, apply_edits
+
+    input_file = _require_file(input_path)
+    output_file = Path(output)
+    try:
+        outcomes = apply_edits(input_file, output_file, [Edit(section=section, replacement_text=content)])
+    except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError) as e:
+        raise ValueError(f"Failed to read DOCX: {e}") from e
+    if outcomes[0]["status"] != "applied":
+        raise ValueError(outcomes[0]["detail"])
+    return _edit_result(input_file, output_file, outcomes, section=section, content=content)
+
+
+def apply_extracted_edits(input_path: str, edits: ExtractedEdits, output: str) -> EditResult:
+    """Apply every edit in an ExtractedEdits batch to a DOCX, parsing and saving it once.
+
+    Edits with original_text replace that text (within their section when
+    it can be found); edits with only a section replace the section body.
+    Overlapping edits are reported as conflicts and skipped.
+    """
+    import zipfile
+
+    from lxml import etree
+
+    from .editing import Edit, apply_edits
+
+    input_file = _require_file(input_path)
+    output_file = Path(output)
+    batch = [
+        Edit(section=e.section, original_text=e.original_text, replacement_text=e.replacement_text)
+        for e in edits.edits
+    ]
+    try:
+        outcomes = apply_edits(input_file, output_file, batch)
+    except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError) as e:
+        raise ValueError(f"Failed to read DOCX: {e}") from e
+    return _edit_result(input_file, output_file, outcomes)
+
+
+def load_edits(edits_path: str) -> ExtractedEdits:
+    """Read an ExtractedEdits JSON file (as written by extract-edits).
+
+    Raises ValueError if it does not match the schema.
+    """
+    from pydantic import ValidationError
+
+    try:
+        return ExtractedEdits.model_validate_json(_require_file(edits_path, "Edits file").read_text())
+    except ValidationError as e:
+        raise ValueError(f"Invalid edits file: {e}") from e
+
+
+def redline_documents(
+    original: str, modified: str, output: str, author: Optional[str] = None, workers: Optional[int] = None
+) -> RedlineResult:
+    """Write a Track Changes DOCX comparing original to modified.
+
+    The output is the modified document with every difference from the
+    original recorded as w:ins/w:del revisions (see `redline.py`); workers
+    caps the processes used to diff sections and parts in parallel. Raises
+    ValueError if either file is not a readable DOCX.
+    """
+    import time
+    import zipfile
+
+    from lxml import etree
+
+    from .redline import DEFAULT_AUTHOR, DEFAULT_WORKERS, redline_files
+
+    original_file = _require_file(original, "Original file")
+    modified_file = _require_file(modified, "Modified file")
+    output_file = Path(output)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    author = author or DEFAULT_AUTHOR
+
+    started = time.perf_counter()
+    try:
+        stats = redline_files(original_file, modified_file, output_file, author, workers or DEFAULT_WORKERS)
+    except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError) as e:
+        raise ValueError(f"Failed to read DOCX: {e}") from e
+
+    return RedlineResult(
+        status="complete",
+        original=str(original_file),
+        modified=str(modified_file),
+        output=str(output_file),
+        author=author,
+        unchanged=stats.unchanged,
+        inserted=stats.inserted,
+        deleted=stats.deleted,
+        modified_blocks=stats.modified,
+        revisions=stats.revisions,
+        elapsed_seconds=round(time.perf_counter() - started, 3),
+        workers=stats.workers,
+        units=stats.units,
+    )
+
+
+def _analysis_prompt(text: str, excerpt: bool) -> str:
+    """Build the regulatory analysis prompt for a whole document or one excerpt of it."""
+    scope = (
+        "Document excerpt (one part of a longer document; analyze only this text):"
+        if excerpt
+        else "Document text:"
+    )
+    return f"""Analyze this legal document for regulatory concerns.
+
+Identify:
+1. Regulatory categories that apply (data_privacy, financial, healthcare, employment, intellectual_property, etc.)
+2. Jurisdictions mentioned or implied (states, countries, regulatory frameworks like GDPR)
+3. Risk level (high/medium/low/none) based on regulatory exposure
+4. Specific concerns or issues that should be reviewed
+
+{scope}
+{text}
+"""
+
+
+def _dedupe(values: list[str]) -> list[str]:
+    """Drop case/whitespace-insensitive duplicates, keeping first occurrences."""
+    seen: set[str] = set()
+    unique = []
+    for value in values:
+        normalized = " ".join(value.split()).casefold()
+        if normalized not in seen:
+            seen.add(normalized)
+            unique.append(value)
+    return unique
+
+
+def merge_analyses(analyses: list[RegulatoryAnalysis]) -> RegulatoryAnalysis:
+    """Combine per-chunk analyses: union categories/jurisdictions, max risk, deduped concerns."""
+    if len(analyses) == 1:
+        return analyses[0]
+
+    categories: dict[str, list[str]] = {}
+    for analysis in analyses:
+        for category, terms in analysis.regulatory_categories.items():
+            categories.setdefault(category, []).extend(terms)
+
+    return RegulatoryAnalysis(
+        regulatory_categories={category: _dedupe(terms) for category, terms in categories.items()},
+        jurisdictions=_dedupe([j for a in analyses for j in a.jurisdictions]),
+        risk_level=max((a.risk_level for a in analyses), key=RISK_LEVELS.index),
+        key_concerns=_dedupe([c for a in analyses for c in a.key_concerns]),
+        reasoning="\n\n".join(f"[Part {i}] {a.reasoning}" for i, a in enumerate(analyses, 1)),
+    )
+
+
+class AnalysisStats(BaseModel):
+    """How a document analysis was split and how much of it came from cache."""
+    sections: int
+    chunks: int
+    chunks_reused: int
+    chunks_analyzed: int
+    chars_sent: int
+
+
+def analyze_text_with_stats(
+    text: str,
+    use_cache: bool = True,
+    chunk_size: int = ANALYZE_CHUNK_SIZE,
+    parallelism: int = ANALYZE_PARALLELISM,
+    incremental: bool = False,
+) -> tuple[RegulatoryAnalysis, AnalysisStats]:
+    """Analyze document text and report chunking/cache statistics.
+
+    The text is split on section headings. Documents up to chunk_size
+    characters go out in one request and longer ones are packed greedily
+    into chunk_size chunks. In incremental mode (opt-in: it sends even a
+    short document as several requests plus a merge) sections are grouped
+    with `content_defined_chunks` instead, so when a revised draft arrives
+    only the chunks containing new or changed sections miss the cache and
+    are sent to the model; the rest reuse their stored per-chunk results
+    and the document-level analysis is re-merged. Raises ValueError if
+    chunk_size is less than 1.
+    """
+    import asyncio
+
+    from .agents import llm_cache, llm_cache_key, run_async, run_coroutine
+    from .sections import chunk_sections, content_defined_chunks, split_sections
+
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, not {chunk_size}")
+    sections = split_sections(text)
+    if incremental:
+        grouped = content_defined_chunks(sections, min(INCREMENTAL_CHUNK_SIZE, chunk_size), chunk_size)
+    elif len(text) <= chunk_size:
+        grouped = [sections]
+    else:
+        grouped = chunk_sections(sections, chunk_size)
+    chunks = ["".join(s.text for s in chunk) for chunk in grouped] or [text]
+    excerpt = len(chunks) > 1
+
+    keys = [llm_cache_key(RegulatoryAnalysis, ANALYZE_PROMPT_VERSION, chunk) if use_cache else None for chunk in chunks]
+    cached = [llm_cache().get(key) if key else None for key in keys]
+    pending = [i for i, hit in enumerate(cached) if hit is None]
+
+    async def analyze_pending() -> list[RegulatoryAnalysis]:
+        semaphore = asyncio.Semaphore(max(1, parallelism))
+
+        async def analyze_chunk(i: int) -> RegulatoryAnalysis:
+            async with semaphore:
+                return await run_async(RegulatoryAnalysis, _analysis_prompt(chunks[i], excerpt), cache_key=keys[i])
+
+        return list(await asyncio.gather(*(analyze_chunk(i) for i in pending)))
+
+    try:
+        fresh = dict(zip(pending, run_coroutine(analyze_pending()))) if pending else {}
+    except Exception as e:
+        raise RuntimeError(f"LLM analysis failed: {e}") from e
+
+    results = [fresh[i] if i in fresh else RegulatoryAnalysis.model_validate(cached[i]) for i in range(len(chunks))]
+    stats = AnalysisStats(
+        sections=len(sections),
+        chunks=len(chunks),
+        chunks_reused=len(chunks) - len(pending),
+        chunks_analyzed=len(pending),
+        chars_sent=sum(len(chunks[i]) for i in pending),
+    )
+    return merge_analyses(results), stats
+
+
+def analyze_text(
+    text: str,
+    use_cache: bool = True,
+    chunk_size: int = ANALYZE_CHUNK_SIZE,
+    parallelism: int = ANALYZE_PARALLELISM,
+    incremental: bool = False,
+) -> RegulatoryAnalysis:
+    """Analyze document text for regulatory concerns using the LLM.
+
+    Long documents are split on section headings, the chunks are analyzed
+    concurrently (at most parallelism at a time), and the per-chunk results
+    are merged with `merge_analyses`. See `analyze_text_with_stats`.
+    """
+    return analyze_text_with_stats(text, use_cache, chunk_size, parallelism, incremental)[0]
+
+
+def analyze_document(
+    input_path: str,
+    use_cache: bool = True,
+    chunk_size: int = ANALYZE_CHUNK_SIZE,
+    parallelism: int = ANALYZE_PARALLELISM,
+    incremental: bool = False,
+) -> RegulatoryAnalysis:
+    """Load a document and analyze it for regulatory concerns."""
+    return analyze_text(load_document_text(input_path, use_cache), use_cache, chunk_size, parallelism, incremental)
+
+
+def extract_edits_from_text(text: str, use_cache: bool = True) -> ExtractedEdits:
+    """Extract structured edit instructions from free text using the LLM."""
+    from .agents import llm_cache_key, run_sync
+
+    prompt = f"""Extract edit instructions from this text.
+
+For each edit request found, identify:
+1. The section reference (if mentioned, e.g., "Section 3.2", "Article IV")
+2. The original text that should be changed
+3. The replacement text
+4. Context around the instruction
+
+Common patterns:
+- "Change X to Y"
+- "Replace X with Y"
+- "In Section N, X should read Y"
+- "Delete the phrase X"
+- "Add Y after X"
+
+Text to analyze:
+{text}
+"""
+
+    try:
+        key = llm_cache_key(ExtractedEdits, EXTRACT_EDITS_PROMPT_VERSION, text) if use_cache else None
+        return run_sync(ExtractedEdits, prompt, cache_key=key)
+    except Exception as e:
+        raise RuntimeError(f"LLM extraction failed: {e}") from e
+
+
+def extract_edits_from_file(input_path: str, use_cache: bool = True) -> ExtractedEdits:
+    """Read a text file and extract edit instructions from it."""
+    return extract_edits_from_text(_require_file(input_path).read_text(), use_cache=use_cache)
+
+
+def parsed_cache_stats(prune: bool = False, clear: bool = False) -> dict:
+    """Return parsed-document cache stats, optionally pruning or clearing it first."""
+    from .parsed import parsed_cache
+
+    cache = parsed_cache()
+    stats: dict = {}
+    if clear:
+        stats["removed"] = cache.clear()
+    elif prune:
+        stats.update(cache.prune())
+    return {**cache.stats(), **stats}
+
+
+# --- Typer commands ---
 
 
 @app.command()
@@ -49,75 +523,54 @@ def convert(
     preserve_structure: bool = typer.Option(
         True, "--preserve-structure", help="Keep section hierarchy"
     ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-parse the DOCX instead of using the parsed-document cache"),
 ):
     """Convert DOCX to Markdown preserving document structure.
 
     Input: DOCX file path.
-    Output: Markdown file with sections mapped.
+    Output: Markdown file (headings, resolved numbering, tables) plus a
+    section-map JSON listing each numbered section and heading.
     Use when user needs editable text from a contract.
     """
-    input_file = Path(input_path)
-    out_path = Path(output_dir)
-
-    if not input_file.exists():
-        print(json.dumps({"error": f"File not found: {input_path}"}))
-        raise typer.Exit(code=1)
-
-    out_path.mkdir(parents=True, exist_ok=True)
+    try:
+        result = convert_document(input_path, output_dir, preserve_structure, use_cache=not no_cache)
+    except (FileNotFoundError, ValueError) as e:
+        _fail(str(e))
 
-    # TODO: Implement with python-docx preserving section structure
-    print(
-        json.dumps(
-            {
-                "status": "stub",
-                "action": "documents convert",
-                "input": str(input_file),
-                "output_dir": str(out_path),
-                "preserve_structure": preserve_structure,
-            }
-        )
-    )
+    print(json.dumps(result.model_dump()))
 
 
 @app.command()
 def edit(
     input_path: str = typer.Argument(..., help="Path to DOCX file"),
-    section: str = typer.Option(
-        ..., "--section", "-s", help="Section ID to edit (e.g., '3.2' or 'definitions')"
+    section: Optional[str] = typer.Option(
+        None, "--section", "-s", help="Section ID to edit (e.g., '3.2' or 'definitions')"
     ),
     content: Optional[str] = typer.Option(
         None, "--content", "-c", help="New content for the section"
     ),
+    edits: Optional[str] = typer.Option(
+        None, "--edits", "-e", help="JSON file of edits (extract-edits output) to apply in one pass"
+    ),
     output: str = typer.Option(..., "--output", "-o", help="Output DOCX path"),
 ):
-    """Edit a specific section of a DOCX document.
+    """Edit a specific section of a DOCX document, or apply a batch of edits.
 
-    Input: DOCX path, section ID, new content.
-    Output: Modified DOCX.
-    Use when user wants to change a specific clause.
+    Input: DOCX path and either a section ID with new content, or an edits JSON file.
+    Output: Modified DOCX plus per-edit results (applied, not_found, conflict).
+    Use when user wants to change a specific clause or apply extracted edits.
     """
-    input_file = Path(input_path)
-    output_file = Path(output)
-
-    if not input_file.exists():
-        print(json.dumps({"error": f"File not found: {input_path}"}))
-        raise typer.Exit(code=1)
-
-    output_file.parent.mkdir(parents=True, exist_ok=True)
+    if (section is None) == (edits is None):
+        _fail("Provide either --section or --edits")
+    try:
+        if edits:
+            result = apply_extracted_edits(input_path, load_edits(edits), output)
+        else:
+            result = edit_document(input_path, section, content, output)
+    except (FileNotFoundError, ValueError) as e:
+        _fail(str(e))
 
-    # TODO: Implement section-level editing with python-docx
-    print(
-        json.dumps(
-            {
-                "status": "stub",
-                "action": "documents edit",
-                "input": str(input_file),
-                "section": section,
-                "content": content,
-                "output": str(output_file),
-            }
-        )
-    )
+    print(json.dumps(result.model_dump()))
 
 
 @app.command()
@@ -125,96 +578,59 @@ def redline(
     original: str = typer.Option(..., "--original", help="Path to original DOCX"),
     modified: str = typer.Option(..., "--modified", help="Path to modified DOCX"),
     output: str = typer.Option(..., "--output", "-o", help="Output path for redlined DOCX"),
+    author: Optional[str] = typer.Option(None, "--author", help="Revision author shown in Word (default: aech-cli-legal)"),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w", min=1, help="Processes for diffing sections and parts in parallel (default: up to 4)"
+    ),
 ):
     """Generate Word Track Changes between two DOCX versions.
 
     Input: original and modified DOCX paths.
-    Output: DOCX with Track Changes markup.
+    Output: DOCX with Track Changes markup (paragraph alignment, word-level
+    insertions and deletions) plus counts of unchanged/inserted/deleted/modified
+    paragraphs and per-unit (section, header, footnotes) timing.
     Use when user needs to review changes between contract versions.
     """
-    original_file = Path(original)
-    modified_file = Path(modified)
-    output_file = Path(output)
-
-    if not original_file.exists():
-        print(json.dumps({"error": f"Original file not found: {original}"}))
-        raise typer.Exit(code=1)
-
-    if not modified_file.exists():
-        print(json.dumps({"error": f"Modified file not found: {modified}"}))
-        raise typer.Exit(code=1)
-
-    output_file.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        result = redline_documents(original, modified, output, author, workers)
+    except (FileNotFoundError, ValueError) as e:
+        _fail(str(e))
 
-    # TODO: Implement Track Changes generation
-    print(
-        json.dumps(
-            {
-                "status": "stub",
-                "action": "documents redline",
-                "original": str(original_file),
-                "modified": str(modified_file),
-                "output": str(output_file),
-            }
-        )
-    )
+    print(json.dumps(result.model_dump()))
 
 
 @app.command()
 def analyze(
     input_path: str = typer.Argument(..., help="Path to document (DOCX, TXT, or MD)"),
     output: Optional[str] = typer.Option(None, "--output", "-o", help="Output JSON file"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the LLM response and parsed-document caches"),
+    chunk_size: int = typer.Option(
+        ANALYZE_CHUNK_SIZE, "--chunk-size", min=1, help="Max characters per LLM request; longer documents are chunked by section"
+    ),
+    parallelism: int = typer.Option(
+        ANALYZE_PARALLELISM, "--parallelism", help="Max chunks analyzed concurrently"
+    ),
+    incremental: bool = typer.Option(
+        False, "--incremental/--no-incremental",
+        help="Analyze in ~8k-character chunks and reuse cached results for unchanged sections of earlier drafts",
+    ),
 ):
     """Analyze document for regulatory concerns and jurisdictions using LLM.
 
     Input: Document file path (DOCX, TXT, or MD).
     Output: JSON with regulatory categories, jurisdictions, risk level, and concerns.
     Use when reviewing contracts for compliance issues or regulatory exposure.
+    Long documents are split on section headings and analyzed in parallel chunks;
+    with --incremental, re-analyzing a revised draft only sends new or changed sections.
     """
-    input_file = Path(input_path)
-
-    if not input_file.exists():
-        print(json.dumps({"error": f"File not found: {input_path}"}))
-        raise typer.Exit(code=1)
-
-    # Read document text
-    suffix = input_file.suffix.lower()
-    if suffix in [".txt", ".md"]:
-        text = input_file.read_text()
-    elif suffix == ".docx":
-        try:
-            from docx import Document
-            doc = Document(str(input_file))
-            text = "\n".join(para.text for para in doc.paragraphs)
-        except Exception as e:
-            print(json.dumps({"error": f"Failed to read DOCX: {e}"}))
-            raise typer.Exit(code=1)
-    else:
-        print(json.dumps({"error": f"Unsupported file type: {suffix}"}))
-        raise typer.Exit(code=1)
-
-    # LLM-powered analysis
-    agent = Agent(_get_model(), result_type=RegulatoryAnalysis)
-
-    prompt = f"""Analyze this legal document for regulatory concerns.
-
-Identify:
-1. Regulatory categories that apply (data_privacy, financial, healthcare, employment, intellectual_property, etc.)
-2. Jurisdictions mentioned or implied (states, countries, regulatory frameworks like GDPR)
-3. Risk level (high/medium/low/none) based on regulatory exposure
-4. Specific concerns or issues that should be reviewed
-
-Document text:
-{text[:50000]}  # Limit to ~50k chars for context window
-"""
-
     try:
-        result = agent.run_sync(prompt)
-        analysis = result.data.model_dump()
-        analysis["source"] = str(input_file)
-    except Exception as e:
-        print(json.dumps({"error": f"LLM analysis failed: {e}"}))
-        raise typer.Exit(code=1)
+        text = load_document_text(input_path, use_cache=not no_cache)
+        result, stats = analyze_text_with_stats(text, not no_cache, chunk_size, parallelism, incremental)
+    except (FileNotFoundError, ValueError, RuntimeError) as e:
+        _fail(str(e))
+    analysis = result.model_dump()
+    analysis["source"] = str(Path(input_path))
+    analysis["chunks"] = stats.model_dump()
 
     output_json = json.dumps(analysis, indent=2)
     if output:
@@ -228,6 +644,7 @@ Document text:
 def extract_edits(
     input_path: str = typer.Argument(..., help="Path to text file with edit instructions"),
     output: Optional[str] = typer.Option(None, "--output", "-o", help="Output JSON file"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the LLM response cache"),
 ):
     """Extract edit instructions from text (email, comments) using LLM.
 
@@ -235,44 +652,12 @@ def extract_edits(
     Output: JSON with structured edit instructions (section, original, replacement).
     Use when processing email feedback or markup comments into actionable edits.
     """
-    input_file = Path(input_path)
-
-    if not input_file.exists():
-        print(json.dumps({"error": f"File not found: {input_path}"}))
-        raise typer.Exit(code=1)
-
-    text = input_file.read_text()
-
-    # LLM-powered extraction
-    agent = Agent(_get_model(), result_type=ExtractedEdits)
-
-    prompt = f"""Extract edit instructions from this text.
-
-For each edit request found, identify:
-1. The section reference (if mentioned, e.g., "Section 3.2", "Article IV")
-2. The original text that should be changed
-3. The replacement text
-4. Context around the instruction
-
-Common patterns:
-- "Change X to Y"
-- "Replace X with Y"
-- "In Section N, X should read Y"
-- "Delete the phrase X"
-- "Add Y after X"
-
-Text to analyze:
-{text}
-"""
-
     try:
-        result = agent.run_sync(prompt)
-        extracted = result.data.model_dump()
-        extracted["source"] = str(input_file)
-        extracted["edit_count"] = len(extracted["edits"])
-    except Exception as e:
-        print(json.dumps({"error": f"LLM extraction failed: {e}"}))
-        raise typer.Exit(code=1)
+        extracted = extract_edits_from_file(input_path, use_cache=not no_cache).model_dump()
+    except (FileNotFoundError, RuntimeError) as e:
+        _fail(str(e))
+    extracted["source"] = str(Path(input_path))
+    extracted["edit_count"] = len(extracted["edits"])
 
     output_json = json.dumps(extracted, indent=2)
     if output:
@@ -280,3 +665,17 @@ Text to analyze:
         print(json.dumps({"status": "complete", "output": output, "edit_count": extracted["edit_count"]}))
     else:
         print(output_json)
+
+
+@app.command()
+def cache(
+    prune: bool = typer.Option(False, "--prune", help="Evict least-recently-used entries over the size budget"),
+    clear: bool = typer.Option(False, "--clear", help="Remove every cached parse"),
+):
+    """Inspect or prune the parsed-document cache.
+
+    Input: optional --prune or --clear.
+    Output: JSON with cache directory, entry count and size.
+    Use to check or reclaim the disk space used by cached DOCX parses.
+    """
+    print(json.dumps({"action": "documents cache", **parsed_cache_stats(prune, clear)}))
@@ -0,0 +1,241 @@
+"""Apply section and text edits to a DOCX in one pass.
+
+The document is parsed once and sections are resolved through its cached
+SectionIndex (see section_index.py). Every edit is resolved against the
+original document first, overlapping edits are rejected as conflicts, and the surviving
+edits are applied in memory and written out in a single package rewrite.
+
+Two kinds of edit are supported:
+
+- section edits replace (or, with no content, remove) the body of a
+  numbered or headed section, e.g. "3.2", "3.2(a)" or "Indemnification";
+- text edits replace original_text with replacement_text, optionally
+  scoped to a section, keeping the formatting of the run the match
+  starts in.
+"""
+
+import re
+from copy import deepcopy
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from lxml import etree
+
+from .ooxml import DOCUMENT_PART, Block, W, body_elements, read_document, serialize, write_package
+from .parsed import read_docx_cached
+from .section_index import load_section_index
+
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+
+@dataclass
+class Edit:
+    """One requested change.
+
+    With original_text set this is a text edit (scoped to section when
+    given); otherwise it replaces the body of section with
+    replacement_text, or removes the section when replacement_text is None.
+    """
+    section: Optional[str] = None
+    original_text: str = ""
+    replacement_text: Optional[str] = None
+
+
+@dataclass
+class _Target:
+    """Where an edit lands: a block range, or a character span of one paragraph."""
+    edit_index: int
+    start: int  # First block
+    end: int  # One past the last block
+    span: Optional[tuple[int, int]] = None  # (start, end) offsets within paragraph `start`
+
+    def overlaps(self, other: "_Target") -> bool:
+        if self.start >= other.end or other.start >= self.end:
+            return False
+        if self.span is None or other.span is None:
+            return True
+        return self.span[0] < other.span[1] and other.span[0] < self.span[1]
+
+
+# --- Text matching ---
+
+def _text_segments(p: etree._Element) -> tuple[str, list[tuple[etree._Element, int, int]]]:
+    """Visible text of a paragraph plus the (w:t, start, end) offsets that make it up."""
+    text, segments = "", []
+    for node in p.iter(f"{W}t", f"{W}tab", f"{W}br", f"{W}cr", f"{W}noBreakHyphen"):
+        if node.tag == f"{W}t":
+            piece = node.text or ""
+            segments.append((node, len(text), len(text) + len(piece)))
+        else:
+            piece = {f"{W}tab": "\t", f"{W}noBreakHyphen": "-"}.get(node.tag, "\n")
+        text += piece
+    return text, segments
+
+
+def _find_span(text: str, needle: str) -> Optional[tuple[int, int]]:
+    """Exact match first, then a whitespace- and case-insensitive one."""
+    start = text.find(needle)
+    if start >= 0:
+        return start, start + len(needle)
+    words = needle.split()
+    if not words:
+        return None
+    pattern = r"\s+".join(re.escape(word) for word in words)
+    match = re.search(pattern, text, re.I)
+    return match.span() if match else None
+
+
+def _replace_span(p: etree._Element, span: tuple[int, int], replacement: str) -> None:
+    """Replace text[span] in a paragraph, keeping the formatting of the run where it starts."""
+    _, segments = _text_segments(p)
+    start, end = span
+    placed = False
+    for node, seg_start, seg_end in segments:
+        if seg_end <= start or seg_start >= end:
+            continue
+        value = node.text or ""
+        before = value[: max(0, start - seg_start)]
+        after = value[end - seg_start:] if end < seg_end else ""
+        node.text = before + ("" if placed else replacement) + after
+        node.set(XML_SPACE, "preserve")
+        placed = True
+
+
+# --- Section bodies ---
+
+def _paragraph(template: Optional[etree._Element], text: str, numbered: bool = True) -> etree._Element:
+    """New paragraph with the template's paragraph and first-run formatting."""
+    p = etree.Element(f"{W}p")
+    if template is not None:
+        ppr = template.find(f"{W}pPr")
+        if ppr is not None:
+            ppr = deepcopy(ppr)
+            if not numbered:
+                for num_pr in ppr.findall(f"{W}numPr"):
+                    ppr.remove(num_pr)
+            p.append(ppr)
+    run = etree.SubElement(p, f"{W}r")
+    first_run = template.find(f"{W}r") if template is not None else None
+    rpr = first_run.find(f"{W}rPr") if first_run is not None else None
+    if rpr is not None:
+        run.append(deepcopy(rpr))
+    t = etree.SubElement(run, f"{W}t")
+    t.text = text
+    t.set(XML_SPACE, "preserve")
+    return p
+
+
+def _content_paragraphs(content: str) -> list[str]:
+    return [" ".join(part.split()) for part in re.split(r"\n\s*\n", content.strip()) if part.strip()]
+
+
+def _set_paragraph_text(p: etree._Element, text: str) -> None:
+    _, segments = _text_segments(p)
+    if not segments:
+        p.append(_paragraph(p, text)[-1])
+        return
+    for n, (node, _, _) in enumerate(segments):
+        node.text = text if n == 0 else ""
+        if n == 0:
+            node.set(XML_SPACE, "preserve")
+
+
+def _replace_section(
+    body_blocks: list[etree._Element], blocks: list[Block], start: int, end: int, content: Optional[str]
+) -> None:
+    """Replace the body of the section spanning blocks[start:end], or remove it when content is None."""
+    if content is None:
+        for elem in body_blocks[start:end]:
+            elem.getparent().remove(elem)
+        return
+
+    paragraphs = _content_paragraphs(content)
+    opener = body_blocks[start]
+    if blocks[start].is_heading:
+        # Keep the heading; its body is replaced, styled like its first paragraph.
+        template = next((body_blocks[i] for i in range(start + 1, end) if body_blocks[i].tag == f"{W}p"), None)
+        new = [_paragraph(template, text) for text in paragraphs]
+    else:
+        # A numbered paragraph carries its own text: rewrite it, continue unnumbered.
+        _set_paragraph_text(opener, paragraphs[0] if paragraphs else "")
+        new = [_paragraph(opener, text, numbered=False) for text in paragraphs[1:]]
+
+    anchor = opener
+    for elem in body_blocks[start + 1:end]:
+        elem.getparent().remove(elem)
+    for elem in new:
+        anchor.addnext(elem)
+        anchor = elem
+
+
+# --- Driver ---
+
+def apply_edits(input_path: Path, output_path: Path, edits: list[Edit], use_cache: bool = True) -> list[dict]:
+    """Apply edits to the DOCX at input_path and write output_path once.
+
+    Every edit is located against the original document; an edit that
+    overlaps an earlier one is reported as a conflict and skipped. Returns
+    one outcome per edit: {"index", "section", "status", "detail"} with
+    status applied, not_found, conflict or invalid. The output is written
+    only if at least one edit applied.
+    """
+    blocks = read_docx_cached(input_path, use_cache)
+    sections = load_section_index(input_path, blocks, use_cache)
+    tree = read_document(input_path)
+    body = tree.getroot().find(f"{W}body")
+    body_blocks = body_elements(body)
+    if len(body_blocks) != len(blocks):
+        raise ValueError("Document body does not match its parsed structure")
+
+    outcomes: list[dict] = []
+    accepted: list[tuple[_Target, Edit]] = []
+
+    def outcome(index, edit, status, detail=""):
+        outcomes.append({"index": index, "section": edit.section, "status": status, "detail": detail})
+
+    for index, edit in enumerate(edits):
+        scope = sections.lookup(edit.section) if edit.section else None
+        if edit.section and scope is None and not edit.original_text:
+            outcome(index, edit, "not_found", f"Section not found: {edit.section}")
+            continue
+
+        if edit.original_text:
+            start, end = scope or (0, len(blocks))
+            target = None
+            for i in range(start, end):
+                if body_blocks[i].tag != f"{W}p":
+                    continue
+                span = _find_span(_text_segments(body_blocks[i])[0], edit.original_text)
+                if span:
+                    target = _Target(index, i, i + 1, span)
+                    break
+            if target is None:
+                where = f" in section {edit.section}" if scope else ""
+                outcome(index, edit, "not_found", f"Text not found{where}: {edit.original_text[:80]}")
+                continue
+        elif edit.section:
+            target = _Target(index, *scope)
+        else:
+            outcome(index, edit, "invalid", "Edit needs a section or original_text")
+            continue
+
+        clash = next((other for other, _ in accepted if other.overlaps(target)), None)
+        if clash is not None:
+            outcome(index, edit, "conflict", f"Overlaps edit {clash.edit_index}")
+            continue
+        accepted.append((target, edit))
+        outcome(index, edit, "applied")
+
+    # Apply from the end of the document backwards so earlier offsets stay valid.
+    order = sorted(accepted, key=lambda item: (item[0].start, item[0].span or (0, 0)), reverse=True)
+    for target, edit in order:
+        if target.span is not None:
+            _replace_span(body_blocks[target.start], target.span, edit.replacement_text or "")
+        else:
+            _replace_section(body_blocks, blocks, target.start, target.end, edit.replacement_text)
+
+    if accepted:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        write_package(input_path, output_path, {DOCUMENT_PART: serialize(tree)})
+    return sorted(outcomes, key=lambda o: o["index"])
@@ -0,0 +1,214 @@
+"""Text embeddings for the clause store.
+
+Every backend embeds a batch of texts into an (n, dim) float32 matrix of
+L2-normalized rows, so a dot product between two embeddings is their
+cosine similarity. The store records the backend's name and config()
+when its first document is indexed and rebuilds the same embedder for
+queries (see create_embedder), so queries and clauses always share a
+vector space.
+
+    hashing  Word unigrams and bigrams hashed into dim signed buckets (the
+             "hashing trick", a sparse random projection of the n-gram
+             counts), weighted by sublinear term frequency. Needs no model
+             or network, is deterministic across processes and embeds
+             thousands of clauses per second on one core. The default.
+    onnx     A sentence-embedding model exported to ONNX (model.onnx and
+             tokenizer.json in one directory, e.g. all-MiniLM-L6-v2), run
+             on CPU with onnxruntime and mean-pooled. Optional: needs
+             `pip install 'aech-cli-legal[onnx]'` and $AECH_LEGAL_ONNX_MODEL.
+    stub     A pseudo-random unit vector per distinct text. Deterministic
+             and instant, with no notion of similarity; for tests.
+"""
+
+import hashlib
+import os
+import re
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+DEFAULT_DIM = 256
+DEFAULT_EMBEDDER = "hashing"
+EMBEDDERS = ("hashing", "onnx", "stub")
+
+# Texts per onnxruntime call; sorted by length first so padding stays short.
+ONNX_BATCH = 64
+ONNX_MAX_TOKENS = 256
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+# Words too common in contracts to say anything about a clause.
+_STOP_WORDS = frozenset(
+    "a an and any are as at be by for from has have in is it its of on or such that the this to "
+    "was were which will with shall may hereof herein hereunder thereof".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Casefolded words of text, stop words dropped."""
+    return [word for word in _TOKEN_RE.findall(text.casefold()) if word not in _STOP_WORDS]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class Embedder(ABC):
+    """Interface of the embedding backends."""
+    name = ""
+    dim = 0
+
+    def config(self) -> dict:
+        """Settings that, with name, recreate an embedder producing the same vectors."""
+        return {"dim": self.dim}
+
+    @abstractmethod
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        """Return an (n, dim) float32 matrix of L2-normalized rows (all-zero for empty texts)."""
+
+
+class HashingEmbedder(Embedder):
+    """Feature-hashed bag of unigrams and bigrams."""
+    name = "hashing"
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        texts = list(texts)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        tokens = [tokenize(text) for text in texts]
+        words = [word for text in tokens for word in text]
+        if not words:
+            return matrix
+        # Number the batch's distinct words; everything after this is array work
+        # plus one crc32 per distinct word and distinct bigram.
+        vocabulary = {word: i for i, word in enumerate(dict.fromkeys(words))}
+        ids = np.fromiter(map(vocabulary.__getitem__, words), dtype=np.int64, count=len(words))
+        owner = np.repeat(np.arange(len(texts)), [len(text) for text in tokens])
+        encoded = [word.encode("utf-8") for word in vocabulary]
+        word_codes = [zlib.crc32(word) for word in encoded]
+
+        # Bigrams are adjacent words of the same text, numbered after the words.
+        # crc32("a b") is crc32(" b") continued from crc32("a").
+        adjacent = owner[1:] == owner[:-1]
+        vocabulary_size = len(vocabulary)
+        pairs, pair_ids = np.unique(ids[:-1][adjacent] * vocabulary_size + ids[1:][adjacent], return_inverse=True)
+        left, right = np.divmod(pairs, vocabulary_size)
+        pair_codes = [zlib.crc32(b" " + encoded[b], word_codes[a]) for a, b in zip(left.tolist(), right.tolist())]
+        codes = np.array(word_codes + pair_codes, dtype=np.int64)
+        buckets = codes % self.dim
+        signs = np.where(codes & 0x80000000, 1.0, -1.0)
+
+        # Count each (text, feature) once, then weight by 1 + log(count).
+        features = len(codes)
+        keys = np.concatenate([owner * features + ids, owner[1:][adjacent] * features + vocabulary_size + pair_ids])
+        keys, counts = np.unique(keys, return_counts=True)
+        rows, feature = np.divmod(keys, features)
+        weights = signs[feature] * (1.0 + np.log(counts))
+        matrix += np.bincount(
+            rows * self.dim + buckets[feature], weights=weights, minlength=len(texts) * self.dim
+        ).reshape(len(texts), self.dim).astype(np.float32)
+        return _normalize_rows(matrix)
+
+
+class StubEmbedder(Embedder):
+    """Pseudo-random unit vector seeded by each text's hash."""
+    name = "stub"
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        rows = []
+        for text in texts:
+            if not text.strip():
+                rows.append(np.zeros(self.dim, dtype=np.float32))
+                continue
+            seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+            rows.append(np.random.default_rng(seed).standard_normal(self.dim, dtype=np.float32))
+        if not rows:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return _normalize_rows(np.stack(rows))
+
+
+class OnnxEmbedder(Embedder):
+    """Mean-pooled token embeddings from an ONNX sentence-embedding model."""
+    name = "onnx"
+
+    def __init__(self, model: Optional[str] = None, max_tokens: int = ONNX_MAX_TOKENS, dim: Optional[int] = None):
+        """Load model.onnx and tokenizer.json from the model directory.
+
+        Raises ValueError if no model is given or set in AECH_LEGAL_ONNX_MODEL,
+        the files are missing, or onnxruntime/tokenizers are not installed.
+        """
+        model = model or os.environ.get("AECH_LEGAL_ONNX_MODEL")
+        if not model:
+            raise ValueError("The onnx embedder needs a model directory; set AECH_LEGAL_ONNX_MODEL")
+        directory = Path(model).expanduser().resolve()
+        for name in ("model.onnx", "tokenizer.json"):
+            if not (directory / name).exists():
+                raise ValueError(f"ONNX model directory {directory} has no {name}")
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ValueError(
+                f"The onnx embedder needs onnxruntime and tokenizers ({e}); pip install 'aech-cli-legal[onnx]'"
+            ) from e
+
+        self.model = str(directory)
+        self.max_tokens = max_tokens
+        self.tokenizer = Tokenizer.from_file(str(directory / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_tokens)
+        self.tokenizer.enable_padding()
+        self.session = onnxruntime.InferenceSession(str(directory / "model.onnx"), providers=["CPUExecutionProvider"])
+        self.inputs = {i.name for i in self.session.get_inputs()}
+        self.dim = dim or self.embed(["dimension probe"]).shape[1]
+
+    def config(self) -> dict:
+        return {"model": self.model, "max_tokens": self.max_tokens, "dim": self.dim}
+
+    def _run(self, texts: list[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feed = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self.inputs:
+            feed["token_type_ids"] = np.zeros_like(ids)
+        output = self.session.run(None, {k: v for k, v in feed.items() if k in self.inputs})[0]
+        if output.ndim == 2:  # Model already pools
+            return output.astype(np.float32)
+        weights = mask[:, :, None].astype(np.float32)
+        return ((output * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1.0)).astype(np.float32)
+
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        chunks = [order[start:start + ONNX_BATCH] for start in range(0, len(order), ONNX_BATCH)]
+        pooled = np.concatenate([self._run([texts[i] or " " for i in chunk]) for chunk in chunks])
+        matrix = np.empty_like(pooled)
+        matrix[order] = pooled
+        matrix[[i for i, text in enumerate(texts) if not text.strip()]] = 0
+        return _normalize_rows(matrix)
+
+
+def create_embedder(name: str = DEFAULT_EMBEDDER, config: Optional[dict] = None) -> Embedder:
+    """Build the named backend from a recorded config (empty for defaults).
+
+    Raises ValueError for an unknown name or an unusable onnx model.
+    """
+    config = config or {}
+    if name == "hashing":
+        return HashingEmbedder(config.get("dim", DEFAULT_DIM))
+    if name == "stub":
+        return StubEmbedder(config.get("dim", DEFAULT_DIM))
+    if name == "onnx":
+        return OnnxEmbedder(config.get("model"), config.get("max_tokens", ONNX_MAX_TOKENS), config.get("dim"))
+    raise ValueError(f"Unknown embedder: {name} (expected one of {', '.join(EMBEDDERS)})")
@@ -0,0 +1,248 @@
+"""Structured filters over clause metadata, evaluated as boolean masks.
+
+A search filter narrows the rows (distinct clause texts) considered by
+`ClauseStore.search` before any vector or BM25 scoring, and selects the
+deals `clauses deals` aggregates. Metadata lives on clause references
+(one per deal, document and section a text occurs in), so a row matches
+when one of its references matches every ref-level field and the row
+matches the clause type.
+
+FilterColumns is built once per store generation from SQLite and saved
+as .npy files (layout version FORMAT) that are memory-mapped at query
+time:
+
+    ref_ids           (r,) int64   clause_refs rowid, ascending
+    ref_rows          (r,) int64   vector row of each reference
+    <field>           (r,) int32   code into values[<field>] for deal_name,
+                                   deal_date, source, contract_type and
+                                   jurisdiction
+    clause_type       (n,) int32   code into values["clause_type"] per row
+    bitmap.<field>    (v, ceil(r / 8)) uint8, one packed bitmap per value
+                                   of contract_type and jurisdiction
+
+Deal names, dates and clause types have too many distinct values for a
+bitmap each (clause types fall back to the free-form section heading),
+so they are matched through their codes with np.isin; contract type and
+jurisdiction are few-valued and keep a precomputed bitmap per value, so
+a filter ORs the selected bitmaps and unpacks once. The codes also serve
+the per-deal aggregation. Values match case-insensitively.
+"""
+
+import json
+import re
+import shutil
+import sqlite3
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+_DATE_RE = re.compile(r"^(\d{4})(?:-(\d{1,2}))?(?:-(\d{1,2}))?")
+_UNKNOWN_DATE = -1
+
+# Version of the saved column layout; part of the saved directory's name.
+FORMAT = 2
+
+
+def date_key(value: Optional[str], upper: bool = False) -> int:
+    """Sortable yyyymmdd integer for an ISO-8601 date prefix ("2024", "2024-03", "2024-03-15").
+
+    Missing month/day count as the start of the period, or its end when
+    upper is set. Unparseable, out-of-range or empty values give -1.
+    """
+    match = _DATE_RE.match((value or "").strip())
+    if not match:
+        return _UNKNOWN_DATE
+    year, month, day = match.groups()
+    month = int(month) if month else (12 if upper else 1)
+    day = int(day) if day else (31 if upper else 1)
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return _UNKNOWN_DATE
+    return int(year) * 10000 + month * 100 + day
+
+
+@dataclass
+class ClauseFilter:
+    """Allowed values per field (any of, within a field; all fields must match)."""
+    deal_names: list[str] = field(default_factory=list)
+    contract_types: list[str] = field(default_factory=list)
+    jurisdictions: list[str] = field(default_factory=list)
+    clause_types: list[str] = field(default_factory=list)
+    date_from: Optional[str] = None  # Inclusive ISO-8601 prefixes
+    date_to: Optional[str] = None
+
+    def __post_init__(self):
+        for bound in (self.date_from, self.date_to):
+            if bound and date_key(bound) == _UNKNOWN_DATE:
+                raise ValueError(f"Invalid date: {bound} (expected ISO-8601, e.g. 2024-03-15)")
+
+    @property
+    def active(self) -> bool:
+        return any(self.describe().values())
+
+    def describe(self) -> dict:
+        """The non-empty criteria, for echoing in command output."""
+        criteria = {
+            "deal_name": self.deal_names,
+            "contract_type": self.contract_types,
+            "jurisdiction": self.jurisdictions,
+            "clause_type": self.clause_types,
+            "date_from": self.date_from,
+            "date_to": self.date_to,
+        }
+        return {name: value for name, value in criteria.items() if value}
+
+
+def _codes(values: list[str]) -> tuple[np.ndarray, list[str]]:
+    """Dictionary-encode values: (codes, distinct values in first-seen order)."""
+    index: dict[str, int] = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.int32, count=len(values))
+    return codes, list(index)
+
+
+def _bitmaps(codes: np.ndarray, distinct: int) -> np.ndarray:
+    """Packed bitmap per code value: row v has bit i set where codes[i] == v."""
+    bitmaps = np.zeros((distinct, (len(codes) + 7) // 8), dtype=np.uint8)
+    for value in range(distinct):
+        bitmaps[value] = np.packbits(codes == value)
+    return bitmaps
+
+
+def _selected(values: list[str], wanted: list[str]) -> list[int]:
+    wanted = {w.casefold().strip() for w in wanted}
+    return [code for code, value in enumerate(values) if value.casefold().strip() in wanted]
+
+
+@dataclass
+class FilterColumns:
+    rows: int  # Vector rows covered (meta "rows" at build time)
+    values: dict[str, list[str]]
+    arrays: dict[str, np.ndarray]
+    directory: Optional[Path] = None  # Saved copy; arrays not yet in arrays are mapped from here on first use
+
+    @classmethod
+    def build(cls, conn: sqlite3.Connection, rows: int) -> "FilterColumns":
+        """Read clause references and clause types; call inside a read transaction."""
+        refs = conn.execute(
+            "SELECT rowid, row, deal_name, COALESCE(deal_date, ''), source, "
+            "COALESCE(contract_type, ''), COALESCE(jurisdiction, '') FROM clause_refs ORDER BY rowid"
+        ).fetchall()
+        ref_ids, ref_rows, deal_names, deal_dates, sources, contract_types, jurisdictions = (
+            list(column) for column in zip(*refs)
+        ) if refs else ([] for _ in range(7))
+        clause_types = [""] * rows
+        for row, clause_type in conn.execute("SELECT row, clause_type FROM clauses"):
+            clause_types[row] = clause_type
+
+        values: dict[str, list[str]] = {}
+        arrays = {
+            "ref_ids": np.array(ref_ids, dtype=np.int64),
+            "ref_rows": np.array(ref_rows, dtype=np.int64),
+        }
+        columns = {
+            "deal_name": deal_names,
+            "deal_date": deal_dates,
+            "source": sources,
+            "contract_type": contract_types,
+            "jurisdiction": jurisdictions,
+        }
+        for name, column in columns.items():
+            arrays[name], values[name] = _codes(column)
+        for name in ("contract_type", "jurisdiction"):
+            arrays[f"bitmap.{name}"] = _bitmaps(arrays[name], len(values[name]))
+        arrays["clause_type"], values["clause_type"] = _codes(clause_types)
+        return cls(rows, values, arrays)
+
+    def save(self, directory: Path) -> None:
+        """Write under a temporary directory and rename into place; a concurrent builder's copy wins."""
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=directory.parent, prefix=directory.name + ".tmp"))
+        for name, array in self.arrays.items():
+            np.save(tmp / f"{name}.npy", array)
+        (tmp / "values.json").write_text(json.dumps({"rows": self.rows, "values": self.values}), encoding="utf-8")
+        try:
+            tmp.rename(directory)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: Path) -> "FilterColumns":
+        """Open saved columns, mapping each array when first used; raises FileNotFoundError if missing."""
+        saved = json.loads((directory / "values.json").read_text(encoding="utf-8"))
+        return cls(saved["rows"], saved["values"], {}, directory)
+
+    def array(self, name: str) -> np.ndarray:
+        if name not in self.arrays:
+            self.arrays[name] = np.load(self.directory / f"{name}.npy", mmap_mode="r")
+        return self.arrays[name]
+
+    def _bitmap_mask(self, name: str, wanted: list[str], size: int) -> Optional[np.ndarray]:
+        if not wanted:
+            return None
+        codes = _selected(self.values[name], wanted)
+        if not codes:
+            return np.zeros(size, dtype=bool)
+        packed = np.bitwise_or.reduce(self.array(f"bitmap.{name}")[codes], axis=0)
+        return np.unpackbits(packed, count=size).astype(bool)
+
+    def ref_mask(self, criteria: ClauseFilter) -> np.ndarray:
+        """References matching every criterion, including their row's clause type."""
+        refs = len(self.array("ref_ids"))
+        mask = np.ones(refs, dtype=bool)
+        if criteria.deal_names:
+            mask &= np.isin(self.array("deal_name"), _selected(self.values["deal_name"], criteria.deal_names))
+        if criteria.date_from or criteria.date_to:
+            keys = np.array([date_key(value) for value in self.values["deal_date"]] or [0], dtype=np.int32)
+            dates = keys[self.array("deal_date")]
+            low = date_key(criteria.date_from) if criteria.date_from else 0
+            high = date_key(criteria.date_to, upper=True) if criteria.date_to else np.iinfo(np.int32).max
+            mask &= (dates >= low) & (dates <= high)
+        for name, wanted in (("contract_type", criteria.contract_types), ("jurisdiction", criteria.jurisdictions)):
+            selected = self._bitmap_mask(name, wanted, refs)
+            if selected is not None:
+                mask &= selected
+        if criteria.clause_types:
+            codes = _selected(self.values["clause_type"], criteria.clause_types)
+            mask &= np.isin(self.array("clause_type"), codes)[self.array("ref_rows")]
+        return mask
+
+    def row_mask(self, ref_mask: np.ndarray) -> np.ndarray:
+        """Rows with at least one reference in ref_mask."""
+        mask = np.zeros(self.rows, dtype=bool)
+        mask[self.array("ref_rows")[ref_mask]] = True
+        return mask
+
+    def first_refs(self, ref_mask: np.ndarray, rows: list[int]) -> dict[int, int]:
+        """clause_refs rowid of the oldest matching reference of each of rows."""
+        selected = ref_mask & np.isin(self.array("ref_rows"), rows)
+        found, first = np.unique(self.array("ref_rows")[selected], return_index=True)
+        return dict(zip(found.tolist(), self.array("ref_ids")[selected][first].tolist()))
+
+    def deals(self, ref_mask: np.ndarray) -> list[dict]:
+        """Per deal with matching references: date, contract types, jurisdictions, document and clause counts."""
+        deal_codes = np.asarray(self.array("deal_name"))[ref_mask]
+        names = self.values["deal_name"]
+        clauses = np.bincount(deal_codes, minlength=len(names))
+        grouped: dict[str, dict[int, list[str]]] = {}
+        for name in ("deal_date", "source", "contract_type", "jurisdiction"):
+            pairs = np.unique(np.stack([deal_codes, np.asarray(self.array(name))[ref_mask]]), axis=1)
+            grouped[name] = {}
+            for deal, code in pairs.T.tolist():
+                if self.values[name][code]:
+                    grouped[name].setdefault(deal, []).append(self.values[name][code])
+
+        result = [
+            {
+                "deal_name": names[deal],
+                "deal_date": max(grouped["deal_date"].get(deal, []), key=date_key, default=None),
+                "contract_types": sorted(grouped["contract_type"].get(deal, [])),
+                "jurisdictions": sorted(grouped["jurisdiction"].get(deal, [])),
+                "documents": len(grouped["source"].get(deal, [])),
+                "clauses": int(clauses[deal]),
+            }
+            for deal in np.flatnonzero(clauses).tolist()
+        ]
+        result.sort(key=lambda deal: (-date_key(deal["deal_date"]), deal["deal_name"].casefold()))
+        return result
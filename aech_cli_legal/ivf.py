@@ -0,0 +1,143 @@
+"""Inverted-file (IVF) approximate nearest-neighbour index over unit vectors.
+
+Rows are grouped by their nearest k-means centroid (the coarse
+quantizer). A query scores the centroids, then only the rows of its
+nprobe best lists, so search touches roughly nprobe / nlist of the
+matrix. nprobe trades recall for latency: nprobe == nlist is exact.
+
+Everything is plain NumPy on CPU. The index is four arrays, saved as
+.npy files in one directory so they can be memory-mapped like the vectors
+themselves:
+
+    centroids  (nlist, dim) float32, L2-normalized
+    rows       (n,) int64, row ids grouped by list
+    offsets    (nlist + 1,) int64, list i is rows[offsets[i]:offsets[i + 1]]
+    vectors    (n, dim) float32, the rows' vectors in list order
+
+Keeping a list-ordered copy of the vectors doubles the store's size but
+makes each probed list one contiguous read; gathering the same rows from
+the original matrix costs several times more per row.
+"""
+
+import math
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+# Rows scored against the centroids per step, to bound temporary memory.
+ASSIGN_CHUNK = 16384
+# k-means trains on at most this many rows per list.
+TRAIN_ROWS_PER_LIST = 64
+KMEANS_ITERATIONS = 10
+DEFAULT_NPROBE = 16
+
+
+def default_nlist(rows: int) -> int:
+    """About sqrt(rows) lists, so list scans and centroid scoring cost about the same."""
+    return max(1, min(rows, round(math.sqrt(rows))))
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def assign(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for every row, computed in chunks."""
+    labels = np.empty(len(matrix), dtype=np.int64)
+    for start in range(0, len(matrix), ASSIGN_CHUNK):
+        chunk = np.asarray(matrix[start:start + ASSIGN_CHUNK], dtype=np.float32)
+        labels[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return labels
+
+
+def kmeans(matrix: np.ndarray, nlist: int, iterations: int = KMEANS_ITERATIONS, seed: int = 0) -> np.ndarray:
+    """Spherical k-means centroids trained on a sample of matrix's rows."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(matrix), nlist * TRAIN_ROWS_PER_LIST)
+    sample = np.asarray(matrix[np.sort(rng.choice(len(matrix), sample_size, replace=False))], dtype=np.float32)
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=nlist)
+        empty = counts == 0
+        if empty.any():
+            # Re-seed empty lists with random sample rows.
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+        centroids = _normalize(sums)
+    return centroids
+
+
+_ARRAYS = ("centroids", "rows", "offsets", "vectors")
+
+
+@dataclass
+class IVFIndex:
+    centroids: np.ndarray
+    rows: np.ndarray
+    offsets: np.ndarray
+    vectors: np.ndarray
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def build(
+        cls,
+        matrix: np.ndarray,
+        directory: Path,
+        nlist: int,
+        iterations: int = KMEANS_ITERATIONS,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """Train, write <array>.npy files to the new directory and return the mapped index.
+
+        The files are written under a temporary directory that is renamed
+        into place once complete, so directory never holds a partial index.
+        Raises OSError if directory already exists.
+        """
+        centroids = kmeans(matrix, nlist, iterations, seed)
+        labels = assign(matrix, centroids)
+        rows = np.argsort(labels, kind="stable").astype(np.int64)
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=nlist), out=offsets[1:])
+
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=directory.parent, prefix=directory.name + ".tmp"))
+        try:
+            vectors = np.lib.format.open_memmap(tmp / "vectors.npy", mode="w+", dtype=np.float32, shape=matrix.shape)
+            for start in range(0, len(rows), ASSIGN_CHUNK):
+                chunk = rows[start:start + ASSIGN_CHUNK]
+                # Gather in row order to read the source sequentially.
+                order = np.argsort(chunk)
+                vectors[start + order] = matrix[chunk[order]]
+            vectors.flush()
+            del vectors
+            for name, array in (("centroids", centroids), ("rows", rows), ("offsets", offsets)):
+                np.save(tmp / f"{name}.npy", array)
+            tmp.rename(directory)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        return cls.load(directory)
+
+    @classmethod
+    def load(cls, directory: Path) -> "IVFIndex":
+        """Memory-map a saved index; raises FileNotFoundError if it is missing."""
+        return cls(*(np.load(directory / f"{name}.npy", mmap_mode="r") for name in _ARRAYS))
+
+    def search(self, query: np.ndarray, nprobe: int) -> tuple[np.ndarray, np.ndarray]:
+        """Row ids and scores of every row in the nprobe lists nearest to query."""
+        nprobe = min(nprobe, self.nlist)
+        probe = np.sort(np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe])
+        spans = [(self.offsets[i], self.offsets[i + 1]) for i in probe]
+        ids = np.concatenate([self.rows[start:end] for start, end in spans])
+        scores = np.concatenate([self.vectors[start:end] @ query for start, end in spans])
+        return ids, scores
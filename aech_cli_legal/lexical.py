@@ -0,0 +1,173 @@
+"""BM25 inverted index over clause text, stored as NumPy arrays.
+
+The index is a list of immutable segments, one per write, each a directory
+of .npy arrays that are memory-mapped at query time:
+
+    terms    (t,) uint64      sorted term hashes
+    offsets  (t + 1,) int64   postings of terms[i] are [offsets[i], offsets[i + 1])
+    rows     (p,) int64       clause rows, ascending within each term
+    tfs      (p,) uint16      term frequency of the term in that clause
+
+Terms are 64-bit blake2b hashes of the words produced by
+embeddings.tokenize, so the lexicon is fixed-width and a lookup is a
+binary search. Clause lengths live in one array parallel to the clause
+vectors; a length of 0 marks a replaced clause, which is skipped at query
+time and dropped when segments are merged.
+"""
+
+import hashlib
+import shutil
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .embeddings import tokenize
+
+K1 = 1.2
+B = 0.75
+# Segments are merged into one when a write would leave more than this many.
+MAX_SEGMENTS = 8
+
+_ARRAYS = ("terms", "offsets", "rows", "tfs")
+_MAX_TF = np.iinfo(np.uint16).max
+
+
+@lru_cache(maxsize=1 << 16)
+def term_hash(word: str) -> int:
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def query_terms(text: str) -> np.ndarray:
+    """Unique term hashes of a query."""
+    return np.array(sorted({term_hash(word) for word in tokenize(text)}), dtype=np.uint64)
+
+
+@dataclass
+class Segment:
+    terms: np.ndarray
+    offsets: np.ndarray
+    rows: np.ndarray
+    tfs: np.ndarray
+
+    @classmethod
+    def from_postings(cls, terms: np.ndarray, rows: np.ndarray, tfs: np.ndarray) -> "Segment":
+        """Group unsorted (term, row, tf) postings into a segment."""
+        order = np.lexsort((rows, terms))
+        terms, rows, tfs = terms[order], rows[order], tfs[order]
+        unique, starts = np.unique(terms, return_index=True)
+        offsets = np.append(starts, len(terms)).astype(np.int64)
+        return cls(unique.astype(np.uint64), offsets, rows.astype(np.int64), tfs.astype(np.uint16))
+
+    @classmethod
+    def build(cls, texts: Iterable[str], first_row: int) -> tuple["Segment", np.ndarray]:
+        """Segment for clauses first_row, first_row + 1, ..., and their lengths in terms."""
+        terms, rows, tfs, lengths = [], [], [], []
+        for row, text in enumerate(texts, first_row):
+            counts = Counter(tokenize(text))
+            for word, count in counts.items():
+                terms.append(term_hash(word))
+                rows.append(row)
+                tfs.append(min(count, _MAX_TF))
+            lengths.append(sum(counts.values()))
+        segment = cls.from_postings(
+            np.array(terms, dtype=np.uint64), np.array(rows, dtype=np.int64), np.array(tfs, dtype=np.uint16)
+        )
+        return segment, np.array(lengths, dtype=np.uint32)
+
+    def save(self, directory: Path) -> None:
+        """Write the segment under a temporary name and rename it into place.
+
+        An existing directory of the same name is a leftover from an
+        interrupted write (live segments are never rewritten) and is replaced.
+        """
+        tmp = directory.with_name(directory.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        for name in _ARRAYS:
+            np.save(tmp / f"{name}.npy", getattr(self, name))
+        shutil.rmtree(directory, ignore_errors=True)
+        tmp.rename(directory)
+
+    @classmethod
+    def load(cls, directory: Path) -> "Segment":
+        return cls(*(np.load(directory / f"{name}.npy", mmap_mode="r") for name in _ARRAYS))
+
+    def lookup(self, terms: np.ndarray) -> list[tuple[int, int]]:
+        """(term index in the query, posting slice) for each query term present here."""
+        found = []
+        positions = np.searchsorted(self.terms, terms)
+        for i, position in enumerate(positions):
+            if position < len(self.terms) and self.terms[position] == terms[i]:
+                found.append((i, position))
+        return found
+
+
+def merge(segments: list[Segment], lengths: np.ndarray) -> Segment:
+    """One segment holding the postings of all segments, minus replaced clauses."""
+    terms, rows, tfs = [], [], []
+    for segment in segments:
+        counts = np.diff(segment.offsets)
+        terms.append(np.repeat(np.asarray(segment.terms), counts))
+        rows.append(np.asarray(segment.rows))
+        tfs.append(np.asarray(segment.tfs))
+    terms, rows, tfs = np.concatenate(terms), np.concatenate(rows), np.concatenate(tfs)
+    live = lengths[rows] > 0
+    return Segment.from_postings(terms[live], rows[live], tfs[live])
+
+
+def search(
+    segments: list[Segment], lengths: np.ndarray, query: str, top_k: int, allowed: Optional[np.ndarray] = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Rows and BM25 scores of the top_k clauses for query, best first.
+
+    allowed, a boolean mask over rows, restricts the candidates (a search
+    filter); term statistics still come from the whole collection.
+    """
+    terms = query_terms(query)
+    live = lengths > 0
+    docs = int(live.sum())
+    if not len(terms) or not docs:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    average_length = float(lengths.sum()) / docs
+
+    hits = [[] for _ in terms]
+    for segment in segments:
+        for term, position in segment.lookup(terms):
+            start, end = segment.offsets[position], segment.offsets[position + 1]
+            hits[term].append((segment.rows[start:end], segment.tfs[start:end]))
+
+    all_rows, all_weights = [], []
+    for postings in hits:
+        if not postings:
+            continue
+        rows = np.concatenate([rows for rows, _ in postings])
+        tfs = np.concatenate([tfs for _, tfs in postings]).astype(np.float32)
+        # Postings of replaced clauses stay in unmerged segments; skip them.
+        mask = live[rows]
+        rows, tfs = rows[mask], tfs[mask]
+        df = len(rows)
+        if not df:
+            continue
+        idf = np.log(1.0 + (docs - df + 0.5) / (df + 0.5))
+        norm = K1 * (1.0 - B + B * lengths[rows] / average_length)
+        all_rows.append(rows)
+        all_weights.append(idf * tfs * (K1 + 1.0) / (tfs + norm))
+    if not all_rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+    # Accumulate per clause densely: O(clauses + postings), no sort.
+    totals = np.bincount(np.concatenate(all_rows), weights=np.concatenate(all_weights), minlength=len(lengths))
+    if allowed is not None:
+        totals[~allowed[:len(totals)]] = 0
+    rows = np.flatnonzero(totals)
+    scores = totals[rows].astype(np.float32)
+    if not len(rows):
+        return rows, scores
+    k = min(top_k, len(rows))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return rows[top], scores[top]
@@ -1,27 +1,62 @@
 """Entry point for aech-cli-legal with subcommand groups."""
 
+import importlib
 import json
-import os
 import sys
+import time
 from functools import lru_cache
 from pathlib import Path
-from typing import Literal, Optional
+from typing import AsyncIterator, Callable, Iterable, Iterator, Literal, Optional, Union
 
+import click
 import typer
 from pydantic import BaseModel
-from pydantic_ai import Agent
+from typer.core import TyperGroup
 
-from . import clauses, dataroom, documents, research, sigpage
-from .model_utils import parse_model_string, get_model_settings
+# Subcommand groups: name -> (module, help). Modules are only imported when
+# their group is invoked, so a `sigpage` or `research` call never pays for
+# pydantic-ai, python-docx or the provider SDKs.
+SUBCOMMAND_GROUPS: dict[str, tuple[str, str]] = {
+    "documents": (".documents", "Document manipulation and comparison"),
+    "clauses": (".clauses", "Precedent and clause management"),
+    "research": (".research", "Legal research (cases, statutes)"),
+    "dataroom": (".dataroom", "Data room connections"),
+    "sigpage": (".sigpage", "Signature page generation"),
+}
 
-app = typer.Typer(help="Legal document workflows: editing, redlining, clause search, research, data rooms")
 
-# Register subcommand groups
-app.add_typer(documents.app, name="documents", help="Document manipulation and comparison")
-app.add_typer(clauses.app, name="clauses", help="Precedent and clause management")
-app.add_typer(research.app, name="research", help="Legal research (cases, statutes)")
-app.add_typer(dataroom.app, name="dataroom", help="Data room connections")
-app.add_typer(sigpage.app, name="sigpage", help="Signature page generation")
+def _load_group(name: str) -> click.Command:
+    """Import a subcommand module and build its click group."""
+    module_name, help_text = SUBCOMMAND_GROUPS[name]
+    module = importlib.import_module(module_name, __package__)
+    group = typer.main.get_group(module.app)
+    group.name = name
+    group.help = help_text
+    return group
+
+
+class LazyGroup(TyperGroup):
+    """Root group that resolves subcommand groups on first lookup."""
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        eager = super().list_commands(ctx)
+        return [name for name in SUBCOMMAND_GROUPS if name not in eager] + eager
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in SUBCOMMAND_GROUPS and cmd_name not in self.commands:
+            self.add_command(_load_group(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+app = typer.Typer(
+    cls=LazyGroup,
+    help="Legal document workflows: editing, redlining, clause search, research, data rooms",
+)
+
+
+@app.callback()
+def _root() -> None:
+    """Keep the root a command group even though only `classify` is registered eagerly."""
 
 
 # --- LLM-powered classification ---
@@ -35,44 +70,13 @@ class EmailClassification(BaseModel):
     reasoning: str  # Why this classification
 
 
-def _get_model_config() -> tuple[str, any]:
-    """Get the configured LLM model and settings from environment."""
-    model_string = os.environ.get("AECH_LLM_WORKER_MODEL", "openai:gpt-4o")
-    model_name, _ = parse_model_string(model_string)
-    model_settings = get_model_settings(model_string)
-    return model_name, model_settings
+# Bump when the classification prompt changes so cached results are not reused.
+CLASSIFY_PROMPT_VERSION = "1"
 
 
-@app.command()
-def classify(
-    input_path: str = typer.Argument(..., help="Path to email or text file to classify"),
-    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output JSON file"),
-):
-    """Classify email/text content using LLM.
-
-    Input: Text file (email content, message, etc.)
-    Output: JSON with classification, confidence, topic, and suggested action.
-    Use when triaging incoming communications to determine appropriate handling.
-
-    Classifications:
-    - edit_request: Contains document change requests
-    - research_question: Asks for legal research or analysis
-    - approval_request: Needs sign-off or decision
-    - informational: FYI only, no action needed
-    - urgent_action: Requires immediate attention
-    """
-    input_file = Path(input_path)
-
-    if not input_file.exists():
-        print(json.dumps({"error": f"File not found: {input_path}"}))
-        raise typer.Exit(code=1)
-
-    text = input_file.read_text()
-
-    model_name, model_settings = _get_model_config()
-    agent = Agent(model_name, result_type=EmailClassification, model_settings=model_settings)
-
-    prompt = f"""Classify this email/message for a legal workflow system.
+def _classification_prompt(text: str) -> str:
+    """Build the classification prompt for one email/message."""
+    return f"""Classify this email/message for a legal workflow system.
 
 Determine:
 1. Classification type:
@@ -91,13 +95,208 @@ Email/Message:
 {text}
 """
 
+
+def classify_text(text: str, use_cache: bool = True) -> EmailClassification:
+    """Classify email/message text using the LLM.
+
+    Raises RuntimeError if the LLM call fails.
+    """
+    from .agents import llm_cache_key, run_sync
+
+    try:
+        key = llm_cache_key(EmailClassification, CLASSIFY_PROMPT_VERSION, text) if use_cache else None
+        return run_sync(EmailClassification, _classification_prompt(text), cache_key=key)
+    except Exception as e:
+        raise RuntimeError(f"LLM classification failed: {e}") from e
+
+
+async def classify_text_async(
+    text: str, use_cache: bool = True, rate_limit: Optional[float] = None
+) -> EmailClassification:
+    """Async form of `classify_text` for use on the shared LLM loop.
+
+    Raises RuntimeError if the LLM call fails.
+    """
+    from .agents import llm_cache_key, run_async
+
     try:
-        result = agent.run_sync(prompt)
-        classification = result.data.model_dump()
-        classification["source"] = str(input_file)
+        key = llm_cache_key(EmailClassification, CLASSIFY_PROMPT_VERSION, text) if use_cache else None
+        return await run_async(EmailClassification, _classification_prompt(text), cache_key=key, rate_limit=rate_limit)
     except Exception as e:
-        print(json.dumps({"error": f"LLM classification failed: {e}"}))
+        raise RuntimeError(f"LLM classification failed: {e}") from e
+
+
+def classify_file(input_path: str, use_cache: bool = True) -> EmailClassification:
+    """Read a text file and classify it.
+
+    Raises FileNotFoundError if the file does not exist.
+    """
+    input_file = Path(input_path)
+    if not input_file.exists():
+        raise FileNotFoundError(f"File not found: {input_path}")
+    return classify_text(input_file.read_text(), use_cache=use_cache)
+
+
+def _read_text(path: Path) -> Callable[[], str]:
+    return lambda: path.read_text(errors="replace")
+
+
+def _invalid(message: str) -> Callable[[], str]:
+    def load() -> str:
+        raise ValueError(message)
+    return load
+
+
+def iter_batch_inputs(batch_path: str) -> Iterator[tuple[str, Callable[[], str]]]:
+    """Yield (source, load) pairs from a directory of files or a JSONL file; load() returns the text.
+
+    JSONL lines are objects with "text" (or "path" to a text file) and an
+    optional "id" used as the source label. Files are only read when load()
+    is called, and load() raises OSError for an unreadable file and
+    ValueError for a malformed line, so one bad item fails on its own.
+    Raises FileNotFoundError if batch_path does not exist.
+    """
+    batch = Path(batch_path)
+    if not batch.exists():
+        raise FileNotFoundError(f"Batch input not found: {batch_path}")
+
+    if batch.is_dir():
+        for file in sorted(batch.iterdir()):
+            if file.is_file() and not file.name.startswith("."):
+                yield str(file), _read_text(file)
+        return
+
+    with batch.open(encoding="utf-8") as handle:
+        for line_no, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            source = f"{batch_path}:{line_no}"
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield source, _invalid(f"Invalid JSON on line {line_no} of {batch_path}: {e}")
+                continue
+            if not isinstance(record, dict) or not ("text" in record or "path" in record):
+                yield source, _invalid(f"Line {line_no} of {batch_path} has neither 'text' nor 'path'")
+                continue
+            source = str(record.get("id", record.get("path", source)))
+            if "text" in record:
+                yield source, (lambda text=str(record["text"]): text)
+            else:
+                yield source, _read_text(Path(record["path"]))
+
+
+async def classify_batch(
+    items: Iterable[tuple[str, Union[str, Callable[[], str]]]],
+    concurrency: int = 8,
+    rate_limit: Optional[float] = None,
+    use_cache: bool = True,
+) -> AsyncIterator[dict]:
+    """Classify (source, text) pairs concurrently, yielding result dicts as each completes.
+
+    text may be a callable returning it (see `iter_batch_inputs`), called
+    when the item is classified. Failed items, including unreadable ones,
+    yield {"source": ..., "error": ...} instead of raising. Raises
+    ValueError if rate_limit is not positive.
+    """
+    import asyncio
+
+    if rate_limit is not None and rate_limit <= 0:
+        raise ValueError(f"rate_limit must be positive, not {rate_limit}")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def classify_one(source: str, text: Union[str, Callable[[], str]]) -> dict:
+        async with semaphore:
+            try:
+                if callable(text):
+                    text = text()
+                result = await classify_text_async(text, use_cache=use_cache, rate_limit=rate_limit)
+            except (OSError, ValueError, RuntimeError) as e:
+                return {"source": source, "error": str(e)}
+        return {"source": source, **result.model_dump()}
+
+    tasks = [asyncio.ensure_future(classify_one(source, text)) for source, text in items]
+    for next_done in asyncio.as_completed(tasks):
+        yield await next_done
+
+
+def _run_batch(batch: str, output: Optional[str], concurrency: int, rate_limit: Optional[float], use_cache: bool) -> None:
+    """Stream batch classifications as JSON lines, then print a summary line."""
+    from .agents import run_coroutine
+
+    items = list(iter_batch_inputs(batch))
+    sink = Path(output).open("w", encoding="utf-8") if output else sys.stdout
+    counts = {"succeeded": 0, "failed": 0}
+    started = time.perf_counter()
+
+    async def stream():
+        async for record in classify_batch(items, concurrency, rate_limit, use_cache):
+            counts["failed" if "error" in record else "succeeded"] += 1
+            sink.write(json.dumps(record) + "\n")
+            sink.flush()
+
+    try:
+        run_coroutine(stream())
+    finally:
+        if output:
+            sink.close()
+
+    summary = {
+        "status": "complete",
+        "total": len(items),
+        **counts,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+    if output:
+        summary["output"] = output
+    print(json.dumps(summary))
+
+
+@app.command()
+def classify(
+    input_path: Optional[str] = typer.Argument(None, help="Path to email or text file to classify"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output JSON file (JSONL in batch mode)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the LLM response cache"),
+    batch: Optional[str] = typer.Option(
+        None, "--batch", "-b", help="Directory of emails or JSONL file ({\"id\", \"text\"|\"path\"} per line)"
+    ),
+    concurrency: int = typer.Option(8, "--concurrency", help="Max concurrent LLM requests in batch mode"),
+    rate_limit: Optional[float] = typer.Option(
+        None, "--rate-limit", min=1, help="Max LLM requests per minute to the provider in batch mode"
+    ),
+):
+    """Classify email/text content using LLM.
+
+    Input: Text file (email content, message, etc.), or --batch directory/JSONL.
+    Output: JSON with classification, confidence, topic, and suggested action;
+    in batch mode one JSON line per email as each completes, then a summary line.
+    Use when triaging incoming communications to determine appropriate handling.
+
+    Classifications:
+    - edit_request: Contains document change requests
+    - research_question: Asks for legal research or analysis
+    - approval_request: Needs sign-off or decision
+    - informational: FYI only, no action needed
+    - urgent_action: Requires immediate attention
+    """
+    if (input_path is None) == (batch is None):
+        print(json.dumps({"error": "Provide either INPUT_PATH or --batch"}))
+        raise typer.Exit(code=1)
+
+    if batch is not None:
+        try:
+            _run_batch(batch, output, max(1, concurrency), rate_limit, use_cache=not no_cache)
+        except (FileNotFoundError, ValueError) as e:
+            print(json.dumps({"error": str(e)}))
+            raise typer.Exit(code=1)
+        return
+
+    try:
+        classification = classify_file(input_path, use_cache=not no_cache).model_dump()
+    except (FileNotFoundError, RuntimeError) as e:
+        print(json.dumps({"error": str(e)}))
         raise typer.Exit(code=1)
+    classification["source"] = str(Path(input_path))
 
     output_json = json.dumps(classification, indent=2)
     if output:
@@ -107,6 +306,31 @@ Email/Message:
         print(output_json)
 
 
+@app.command()
+def serve(
+    socket: Optional[str] = typer.Option(
+        None, "--socket", help="Unix socket path (default: $AECH_LEGAL_SOCKET or ~/.aech/aech-cli-legal.sock)"
+    ),
+    preload: bool = typer.Option(
+        True, "--preload/--no-preload", help="Import all command groups before accepting requests"
+    ),
+):
+    """Run a warm daemon that answers CLI commands over a local Unix socket.
+
+    Input: optional socket path.
+    Output: JSON status line, then serves JSON-lines requests until stopped.
+    Use to avoid per-call startup cost when scripts invoke the CLI repeatedly;
+    bundled skill scripts use the daemon automatically when it is running.
+    """
+    from .server import serve as serve_forever
+
+    try:
+        serve_forever(Path(socket) if socket else None, preload=preload)
+    except RuntimeError as e:
+        print(json.dumps({"error": str(e)}))
+        raise typer.Exit(code=1)
+
+
 @lru_cache(maxsize=1)
 def _load_manifest() -> dict:
     """Load the JSON manifest from disk, favoring the packaged copy."""
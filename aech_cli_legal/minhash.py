@@ -0,0 +1,104 @@
+"""MinHash signatures and LSH banding for near-duplicate clause detection.
+
+A clause's shingles are its runs of SHINGLE consecutive words (as produced
+by embeddings.tokenize). Its MinHash signature holds, for each of NUM_PERM
+random hash functions, the minimum hash over its shingles; the fraction of
+positions where two signatures agree estimates the Jaccard similarity of
+the two shingle sets.
+
+LSH splits a signature into BANDS bands of BAND_ROWS values and hashes each
+band to a bucket key. Clauses sharing any bucket are candidate near-
+duplicates: with 16 bands of 4, a pair at Jaccard 0.7 shares a bucket with
+probability ~0.99, a pair at 0.3 with ~0.12. Candidates are confirmed by
+comparing signatures against THRESHOLD, so finding a clause's near-
+duplicates costs BANDS bucket lookups however large the library is.
+
+The NUM_PERM hash functions are multiply-shift hashes of a 64-bit
+shingle hash (the top 32 bits of a * x mod 2**64 for fixed random odd a),
+so signatures computed by different processes and releases are
+comparable.
+"""
+
+import zlib
+from typing import Iterable
+
+import numpy as np
+
+from .embeddings import tokenize
+
+NUM_PERM = 64
+BANDS = 16
+BAND_ROWS = NUM_PERM // BANDS
+SHINGLE = 3
+# Estimated Jaccard similarity at which two clauses count as variants of one another.
+THRESHOLD = 0.7
+DTYPE = np.uint32
+
+# Signature of a clause with no words; never bucketed, never similar to anything.
+EMPTY = np.iinfo(DTYPE).max
+# Texts hashed per chunk; bounds the (shingles, NUM_PERM) intermediate to a few MB.
+_CHUNK = 256
+_A = np.random.default_rng(0x6C6567616C).integers(1, 1 << 63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_SHIFT = np.uint64(32)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+
+def _shingle_hashes(texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """64-bit hashes of every shingle of texts, and the index of the text each belongs to."""
+    tokens = []
+    for text in texts:
+        words = tokenize(text)
+        if 0 < len(words) < SHINGLE:  # Short clauses are one padded shingle
+            words += [""] * (SHINGLE - len(words))
+        tokens.append(words)
+    words = [word for text in tokens for word in text]
+    if not words:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+    vocabulary = {word: zlib.crc32(word.encode("utf-8")) for word in dict.fromkeys(words)}
+    hashes = np.fromiter(map(vocabulary.__getitem__, words), dtype=np.uint64, count=len(words))
+    owner = np.repeat(np.arange(len(texts)), [len(text) for text in tokens])
+
+    # A shingle starts at every word followed by SHINGLE - 1 words of the same text.
+    starts = np.arange(len(words) - SHINGLE + 1)
+    starts = starts[owner[starts] == owner[starts + SHINGLE - 1]]
+    shingles = np.zeros(len(starts), dtype=np.uint64)
+    for offset in range(SHINGLE):
+        shingles = shingles * _MIX + hashes[starts + offset]
+    return shingles, owner[starts]
+
+
+def signatures(texts: Iterable[str]) -> np.ndarray:
+    """(n, NUM_PERM) MinHash signatures of texts; rows of EMPTY for texts without words."""
+    texts = list(texts)
+    result = np.full((len(texts), NUM_PERM), EMPTY, dtype=DTYPE)
+    for first in range(0, len(texts), _CHUNK):
+        shingles, owner = _shingle_hashes(texts[first:first + _CHUNK])
+        if not len(shingles):
+            continue
+        # uint64 products wrap, i.e. are taken mod 2**64. Taking the top bits
+        # is monotonic, so it can follow the minimum.
+        values = shingles[:, None] * _A
+        owners, starts = np.unique(owner, return_index=True)
+        minima = np.minimum.reduceat(values, starts, axis=0) >> _SHIFT
+        result[first + owners] = np.minimum(minima, EMPTY - 1)  # Keep EMPTY for texts without words
+    return result
+
+
+def band_keys(signatures: np.ndarray) -> np.ndarray:
+    """(n, BANDS) int64 bucket keys; the band number is mixed in, so equal values in different bands differ."""
+    bands = signatures.astype(np.uint64).reshape(len(signatures), BANDS, BAND_ROWS)
+    keys = np.broadcast_to(np.arange(1, BANDS + 1, dtype=np.uint64), bands.shape[:2]).copy()
+    for column in range(BAND_ROWS):
+        keys = (keys * _FNV_PRIME) ^ bands[:, :, column]
+    return keys.view(np.int64)
+
+
+def is_empty(signatures: np.ndarray) -> np.ndarray:
+    """Rows that are the signature of a text without words."""
+    return signatures[:, 0] == EMPTY
+
+
+def similarity(signatures: np.ndarray, signature: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity of each row of signatures to signature."""
+    return (signatures == signature).mean(axis=-1)
@@ -0,0 +1,482 @@
+"""Streaming DOCX reader built on lxml iterparse.
+
+`word/document.xml` is streamed straight out of the zip with
+`lxml.etree.iterparse`; each top-level paragraph or table is turned into a
+`Block` and then cleared from the tree, so memory stays flat no matter how
+long the agreement is. Styles and numbering definitions (small parts) are
+parsed up front so heading levels and list/section numbers ("3.2", "(a)",
+"Article IV") can be resolved as the body streams past.
+"""
+
+import copy
+import os
+import struct
+import tempfile
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+from lxml import etree
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W = f"{{{W_NS}}}"
+
+DOCUMENT_PART = "word/document.xml"
+STYLES_PART = "word/styles.xml"
+NUMBERING_PART = "word/numbering.xml"
+
+MAX_HEADING_LEVEL = 9
+
+# General-purpose flag bit 3: CRC and sizes follow the member data.
+_DATA_DESCRIPTOR_FLAG = 0x08
+_COPY_CHUNK = 1024 * 1024
+
+
+@dataclass
+class Block:
+    """One top-level body element: a paragraph or a table."""
+    kind: str  # "paragraph" or "table"
+    index: int  # Position among top-level body elements
+    text: str = ""
+    style: str = ""
+    level: int = 0  # Heading level (1-9), 0 for body text
+    number: str = ""  # Resolved numbering label, e.g. "3.2" or "(a)"
+    bullet: bool = False
+    depth: int = 0  # List level (ilvl + 1) of numbered/bulleted paragraphs, 0 otherwise
+    rows: list[list[str]] = field(default_factory=list)
+
+    @property
+    def is_heading(self) -> bool:
+        return self.level > 0
+
+
+@dataclass
+class _Style:
+    name: str = ""
+    based_on: Optional[str] = None
+    outline_level: Optional[int] = None
+    num_id: Optional[str] = None
+    ilvl: Optional[int] = None
+
+
+@dataclass
+class _Level:
+    start: int = 1
+    fmt: str = "decimal"
+    text: str = "%1."
+    legal: bool = False  # w:isLgl: render every referenced level as decimal
+
+
+def _val(elem: Optional[etree._Element], attr: str = "val") -> Optional[str]:
+    return None if elem is None else elem.get(f"{W}{attr}")
+
+
+def _int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _read_part(package: zipfile.ZipFile, name: str) -> Optional[etree._Element]:
+    try:
+        with package.open(name) as handle:
+            return etree.parse(handle).getroot()
+    except KeyError:
+        return None
+
+
+def _roman(n: int) -> str:
+    numerals = [(1000, "m"), (900, "cm"), (500, "d"), (400, "cd"), (100, "c"), (90, "xc"),
+                (50, "l"), (40, "xl"), (10, "x"), (9, "ix"), (5, "v"), (4, "iv"), (1, "i")]
+    out = ""
+    for value, numeral in numerals:
+        while n >= value:
+            out += numeral
+            n -= value
+    return out
+
+
+def _letters(n: int) -> str:
+    # Word repeats the letter past z: a..z, aa..zz, aaa..
+    return chr(ord("a") + (n - 1) % 26) * ((n - 1) // 26 + 1)
+
+
+def format_number(n: int, fmt: str) -> str:
+    """Render a counter value in a w:numFmt style."""
+    if fmt == "lowerLetter":
+        return _letters(n)
+    if fmt == "upperLetter":
+        return _letters(n).upper()
+    if fmt == "lowerRoman":
+        return _roman(n)
+    if fmt == "upperRoman":
+        return _roman(n).upper()
+    if fmt in ("none", "bullet"):
+        return ""
+    return str(n)
+
+
+class Numbering:
+    """Numbering definitions plus the running counters needed to label paragraphs."""
+
+    def __init__(self, root: Optional[etree._Element]):
+        self.abstract: dict[str, dict[int, _Level]] = {}
+        self.nums: dict[str, str] = {}
+        self.overrides: dict[str, dict[int, int]] = {}
+        self.counters: dict[str, list[int]] = {}
+
+        if root is None:
+            return
+        for abstract in root.iter(f"{W}abstractNum"):
+            levels = {}
+            for lvl in abstract.iter(f"{W}lvl"):
+                levels[_int(lvl.get(f"{W}ilvl")) or 0] = _Level(
+                    start=_int(_val(lvl.find(f"{W}start"))) or 1,
+                    fmt=_val(lvl.find(f"{W}numFmt")) or "decimal",
+                    text=_val(lvl.find(f"{W}lvlText")) or "",
+                    legal=lvl.find(f"{W}isLgl") is not None,
+                )
+            self.abstract[abstract.get(f"{W}abstractNumId")] = levels
+        for num in root.iter(f"{W}num"):
+            num_id = num.get(f"{W}numId")
+            self.nums[num_id] = _val(num.find(f"{W}abstractNumId"))
+            for override in num.iter(f"{W}lvlOverride"):
+                start = _int(_val(override.find(f"{W}startOverride")))
+                if start is not None:
+                    self.overrides.setdefault(num_id, {})[_int(override.get(f"{W}ilvl")) or 0] = start
+
+    def _levels(self, num_id: str) -> dict[int, _Level]:
+        return self.abstract.get(self.nums.get(num_id, ""), {})
+
+    def _start(self, num_id: str, ilvl: int) -> int:
+        override = self.overrides.get(num_id, {}).get(ilvl)
+        if override is not None:
+            return override
+        level = self._levels(num_id).get(ilvl)
+        return level.start if level else 1
+
+    def next_label(self, num_id: str, ilvl: int) -> tuple[str, bool]:
+        """Advance the counter for (num_id, ilvl) and return (label, is_bullet)."""
+        levels = self._levels(num_id)
+        level = levels.get(ilvl)
+        if level is None:
+            return "", False
+        if level.fmt == "bullet":
+            return "", True
+
+        counters = self.counters.setdefault(num_id, [])
+        while len(counters) <= ilvl:
+            counters.append(self._start(num_id, len(counters)) - 1)
+        counters[ilvl] += 1
+        # Deeper levels restart after a higher level advances.
+        for deeper in range(ilvl + 1, len(counters)):
+            counters[deeper] = self._start(num_id, deeper) - 1
+
+        label = level.text
+        for i in range(ilvl + 1):
+            lvl = levels.get(i, _Level())
+            value = counters[i] if i < len(counters) else self._start(num_id, i)
+            fmt = "decimal" if level.legal else lvl.fmt
+            label = label.replace(f"%{i + 1}", format_number(max(value, 1), fmt))
+        return label.strip(), False
+
+
+class Styles:
+    """Paragraph style table with basedOn inheritance resolved."""
+
+    def __init__(self, root: Optional[etree._Element]):
+        self.styles: dict[str, _Style] = {}
+        if root is None:
+            return
+        for style in root.iter(f"{W}style"):
+            if style.get(f"{W}type") not in (None, "paragraph"):
+                continue
+            ppr = style.find(f"{W}pPr")
+            num_pr = ppr.find(f"{W}numPr") if ppr is not None else None
+            self.styles[style.get(f"{W}styleId")] = _Style(
+                name=(_val(style.find(f"{W}name")) or "").lower(),
+                based_on=_val(style.find(f"{W}basedOn")),
+                outline_level=_int(_val(ppr.find(f"{W}outlineLvl"))) if ppr is not None else None,
+                num_id=_val(num_pr.find(f"{W}numId")) if num_pr is not None else None,
+                ilvl=_int(_val(num_pr.find(f"{W}ilvl"))) if num_pr is not None else None,
+            )
+
+    def _chain(self, style_id: Optional[str]) -> Iterator[_Style]:
+        seen = set()
+        while style_id and style_id in self.styles and style_id not in seen:
+            seen.add(style_id)
+            style = self.styles[style_id]
+            yield style
+            style_id = style.based_on
+
+    def name(self, style_id: Optional[str]) -> str:
+        style = self.styles.get(style_id or "")
+        return style.name if style else (style_id or "")
+
+    def heading_level(self, style_id: Optional[str]) -> int:
+        for style in self._chain(style_id):
+            if style.name.startswith("heading "):
+                level = _int(style.name.split()[-1])
+                if level:
+                    return min(level, MAX_HEADING_LEVEL)
+            if style.name == "title":
+                return 1
+            if style.outline_level is not None and style.outline_level < MAX_HEADING_LEVEL:
+                return style.outline_level + 1
+        return 0
+
+    def numbering(self, style_id: Optional[str]) -> tuple[Optional[str], Optional[int]]:
+        num_id = ilvl = None
+        for style in self._chain(style_id):
+            num_id = num_id or style.num_id
+            ilvl = ilvl if ilvl is not None else style.ilvl
+        return num_id, ilvl
+
+
+def paragraph_text(p: etree._Element) -> str:
+    """Visible text of a paragraph: inserted text kept, deleted text and field codes dropped."""
+    parts = []
+    for node in p.iter(f"{W}t", f"{W}tab", f"{W}br", f"{W}cr", f"{W}noBreakHyphen"):
+        tag = node.tag
+        if tag == f"{W}t":
+            parts.append(node.text or "")
+        elif tag == f"{W}tab":
+            parts.append("\t")
+        elif tag == f"{W}noBreakHyphen":
+            parts.append("-")
+        else:
+            parts.append("\n")
+    return "".join(parts)
+
+
+class _BodyReader:
+    """Turns streamed body elements into Blocks."""
+
+    def __init__(self, styles: Styles, numbering: Numbering):
+        self.styles = styles
+        self.numbering = numbering
+        self.index = 0
+
+    def paragraph(self, p: etree._Element) -> Block:
+        ppr = p.find(f"{W}pPr")
+        style_id = _val(ppr.find(f"{W}pStyle")) if ppr is not None else None
+        level = self.styles.heading_level(style_id)
+        if ppr is not None:
+            outline = _int(_val(ppr.find(f"{W}outlineLvl")))
+            if outline is not None and outline < MAX_HEADING_LEVEL:
+                level = outline + 1
+
+        num_id, ilvl = self.styles.numbering(style_id)
+        num_pr = ppr.find(f"{W}numPr") if ppr is not None else None
+        if num_pr is not None:
+            num_id = _val(num_pr.find(f"{W}numId")) or num_id
+            ilvl = _int(_val(num_pr.find(f"{W}ilvl"))) if num_pr.find(f"{W}ilvl") is not None else ilvl
+
+        number, bullet, depth = "", False, 0
+        if num_id and num_id != "0":
+            number, bullet = self.numbering.next_label(num_id, ilvl or 0)
+            depth = (ilvl or 0) + 1 if number or bullet else 0
+
+        block = Block(
+            kind="paragraph",
+            index=self.index,
+            text=paragraph_text(p),
+            style=self.styles.name(style_id),
+            level=level,
+            number=number,
+            bullet=bullet,
+            depth=depth,
+        )
+        self.index += 1
+        return block
+
+    def table(self, tbl: etree._Element) -> Block:
+        rows = []
+        for tr in tbl.iter(f"{W}tr"):
+            cells = []
+            for tc in tr.iterchildren(f"{W}tc"):
+                cells.append("\n".join(paragraph_text(p) for p in tc.iter(f"{W}p")).strip())
+            rows.append(cells)
+        block = Block(kind="table", index=self.index, rows=rows)
+        self.index += 1
+        return block
+
+
+def _is_top_level(elem: etree._Element) -> bool:
+    """True for a child of w:body, directly or through block-level content controls (w:sdt/w:sdtContent)."""
+    parent = elem.getparent()
+    while parent is not None and parent.tag == f"{W}sdtContent":
+        sdt = parent.getparent()
+        if sdt is None or sdt.tag != f"{W}sdt":
+            return False
+        parent = sdt.getparent()
+    return parent is not None and parent.tag == f"{W}body"
+
+
+def body_elements(body: etree._Element) -> list[etree._Element]:
+    """The top-level paragraphs and tables of body in order, one per Block of iter_blocks."""
+    elements = []
+    for child in body:
+        if child.tag in (f"{W}p", f"{W}tbl"):
+            elements.append(child)
+        elif child.tag == f"{W}sdt":
+            content = child.find(f"{W}sdtContent")
+            if content is not None:
+                elements.extend(body_elements(content))
+    return elements
+
+
+def iter_blocks(path: str | Path) -> Iterator[Block]:
+    """Stream the top-level paragraphs and tables of a DOCX as Blocks.
+
+    Paragraphs and tables wrapped in block-level content controls count as
+    top-level.
+    """
+    with zipfile.ZipFile(path) as package:
+        reader = _BodyReader(Styles(_read_part(package, STYLES_PART)), Numbering(_read_part(package, NUMBERING_PART)))
+
+        with package.open(DOCUMENT_PART) as handle:
+            for _, elem in etree.iterparse(handle, events=("end",), tag=(f"{W}p", f"{W}tbl", f"{W}sectPr")):
+                if not _is_top_level(elem):
+                    continue  # nested in a table or text box; handled with its container
+                parent = elem.getparent()
+                if elem.tag == f"{W}p":
+                    yield reader.paragraph(elem)
+                elif elem.tag == f"{W}tbl":
+                    yield reader.table(elem)
+                # Free everything parsed so far.
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+
+def read_blocks(path: str | Path) -> list[Block]:
+    """Parse a DOCX into its list of Blocks."""
+    return list(iter_blocks(path))
+
+
+def read_document(path: str | Path, part: str = DOCUMENT_PART) -> etree._ElementTree:
+    """Parse one part (default word/document.xml) of a DOCX into a full tree (for rewriting, not reading)."""
+    with zipfile.ZipFile(path) as package, package.open(part) as handle:
+        return etree.parse(handle)
+
+
+def read_styles(path: str | Path) -> Styles:
+    """Load the paragraph style table of a DOCX."""
+    with zipfile.ZipFile(path) as package:
+        return Styles(_read_part(package, STYLES_PART))
+
+
+def serialize(tree: etree._ElementTree) -> bytes:
+    """Serialize a part the way Word writes it."""
+    return etree.tostring(tree, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def _copy_member_raw(src: zipfile.ZipFile, dst: zipfile.ZipFile, info: zipfile.ZipInfo) -> None:
+    """Append a member of src to dst as its stored compressed bytes, without inflating it."""
+    src.fp.seek(info.header_offset)
+    header = struct.unpack(zipfile.structFileHeader, src.fp.read(zipfile.sizeFileHeader))
+    if header[0] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+    # Skip the local name and extra field; the central directory entry is authoritative.
+    src.fp.seek(header[10] + header[11], os.SEEK_CUR)
+
+    member = copy.copy(info)
+    # CRC and sizes are known up front, so no trailing data descriptor is written.
+    member.flag_bits &= ~_DATA_DESCRIPTOR_FLAG
+    member.header_offset = dst.fp.tell()
+    zip64 = member.file_size > zipfile.ZIP64_LIMIT or member.compress_size > zipfile.ZIP64_LIMIT
+    dst.fp.write(member.FileHeader(zip64))
+    remaining = info.compress_size
+    while remaining:
+        chunk = src.fp.read(min(remaining, _COPY_CHUNK))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member {info.filename}")
+        dst.fp.write(chunk)
+        remaining -= len(chunk)
+    dst.filelist.append(member)
+    dst.NameToInfo[member.filename] = member
+    dst.start_dir = dst.fp.tell()
+
+
+def write_package(source: str | Path, destination: str | Path, parts: dict[str, bytes]) -> None:
+    """Copy the DOCX package at source to destination, replacing the given parts.
+
+    Only the replaced parts are compressed; every other member (media,
+    untouched XML) is copied as raw compressed bytes. The copy is written
+    next to destination and moved into place, so destination may be the
+    source itself.
+    """
+    destination = Path(destination)
+    fd, tmp = tempfile.mkstemp(dir=destination.parent, suffix=".docx.tmp")
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(source) as src, zipfile.ZipFile(tmp, "w") as dst:
+            for info in src.infolist():
+                if info.filename in parts:
+                    dst.writestr(info, parts[info.filename], compress_type=info.compress_type)
+                else:
+                    _copy_member_raw(src, dst, info)
+        os.replace(tmp, destination)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _escape_cell(text: str) -> str:
+    return text.replace("|", "\\|").replace("\n", "<br>")
+
+
+def block_to_markdown(block: Block, preserve_structure: bool = True) -> str:
+    """Render one block as Markdown (empty string for blank paragraphs)."""
+    if block.kind == "table":
+        if not block.rows:
+            return ""
+        width = max(len(row) for row in block.rows)
+        rows = [[_escape_cell(c) for c in row] + [""] * (width - len(row)) for row in block.rows]
+        lines = ["| " + " | ".join(rows[0]) + " |", "|" + " --- |" * width]
+        lines += ["| " + " | ".join(row) + " |" for row in rows[1:]]
+        return "\n".join(lines)
+
+    text = block.text.strip()
+    if not text:
+        return ""
+    label = f"{block.number} " if block.number else ""
+    if block.is_heading and preserve_structure:
+        return f"{'#' * block.level} {label}{text}"
+    if block.bullet:
+        return f"- {text}"
+    return f"{label}{text}"
+
+
+def to_markdown(blocks: list[Block], preserve_structure: bool = True) -> str:
+    """Render blocks as a Markdown document."""
+    rendered = (block_to_markdown(block, preserve_structure) for block in blocks)
+    return "\n\n".join(md for md in rendered if md) + "\n"
+
+
+def section_title(block: Block) -> str:
+    """Short title for a section: the heading text, or the lead-in of a numbered paragraph."""
+    text = " ".join(block.text.split())
+    if block.is_heading:
+        return text
+    lead, sep, _ = text.partition(". ")
+    return lead if sep and len(lead) <= 80 else text[:80]
+
+
+def section_map(blocks: list[Block]) -> list[dict]:
+    """List headings and numbered paragraphs with their position, for navigating the document."""
+    sections = []
+    for block in blocks:
+        if block.kind != "paragraph" or not block.text.strip():
+            continue
+        if block.is_heading or (block.number and not block.bullet):
+            sections.append({
+                "number": block.number or None,
+                "title": section_title(block),
+                "level": block.level,
+                "block_index": block.index,
+            })
+    return sections
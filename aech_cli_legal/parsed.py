@@ -0,0 +1,132 @@
+"""Parsed-document cache shared by every command that reads a DOCX.
+
+Parsing a long agreement is the slowest local step of convert, edit,
+analyze and clause indexing, and skill pipelines run several of those on
+the same file. The parsed Block list is stored once in the "parsed"
+DiskCache namespace and reloaded in milliseconds afterwards.
+
+Lookups go through two keys:
+
+- a stat key (resolved path, size, mtime) that maps to the file's sha256,
+  so an unchanged file is never re-read just to hash it;
+- a content key (sha256, format version) that holds the blocks, so a copy
+  or a touched-but-identical file still hits.
+
+Blocks are serialized as compact positional lists rather than dicts.
+Data derived from the blocks, such as the section index, is cached under
+the same content hash (see `derived`).
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from .cache import DiskCache, cache_key, shared_cache
+
+if TYPE_CHECKING:
+    from .ooxml import Block
+
+# Bump when Block, its serialization or the blocks the parser yields change so stale entries are ignored.
+PARSED_FORMAT_VERSION = "3"
+
+# Overridable via AECH_LEGAL_PARSED_CACHE_MAX_MB.
+PARSED_CACHE_MAX_MB = 512
+
+_KINDS = {"paragraph": "p", "table": "t"}
+_KIND_NAMES = {code: kind for kind, code in _KINDS.items()}
+
+
+def parsed_cache() -> DiskCache:
+    """Return the on-disk cache of parsed documents."""
+    max_mb = float(os.environ.get("AECH_LEGAL_PARSED_CACHE_MAX_MB", PARSED_CACHE_MAX_MB))
+    return shared_cache("parsed", max_bytes=int(max_mb * 1024 * 1024))
+
+
+def file_digest(path: Path) -> str:
+    """sha256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _stat_key(path: Path) -> str:
+    st = path.stat()
+    return cache_key("stat", str(path.resolve()), st.st_size, st.st_mtime_ns)
+
+
+def content_digest(path: Path, use_cache: bool = True) -> str:
+    """Return the file's sha256, reusing the cached value while path, size and mtime are unchanged."""
+    if not use_cache:
+        return file_digest(path)
+    key = _stat_key(path)
+    digest = parsed_cache().get(key)
+    if digest is None:
+        digest = file_digest(path)
+        _put(key, digest)
+    return digest
+
+
+def _put(key: str, value) -> None:
+    # The cache is an optimization; an unwritable cache dir must not fail the command.
+    try:
+        parsed_cache().put(key, value)
+    except OSError:
+        pass
+
+
+def dump_blocks(blocks: list["Block"]) -> list[list]:
+    """Serialize blocks as [kind, text, style, level, number, bullet, depth, rows] lists."""
+    return [
+        [_KINDS[b.kind], b.text, b.style, b.level, b.number, int(b.bullet), b.depth, b.rows]
+        for b in blocks
+    ]
+
+
+def load_blocks(rows: list[list]) -> list["Block"]:
+    """Inverse of `dump_blocks`; block indexes are positional."""
+    from .ooxml import Block
+
+    return [
+        Block(kind=_KIND_NAMES[kind], index=i, text=text, style=style, level=level,
+              number=number, bullet=bool(bullet), depth=depth, rows=cells)
+        for i, (kind, text, style, level, number, bullet, depth, cells) in enumerate(rows)
+    ]
+
+
+def read_docx_cached(path: Path, use_cache: bool = True) -> list["Block"]:
+    """Parse a DOCX into Blocks, going through the parsed-document cache.
+
+    Parse errors propagate from `ooxml.read_blocks` unchanged.
+    """
+    from .ooxml import read_blocks
+
+    if not use_cache:
+        return read_blocks(path)
+
+    key = cache_key("blocks", PARSED_FORMAT_VERSION, content_digest(path))
+    cached = parsed_cache().get(key)
+    if cached is not None:
+        return load_blocks(cached)
+
+    blocks = read_blocks(path)
+    _put(key, dump_blocks(blocks))
+    return blocks
+
+
+def derived(path: Path, name: str, version: str, build: Callable[[], Any], use_cache: bool = True) -> Any:
+    """Return JSON-serializable data derived from a document (e.g. its section index).
+
+    Stored next to the parsed blocks under the same content hash, so it is
+    rebuilt only when the file's content (or version) changes.
+    """
+    if not use_cache:
+        return build()
+    key = cache_key(name, version, PARSED_FORMAT_VERSION, content_digest(path))
+    value = parsed_cache().get(key)
+    if value is None:
+        value = build()
+        _put(key, value)
+    return value
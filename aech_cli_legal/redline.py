@@ -0,0 +1,674 @@
+"""Track Changes comparison of two DOCX documents.
+
+The comparison runs in two passes so cost stays near-linear in document
+length:
+
+1. Body paragraphs and tables are keyed by their text and aligned
+   patience-diff style: paragraphs that occur exactly once in both
+   versions anchor the alignment (longest increasing run of anchors), and
+   the gaps between anchors are aligned recursively, falling back to
+   difflib only for gaps small enough that its quadratic worst case does
+   not matter.
+2. Only paragraphs that changed are diffed word by word, and the result
+   is written as real `w:ins`/`w:del` revisions into a copy of the
+   modified document, keeping each run's formatting.
+
+Large documents are split into independent units (top-level sections and
+schedules of the body, each header/footer part, the footnotes and
+endnotes) that are diffed in a process pool and stitched back together;
+revision ids are assigned once at the end so they are unique and ordered
+across the package.
+"""
+
+import difflib
+import os
+import re
+import time
+import zipfile
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+from lxml import etree
+
+from .ooxml import DOCUMENT_PART, Styles, W, paragraph_text, read_document, read_styles, serialize, write_package
+
+DEFAULT_AUTHOR = "aech-cli-legal"
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+# Below this many body blocks (both versions together) process start-up
+# costs more than it saves, so the comparison runs in-process.
+PARALLEL_MIN_BLOCKS = 2000
+
+# Gaps with no unique anchors are handed to difflib while len(a) * len(b)
+# stays under this; larger ones are treated as wholesale replacements.
+DIFFLIB_LIMIT = 250_000
+
+# Changed paragraphs at least this similar (word-level ratio) are shown as
+# an in-place edit; less similar ones as a deleted plus an inserted paragraph.
+PAIR_SIMILARITY = 0.5
+
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+REVISION_TAGS = {f"{W}{tag}" for tag in ("ins", "del", "moveFrom", "moveTo", "rPrChange", "pPrChange")}
+
+# Paragraph children and run children a word-level rewrite can reproduce;
+# anything else (fields, drawings, content controls) is redlined whole.
+_SIMPLE_PARAGRAPH = {f"{W}{tag}" for tag in ("pPr", "r", "proofErr", "bookmarkStart", "bookmarkEnd")}
+_SIMPLE_RUN = {f"{W}{tag}" for tag in ("rPr", "t", "tab", "br", "cr", "noBreakHyphen", "lastRenderedPageBreak")}
+
+TOKEN_RE = re.compile(r"\w+|[^\w\s]|\s+")
+
+# Parts redlined besides the body, one unit each.
+NOTE_PART_RE = re.compile(r"^word/(?:header\d*|footer\d*|footnotes|endnotes)\.xml$")
+NOTE_CONTAINERS = {f"{W}footnotes", f"{W}endnotes"}
+SEPARATOR_NOTES = {"separator", "continuationSeparator", "continuationNotice"}
+
+# Paragraphs opening a schedule-like unit even when not styled as a heading.
+SECTION_START_RE = re.compile(r"^\s*(?:SCHEDULE|Schedule|EXHIBIT|Exhibit|ANNEX|Annex|APPENDIX|Appendix)\b")
+FRONT_MATTER = "\x00front"
+
+# Revision ids are issued as placeholders while units are diffed
+# independently, then renumbered once across the whole package.
+PLACEHOLDER = "_"
+
+
+@dataclass
+class RedlineStats:
+    """Paragraph-level outcome of a comparison."""
+    unchanged: int = 0
+    inserted: int = 0
+    deleted: int = 0
+    modified: int = 0
+    revisions: int = 0  # w:ins/w:del elements written
+    workers: int = 1
+    units: list[dict] = field(default_factory=list)  # Per-unit timing, in document order
+
+    def add(self, other: "RedlineStats") -> None:
+        self.unchanged += other.unchanged
+        self.inserted += other.inserted
+        self.deleted += other.deleted
+        self.modified += other.modified
+        self.revisions += other.revisions
+
+
+@dataclass
+class Revisions:
+    """Issues w:ins/w:del marks with placeholder ids (see `renumber`) and shared author/date."""
+    author: str
+    date: str
+    next_id: int = 1
+    stats: RedlineStats = field(default_factory=RedlineStats)
+
+    def mark(self, kind: str) -> etree._Element:
+        elem = etree.Element(f"{W}{kind}")
+        elem.set(f"{W}id", f"{PLACEHOLDER}{self.next_id}")
+        elem.set(f"{W}author", self.author)
+        elem.set(f"{W}date", self.date)
+        self.next_id += 1
+        self.stats.revisions += 1
+        return elem
+
+
+# --- Alignment ---
+
+def element_key(elem: etree._Element) -> str:
+    """Comparison key for a body element: its visible text, tagged by kind."""
+    if elem.tag == f"{W}p":
+        return "p\x00" + paragraph_text(elem)
+    if elem.tag == f"{W}tbl":
+        return "t\x00" + "\x1e".join(
+            "\x1f".join(paragraph_text(p) for p in tc.iter(f"{W}p"))
+            for tc in elem.iter(f"{W}tc")
+        )
+    return "x\x00" + etree.tostring(elem, encoding="unicode")
+
+
+def _unique_anchors(a: list[str], b: list[str], alo: int, ahi: int, blo: int, bhi: int) -> list[tuple[int, int]]:
+    """Longest increasing run of (i, j) pairs whose key occurs once in each range."""
+    counts_a = Counter(a[alo:ahi])
+    counts_b = Counter(b[blo:bhi])
+    position_b = {b[j]: j for j in range(blo, bhi) if counts_b[b[j]] == 1}
+    candidates = [(i, position_b[a[i]]) for i in range(alo, ahi) if counts_a[a[i]] == 1 and a[i] in position_b]
+
+    # Patience sorting: longest increasing subsequence on j, O(n log n).
+    tails: list[int] = []  # smallest j ending an increasing run of each length
+    tail_index: list[int] = []
+    previous: list[int] = [-1] * len(candidates)
+    for n, (_, j) in enumerate(candidates):
+        k = bisect_left(tails, j)
+        if k == len(tails):
+            tails.append(j)
+            tail_index.append(n)
+        else:
+            tails[k] = j
+            tail_index[k] = n
+        previous[n] = tail_index[k - 1] if k else -1
+
+    anchors = []
+    n = tail_index[-1] if tail_index else -1
+    while n >= 0:
+        anchors.append(candidates[n])
+        n = previous[n]
+    return anchors[::-1]
+
+
+def align(a: list[str], b: list[str]) -> list[tuple[int, int]]:
+    """Return the (i, j) index pairs of a and b that are aligned as unchanged."""
+    matches: list[tuple[int, int]] = []
+    regions = [(0, len(a), 0, len(b))]
+
+    while regions:
+        alo, ahi, blo, bhi = regions.pop()
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            matches.append((alo, blo))
+            alo, blo = alo + 1, blo + 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi, bhi = ahi - 1, bhi - 1
+            matches.append((ahi, bhi))
+        if alo >= ahi or blo >= bhi:
+            continue
+
+        anchors = _unique_anchors(a, b, alo, ahi, blo, bhi)
+        if anchors:
+            prev_i, prev_j = alo, blo
+            for i, j in anchors:
+                matches.append((i, j))
+                regions.append((prev_i, i, prev_j, j))
+                prev_i, prev_j = i + 1, j + 1
+            regions.append((prev_i, ahi, prev_j, bhi))
+        elif (ahi - alo) * (bhi - blo) <= DIFFLIB_LIMIT:
+            matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+            for i, j, size in matcher.get_matching_blocks():
+                matches.extend((alo + i + k, blo + j + k) for k in range(size))
+
+    return sorted(matches)
+
+
+def opcodes(a: list[str], b: list[str]) -> Iterator[tuple[str, int, int, int, int]]:
+    """difflib-style (tag, i1, i2, j1, j2) opcodes from `align`."""
+    i = j = 0
+    for mi, mj in align(a, b) + [(len(a), len(b))]:
+        if i < mi and j < mj:
+            yield "replace", i, mi, j, mj
+        elif i < mi:
+            yield "delete", i, mi, j, j
+        elif j < mj:
+            yield "insert", i, i, j, mj
+        if mi < len(a):
+            yield "equal", mi, mi + 1, mj, mj + 1
+        i, j = mi + 1, mj + 1
+
+
+# --- Revision markup ---
+
+def _set_paragraph_mark(p: etree._Element, mark: etree._Element) -> None:
+    """Record an inserted/deleted paragraph mark in w:pPr/w:rPr."""
+    ppr = p.find(f"{W}pPr")
+    if ppr is None:
+        ppr = etree.Element(f"{W}pPr")
+        p.insert(0, ppr)
+    rpr = ppr.find(f"{W}rPr")
+    if rpr is None:
+        rpr = etree.Element(f"{W}rPr")
+        # rPr precedes sectPr and pPrChange in the pPr sequence.
+        tail = next((c for c in ppr if c.tag in (f"{W}sectPr", f"{W}pPrChange")), None)
+        if tail is None:
+            ppr.append(rpr)
+        else:
+            tail.addprevious(rpr)
+    rpr.insert(0, mark)  # revision marks lead the paragraph-mark rPr sequence
+
+
+def _wrap_runs(container: etree._Element, kind: str, revisions: Revisions) -> None:
+    """Wrap every run under container in a w:ins or w:del revision."""
+    for run in list(container.iter(f"{W}r")):
+        parent = run.getparent()
+        if parent.tag == f"{W}del" or (kind == "ins" and parent.tag == f"{W}ins"):
+            continue
+        if kind == "del":
+            for t in run.iter(f"{W}t", f"{W}instrText"):
+                t.tag = f"{W}delText" if t.tag == f"{W}t" else f"{W}delInstrText"
+        mark = revisions.mark(kind)
+        run.addprevious(mark)
+        mark.append(run)
+
+
+def mark_paragraph(p: etree._Element, kind: str, revisions: Revisions) -> etree._Element:
+    """Mark a whole paragraph (runs and paragraph mark) as inserted or deleted."""
+    _wrap_runs(p, kind, revisions)
+    _set_paragraph_mark(p, revisions.mark(kind))
+    return p
+
+
+def mark_table(tbl: etree._Element, kind: str, revisions: Revisions) -> etree._Element:
+    """Mark every row and paragraph of a table as inserted or deleted."""
+    for tr in tbl.iter(f"{W}tr"):
+        trpr = tr.find(f"{W}trPr")
+        if trpr is None:
+            trpr = etree.Element(f"{W}trPr")
+            prex = tr.find(f"{W}tblPrEx")
+            if prex is None:
+                tr.insert(0, trpr)
+            else:
+                prex.addnext(trpr)
+        trpr.append(revisions.mark(kind))
+    for p in tbl.iter(f"{W}p"):
+        mark_paragraph(p, kind, revisions)
+    return tbl
+
+
+def mark_element(elem: etree._Element, kind: str, revisions: Revisions) -> Optional[etree._Element]:
+    """Mark a body element inserted/deleted; returns None for elements that cannot carry revisions."""
+    if elem.tag == f"{W}p":
+        return mark_paragraph(elem, kind, revisions)
+    if elem.tag == f"{W}tbl":
+        return mark_table(elem, kind, revisions)
+    return elem if kind == "ins" else None
+
+
+# --- Word-level diff inside a changed paragraph ---
+
+def _is_simple(p: etree._Element) -> bool:
+    return all(
+        child.tag in _SIMPLE_PARAGRAPH
+        and (child.tag != f"{W}r" or all(c.tag in _SIMPLE_RUN for c in child))
+        for child in p
+    )
+
+
+def _tokens(p: etree._Element) -> list[tuple[str, Optional[etree._Element]]]:
+    """Split a simple paragraph into (token, run properties) pairs."""
+    tokens = []
+    for run in p.iterchildren(f"{W}r"):
+        rpr = run.find(f"{W}rPr")
+        for child in run:
+            if child.tag == f"{W}t":
+                tokens.extend((tok, rpr) for tok in TOKEN_RE.findall(child.text or ""))
+            elif child.tag == f"{W}tab":
+                tokens.append(("\t", rpr))
+            elif child.tag in (f"{W}br", f"{W}cr"):
+                tokens.append(("\n", rpr))
+            elif child.tag == f"{W}noBreakHyphen":
+                tokens.append(("-", rpr))
+    return tokens
+
+
+def _run(text: str, rpr: Optional[etree._Element], deleted: bool) -> etree._Element:
+    run = etree.Element(f"{W}r")
+    if rpr is not None:
+        run.append(deepcopy(rpr))
+    for piece in re.split(r"([\t\n])", text):
+        if piece == "\t":
+            etree.SubElement(run, f"{W}tab")
+        elif piece == "\n":
+            etree.SubElement(run, f"{W}br")
+        elif piece:
+            t = etree.SubElement(run, f"{W}delText" if deleted else f"{W}t")
+            t.text = piece
+            t.set(XML_SPACE, "preserve")
+    return run
+
+
+def _emit(target: etree._Element, tokens: list, kind: Optional[str], revisions: Revisions) -> None:
+    """Append tokens as runs (grouped by formatting), wrapped in one revision if kind is set."""
+    if not tokens:
+        return
+    parent = target
+    if kind:
+        parent = revisions.mark(kind)
+        target.append(parent)
+    text, rpr = "", None
+    for token, token_rpr in tokens:
+        if text and token_rpr is not rpr:
+            parent.append(_run(text, rpr, kind == "del"))
+            text = ""
+        if not text:
+            rpr = token_rpr
+        text += token
+    parent.append(_run(text, rpr, kind == "del"))
+
+
+def similarity(a: etree._Element, b: etree._Element) -> float:
+    """Word-level similarity of two paragraphs in [0, 1]."""
+    matcher = difflib.SequenceMatcher(
+        None, TOKEN_RE.findall(paragraph_text(a)), TOKEN_RE.findall(paragraph_text(b)), autojunk=False
+    )
+    if matcher.real_quick_ratio() < PAIR_SIMILARITY or matcher.quick_ratio() < PAIR_SIMILARITY:
+        return 0.0
+    return matcher.ratio()
+
+
+def redline_paragraph(old: etree._Element, new: etree._Element, revisions: Revisions) -> list[etree._Element]:
+    """Redline one changed paragraph pair.
+
+    Simple paragraphs are rebuilt as a single paragraph with word-level
+    w:del/w:ins runs; paragraphs with fields, drawings or other complex
+    content are shown as the old paragraph deleted and the new inserted.
+    """
+    if not (_is_simple(old) and _is_simple(new)):
+        return [mark_paragraph(old, "del", revisions), mark_paragraph(new, "ins", revisions)]
+
+    a, b = _tokens(old), _tokens(new)
+    p = etree.Element(f"{W}p", attrib=dict(new.attrib))
+    ppr = new.find(f"{W}pPr")
+    if ppr is not None:
+        p.append(ppr)
+    p.extend(list(new.iterchildren(f"{W}bookmarkStart")))
+
+    matcher = difflib.SequenceMatcher(None, [t for t, _ in a], [t for t, _ in b], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            _emit(p, b[j1:j2], None, revisions)
+        else:
+            _emit(p, a[i1:i2], "del", revisions)
+            _emit(p, b[j1:j2], "ins", revisions)
+
+    p.extend(list(new.iterchildren(f"{W}bookmarkEnd")))
+    return [p]
+
+
+def _same_shape(a: etree._Element, b: etree._Element) -> bool:
+    rows_a, rows_b = a.findall(f"{W}tr"), b.findall(f"{W}tr")
+    return len(rows_a) == len(rows_b) and all(
+        len(ra.findall(f"{W}tc")) == len(rb.findall(f"{W}tc")) for ra, rb in zip(rows_a, rows_b)
+    )
+
+
+def redline_table(old: etree._Element, new: etree._Element, revisions: Revisions) -> list[etree._Element]:
+    """Redline a changed table cell by cell when its shape is unchanged, else delete + insert."""
+    if not _same_shape(old, new):
+        return [mark_table(old, "del", revisions), mark_table(new, "ins", revisions)]
+    for old_row, new_row in zip(old.findall(f"{W}tr"), new.findall(f"{W}tr")):
+        for old_cell, new_cell in zip(old_row.findall(f"{W}tc"), new_row.findall(f"{W}tc")):
+            old_blocks = [c for c in old_cell if c.tag in (f"{W}p", f"{W}tbl")]
+            new_blocks = [c for c in new_cell if c.tag in (f"{W}p", f"{W}tbl")]
+            merged = redline_sequence(old_blocks, new_blocks, revisions, count=False)
+            for child in new_blocks:
+                new_cell.remove(child)
+            new_cell.extend(merged)
+    return [new]
+
+
+def _pair(old: etree._Element, new: etree._Element) -> bool:
+    if old.tag != new.tag:
+        return False
+    if old.tag == f"{W}tbl":
+        return True
+    return old.tag == f"{W}p" and similarity(old, new) >= PAIR_SIMILARITY
+
+
+def _redline_gap(old: list, new: list, revisions: Revisions, count: bool) -> list[etree._Element]:
+    """Redline a run of changed elements, pairing similar old/new elements in order."""
+    stats = revisions.stats
+    out: list[etree._Element] = []
+
+    def delete(elem):
+        marked = mark_element(elem, "del", revisions)
+        if marked is not None:
+            out.append(marked)
+        stats.deleted += count
+
+    def insert(elem):
+        out.append(mark_element(elem, "ins", revisions))
+        stats.inserted += count
+
+    i = j = 0
+    while i < len(old) and j < len(new):
+        if _pair(old[i], new[j]):
+            if old[i].tag == f"{W}tbl":
+                out.extend(redline_table(old[i], new[j], revisions))
+            else:
+                out.extend(redline_paragraph(old[i], new[j], revisions))
+            stats.modified += count
+            i, j = i + 1, j + 1
+        elif j + 1 < len(new) and _pair(old[i], new[j + 1]):
+            insert(new[j])
+            j += 1
+        elif i + 1 < len(old) and _pair(old[i + 1], new[j]):
+            delete(old[i])
+            i += 1
+        else:
+            delete(old[i])
+            insert(new[j])
+            i, j = i + 1, j + 1
+    for elem in old[i:]:
+        delete(elem)
+    for elem in new[j:]:
+        insert(elem)
+    return out
+
+
+def redline_sequence(old: list, new: list, revisions: Revisions, count: bool = True) -> list[etree._Element]:
+    """Redline two sequences of block elements (body or table-cell children).
+
+    Returns the merged element list; elements are moved out of their
+    source trees rather than copied. count=False keeps nested (table cell)
+    paragraphs out of the paragraph statistics.
+    """
+    stats = revisions.stats
+    out: list[etree._Element] = []
+    for tag, i1, i2, j1, j2 in opcodes([element_key(e) for e in old], [element_key(e) for e in new]):
+        if tag == "equal":
+            out.append(new[j1])
+            stats.unchanged += count
+        else:
+            out.extend(_redline_gap(old[i1:i2], new[j1:j2], revisions, count))
+    return out
+
+
+def _replace_children(container: etree._Element, children: list[etree._Element]) -> None:
+    for child in list(container):
+        container.remove(child)
+    container.extend(children)
+
+
+def redline_container(old: etree._Element, new: etree._Element, revisions: Revisions) -> None:
+    """Rewrite the new container (body section, header, footnotes...) in place against old.
+
+    Footnotes and endnotes are paired by id; a note only in the original is
+    carried over with its content deleted so its (deleted) reference still
+    resolves.
+    """
+    if new.tag not in NOTE_CONTAINERS:
+        _replace_children(new, redline_sequence(list(old), list(new), revisions))
+        return
+
+    old_notes = {note.get(f"{W}id"): note for note in old}
+    for note in new:
+        prior = old_notes.pop(note.get(f"{W}id"), None)
+        if note.get(f"{W}type") in SEPARATOR_NOTES:
+            continue
+        if prior is None:
+            for block in list(note):
+                mark_element(block, "ins", revisions)
+        else:
+            _replace_children(note, redline_sequence(list(prior), list(note), revisions))
+    for prior in old_notes.values():
+        if prior.get(f"{W}type") in SEPARATOR_NOTES:
+            continue
+        for block in list(prior):
+            if mark_element(block, "del", revisions) is None:
+                prior.remove(block)
+        new.append(prior)
+
+
+# --- Units and parallel execution ---
+
+@dataclass
+class Unit:
+    """A pair of containers that can be redlined independently of the rest of the package."""
+    name: str
+    part: str
+    old: etree._Element
+    new: etree._Element
+
+
+def _is_section_start(p: etree._Element, styles: Styles, levels: dict) -> bool:
+    """Top-level heading (Heading 1 / outline level 0) or a Schedule/Exhibit/Annex/Appendix title."""
+    ppr = p.find(f"{W}pPr")
+    if ppr is not None:
+        style = ppr.find(f"{W}pStyle")
+        style_id = style.get(f"{W}val") if style is not None else None
+        if style_id not in levels:
+            levels[style_id] = styles.heading_level(style_id)
+        if levels[style_id] == 1:
+            return True
+        outline = ppr.find(f"{W}outlineLvl")
+        if outline is not None and outline.get(f"{W}val") == "0":
+            return True
+    first = p.find(f".//{W}t")
+    return first is not None and bool(SECTION_START_RE.match(first.text or ""))
+
+
+def _sections(body: etree._Element, styles: Styles) -> tuple[list[str], list[list[etree._Element]]]:
+    """Split body blocks at top-level sections; returns (heading keys, block lists)."""
+    keys: list[str] = [FRONT_MATTER]
+    sections: list[list[etree._Element]] = [[]]
+    levels: dict = {}
+    for block in body:
+        if block.tag == f"{W}sectPr":
+            continue
+        if block.tag == f"{W}p" and _is_section_start(block, styles, levels):
+            keys.append(paragraph_text(block))
+            sections.append([])
+        sections[-1].append(block)
+    return keys, sections
+
+
+def _wrap(blocks: list[etree._Element], nsmap: dict) -> etree._Element:
+    wrapper = etree.Element(f"{W}body", nsmap=nsmap)
+    wrapper.extend(blocks)
+    return wrapper
+
+
+def body_units(
+    old_body: etree._Element, new_body: etree._Element, old_styles: Styles, new_styles: Styles
+) -> list[Unit]:
+    """Pair top-level sections of the two bodies into units.
+
+    Sections are aligned by heading text (the same patience alignment as
+    paragraphs). A run of added, removed or renamed sections is folded into
+    the preceding unit: when a heading is deleted its text now continues
+    the previous section, so the two must be diffed together. Blocks are
+    moved into per-unit wrapper elements.
+    """
+    old_keys, old_sections = _sections(old_body, old_styles)
+    new_keys, new_sections = _sections(new_body, new_styles)
+    units: list[Unit] = []
+    for tag, i1, i2, j1, j2 in opcodes(old_keys, new_keys):
+        old_blocks = [block for section in old_sections[i1:i2] for block in section]
+        new_blocks = [block for section in new_sections[j1:j2] for block in section]
+        if not old_blocks and not new_blocks:
+            continue
+        if tag != "equal" and units:
+            units[-1].old.extend(old_blocks)
+            units[-1].new.extend(new_blocks)
+            continue
+        key = new_keys[j1] if j2 > j1 else old_keys[i1]
+        name = "(front matter)" if key == FRONT_MATTER else " ".join(key.split())[:60]
+        units.append(Unit(name, DOCUMENT_PART, _wrap(old_blocks, old_body.nsmap), _wrap(new_blocks, new_body.nsmap)))
+    return units
+
+
+def _run_unit(old: etree._Element, new: etree._Element, author: str, date: str) -> tuple[etree._Element, RedlineStats, float]:
+    started = time.perf_counter()
+    revisions = Revisions(author, date)
+    redline_container(old, new, revisions)
+    return new, revisions.stats, time.perf_counter() - started
+
+
+def _run_unit_xml(task: tuple[bytes, bytes, str, str]) -> tuple[bytes, RedlineStats, float]:
+    """Process-pool entry point: `_run_unit` on serialized containers."""
+    old_xml, new_xml, author, date = task
+    new, stats, seconds = _run_unit(etree.fromstring(old_xml), etree.fromstring(new_xml), author, date)
+    return etree.tostring(new), stats, seconds
+
+
+def run_units(units: list[Unit], author: str, date: str, workers: int) -> list[tuple[etree._Element, RedlineStats, float]]:
+    """Redline every unit, in a process pool when workers > 1; results are in unit order."""
+    if workers <= 1 or len(units) < 2:
+        return [_run_unit(unit.old, unit.new, author, date) for unit in units]
+
+    tasks = [(etree.tostring(unit.old), etree.tostring(unit.new), author, date) for unit in units]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_run_unit_xml, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+        return [(etree.fromstring(xml), stats, seconds) for xml, stats, seconds in results]
+
+
+def renumber(trees: list[etree._ElementTree]) -> None:
+    """Replace placeholder revision ids with unique numeric ids, in document order.
+
+    Numbering continues after the largest id already present in any part,
+    so pre-existing revisions keep theirs.
+    """
+    marks = [e for tree in trees for e in tree.getroot().iter(*REVISION_TAGS)]
+    next_id = max((int(e.get(f"{W}id")) for e in marks if (e.get(f"{W}id") or "").isdigit()), default=0) + 1
+    for mark in marks:
+        if (mark.get(f"{W}id") or "").startswith(PLACEHOLDER):
+            mark.set(f"{W}id", str(next_id))
+            next_id += 1
+
+
+def redline_files(
+    original: str | Path,
+    modified: str | Path,
+    output: str | Path,
+    author: str = DEFAULT_AUTHOR,
+    workers: int = DEFAULT_WORKERS,
+) -> RedlineStats:
+    """Write output: the modified DOCX with Track Changes against the original DOCX.
+
+    The body is split into top-level sections and each header, footer and
+    footnote/endnote part is its own unit; units are diffed in parallel
+    (up to workers processes) and stitched back in order. Documents under
+    PARALLEL_MIN_BLOCKS body blocks are diffed in-process.
+    """
+    date = datetime.now(timezone.utc).replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%SZ")
+    old_doc, new_doc = read_document(original), read_document(modified)
+    old_body = old_doc.getroot().find(f"{W}body")
+    new_body = new_doc.getroot().find(f"{W}body")
+    sect_pr = new_body.find(f"{W}sectPr")
+    parallel = len(old_body) + len(new_body) >= PARALLEL_MIN_BLOCKS
+
+    units = body_units(old_body, new_body, read_styles(original), read_styles(modified))
+    with zipfile.ZipFile(original) as old_package, zipfile.ZipFile(modified) as new_package:
+        old_names = set(old_package.namelist())
+        shared = sorted(n for n in new_package.namelist() if NOTE_PART_RE.match(n) and n in old_names)
+    for name in shared:
+        units.append(Unit(name, name, read_document(original, name).getroot(), read_document(modified, name).getroot()))
+
+    # In-process diffs move deleted old elements into the new container, so count both sides first.
+    sizes = [(len(unit.old), len(unit.new)) for unit in units]
+    results = run_units(units, author, date, workers if parallel else 1)
+
+    stats = RedlineStats(workers=workers if parallel else 1)
+    trees = {DOCUMENT_PART: new_doc}
+    changed = {DOCUMENT_PART}
+    merged_body: list[etree._Element] = []
+    for unit, (old_blocks, new_blocks), (container, unit_stats, seconds) in zip(units, sizes, results):
+        stats.add(unit_stats)
+        stats.units.append({
+            "unit": unit.name,
+            "part": unit.part,
+            "old_blocks": old_blocks,
+            "new_blocks": new_blocks,
+            "revisions": unit_stats.revisions,
+            "seconds": round(seconds, 4),
+        })
+        if unit.part == DOCUMENT_PART:
+            merged_body.extend(container)
+        else:
+            trees[unit.part] = etree.ElementTree(container)
+            if unit_stats.revisions:
+                changed.add(unit.part)
+
+    _replace_children(new_body, merged_body + ([sect_pr] if sect_pr is not None else []))
+    renumber(list(trees.values()))
+    # Parts without revisions are copied from the modified package untouched.
+    write_package(modified, output, {name: serialize(trees[name]) for name in changed})
+    return stats
@@ -1,19 +1,212 @@
-"""Research subcommand group: cases, statutes."""
+"""Research subcommand group: cases, statutes, query.
 
+Searches go to the configured provider (see research_providers.py) on the
+shared event loop of agents.py, so HTTP connections stay pooled across
+calls in the serve daemon. `research query` runs the case and statute
+searches for a question concurrently: it costs one provider round trip
+of wall time, not two.
+
+Provider responses are cached on disk (namespace "research", 32 MB and 24
+hours by default, overridable via AECH_LEGAL_RESEARCH_CACHE_MAX_MB / _TTL
+in seconds), keyed by provider and its settings, search kind, query,
+jurisdiction and limit. Cached searches are answered before the event
+loop is involved.
+"""
+
+import asyncio
 import json
-from typing import Optional
+import os
+import time
+from typing import NoReturn, Optional
 
 import typer
+from pydantic import BaseModel
+
+from .cache import DiskCache, cache_key, shared_cache
+from .research_providers import DEFAULT_LIMIT, KINDS, ResearchProvider, create_provider
 
 app = typer.Typer()
 
+RESEARCH_CACHE_MAX_MB = 32
+RESEARCH_CACHE_TTL = 24 * 3600
+
+
+class ResearchResult(BaseModel):
+    """Result of a case law or statute search."""
+    status: str
+    action: str
+    query: str
+    jurisdiction: Optional[str]
+    results: list[dict]
+    provider: str = "stub"
+    cached: bool = False  # Answered from the research response cache
+
+
+class ResearchQueryResult(BaseModel):
+    """Result of a combined case law and statute search."""
+    status: str
+    action: str = "research query"
+    query: str
+    jurisdiction: Optional[str]
+    provider: str
+    cases: ResearchResult
+    statutes: ResearchResult
+    elapsed_ms: float = 0.0
+
+
+def _fail(message: str) -> NoReturn:
+    """Print a JSON error and exit with status 1."""
+    print(json.dumps({"error": message}))
+    raise typer.Exit(code=1)
+
+
+# --- In-process API ---
+
+def research_cache() -> DiskCache:
+    """Return the on-disk cache of research provider responses."""
+    max_mb = float(os.environ.get("AECH_LEGAL_RESEARCH_CACHE_MAX_MB", RESEARCH_CACHE_MAX_MB))
+    ttl = float(os.environ.get("AECH_LEGAL_RESEARCH_CACHE_TTL", RESEARCH_CACHE_TTL))
+    return shared_cache("research", max_bytes=int(max_mb * 1024 * 1024), ttl=ttl)
+
+
+def _search_many(
+    kinds: tuple[str, ...],
+    query: str,
+    jurisdiction: Optional[str],
+    limit: int,
+    provider: Optional[str],
+    use_cache: bool,
+) -> dict[str, ResearchResult]:
+    """Search each kind, answering from the cache where possible and fetching the rest concurrently.
+
+    Raises ValueError for an empty query or a bad provider setting, RuntimeError if the provider fails.
+    """
+    query = " ".join(query.split())
+    jurisdiction = jurisdiction.strip() if jurisdiction else None
+    if not query:
+        raise ValueError("Query is empty")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    backend = create_provider(provider)
+    status = "stub" if backend.name == "stub" else "complete"
+    use_cache = use_cache and backend.name != "stub"
+
+    def result(kind: str, results: list[dict], cached: bool) -> ResearchResult:
+        return ResearchResult(
+            status=status, action=f"research {kind}", query=query, jurisdiction=jurisdiction,
+            results=results, provider=backend.name, cached=cached,
+        )
+
+    found: dict[str, ResearchResult] = {}
+    keys = {}
+    for kind in kinds:
+        keys[kind] = cache_key("research", kind, backend.name, backend.config(), query, jurisdiction, limit)
+        cached = research_cache().get(keys[kind]) if use_cache else None
+        if cached is not None:
+            found[kind] = result(kind, cached, True)
+
+    missing = [kind for kind in kinds if kind not in found]
+    if missing:
+        from .agents import run_coroutine
+
+        fetched = run_coroutine(_fetch(backend, missing, query, jurisdiction, limit))
+        for kind, results in zip(missing, fetched):
+            if isinstance(results, BaseException):
+                raise results
+            found[kind] = result(kind, results, False)
+            if use_cache:
+                try:
+                    research_cache().put(keys[kind], results)
+                except OSError:
+                    pass  # An unwritable cache must not fail the search
+    return found
+
+
+async def _fetch(
+    backend: ResearchProvider, kinds: list[str], query: str, jurisdiction: Optional[str], limit: int
+) -> list:
+    """Run the searches for kinds at once; each item is a result list or the exception it raised."""
+    return await asyncio.gather(
+        *(backend.search(kind, query, jurisdiction, limit) for kind in kinds), return_exceptions=True
+    )
+
+
+def search_cases(
+    query: str,
+    jurisdiction: Optional[str] = None,
+    limit: int = DEFAULT_LIMIT,
+    provider: Optional[str] = None,
+    use_cache: bool = True,
+) -> ResearchResult:
+    """Search case law for query, optionally restricted to a jurisdiction.
+
+    provider defaults to $AECH_LEGAL_RESEARCH_PROVIDER or whichever provider
+    is configured (see research_providers.py). Cached responses younger than
+    the cache TTL are reused unless use_cache is False.
+    """
+    return _search_many(("cases",), query, jurisdiction, limit, provider, use_cache)["cases"]
+
+
+def search_statutes(
+    query: str,
+    jurisdiction: Optional[str] = None,
+    limit: int = DEFAULT_LIMIT,
+    provider: Optional[str] = None,
+    use_cache: bool = True,
+) -> ResearchResult:
+    """Search statutes and regulations for query, optionally restricted to a jurisdiction.
+
+    Same provider and cache handling as `search_cases`.
+    """
+    return _search_many(("statutes",), query, jurisdiction, limit, provider, use_cache)["statutes"]
+
+
+def research_query(
+    query: str,
+    jurisdiction: Optional[str] = None,
+    limit: int = DEFAULT_LIMIT,
+    provider: Optional[str] = None,
+    use_cache: bool = True,
+) -> ResearchQueryResult:
+    """Search case law and statutes for query concurrently.
+
+    Same provider and cache handling as `search_cases`; each search is
+    cached on its own, so this shares entries with `search_cases` and
+    `search_statutes`.
+    """
+    start = time.perf_counter()
+    found = _search_many(KINDS, query, jurisdiction, limit, provider, use_cache)
+    cases, statutes = found["cases"], found["statutes"]
+    return ResearchQueryResult(
+        status=cases.status,
+        query=cases.query,
+        jurisdiction=cases.jurisdiction,
+        provider=cases.provider,
+        cases=cases,
+        statutes=statutes,
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 2),
+    )
+
+
+# --- Typer commands ---
+
+_JURISDICTION = typer.Option(
+    None, "--jurisdiction", "-j", help="Jurisdiction filter (e.g., 'US-Federal', 'UK'); 'US' also matches 'US-CA'"
+)
+_LIMIT = typer.Option(DEFAULT_LIMIT, "--limit", "-n", min=1, help="Maximum results per search")
+_PROVIDER = typer.Option(
+    None, "--provider", "-p", help="http, local or stub (default: $AECH_LEGAL_RESEARCH_PROVIDER or as configured)"
+)
+_NO_CACHE = typer.Option(False, "--no-cache", help="Bypass the research response cache")
+
 
 @app.command()
 def cases(
     query: str = typer.Argument(..., help="Search query"),
-    jurisdiction: Optional[str] = typer.Option(
-        None, "--jurisdiction", "-j", help="Jurisdiction filter (e.g., 'US-Federal', 'UK')"
-    ),
+    jurisdiction: Optional[str] = _JURISDICTION,
+    limit: int = _LIMIT,
+    provider: Optional[str] = _PROVIDER,
+    no_cache: bool = _NO_CACHE,
 ):
     """Search legal case database.
 
@@ -21,26 +214,21 @@ def cases(
     Output: case summaries with citations.
     Use when user needs case law precedent.
     """
-    # TODO: Integrate with legal research API (Westlaw, LexisNexis)
-    print(
-        json.dumps(
-            {
-                "status": "stub",
-                "action": "research cases",
-                "query": query,
-                "jurisdiction": jurisdiction,
-                "results": [],
-            }
-        )
-    )
+    try:
+        result = search_cases(query, jurisdiction, limit, provider, use_cache=not no_cache)
+    except (ValueError, RuntimeError) as e:
+        _fail(str(e))
+
+    print(json.dumps(result.model_dump()))
 
 
 @app.command()
 def statutes(
     query: str = typer.Argument(..., help="Search query"),
-    jurisdiction: Optional[str] = typer.Option(
-        None, "--jurisdiction", "-j", help="Jurisdiction filter"
-    ),
+    jurisdiction: Optional[str] = _JURISDICTION,
+    limit: int = _LIMIT,
+    provider: Optional[str] = _PROVIDER,
+    no_cache: bool = _NO_CACHE,
 ):
     """Search regulatory/statute database.
 
@@ -48,15 +236,31 @@ def statutes(
     Output: statute text with citations.
     Use when user needs regulatory references.
     """
-    # TODO: Integrate with legal research API
-    print(
-        json.dumps(
-            {
-                "status": "stub",
-                "action": "research statutes",
-                "query": query,
-                "jurisdiction": jurisdiction,
-                "results": [],
-            }
-        )
-    )
+    try:
+        result = search_statutes(query, jurisdiction, limit, provider, use_cache=not no_cache)
+    except (ValueError, RuntimeError) as e:
+        _fail(str(e))
+
+    print(json.dumps(result.model_dump()))
+
+
+@app.command()
+def query(
+    question: str = typer.Argument(..., help="Research question or search query"),
+    jurisdiction: Optional[str] = _JURISDICTION,
+    limit: int = _LIMIT,
+    provider: Optional[str] = _PROVIDER,
+    no_cache: bool = _NO_CACHE,
+):
+    """Search case law and statutes for a question at once.
+
+    Input: research question, jurisdiction.
+    Output: case summaries and statutes with citations.
+    Use when user asks a legal research question needing both.
+    """
+    try:
+        result = research_query(question, jurisdiction, limit, provider, use_cache=not no_cache)
+    except (ValueError, RuntimeError) as e:
+        _fail(str(e))
+
+    print(json.dumps(result.model_dump()))
@@ -0,0 +1,207 @@
+"""Case law and statute search backends for the research commands.
+
+Every provider answers `search(kind, query, jurisdiction, limit)` for kind
+"cases" or "statutes" with a list of result dicts (title, citation,
+jurisdiction, summary, ... as the source supplies them). Searches are
+coroutines so research.py can run the case and statute searches for a
+question at the same time. The provider is chosen by
+$AECH_LEGAL_RESEARCH_PROVIDER, or by whichever of the settings below is
+present.
+
+    http   A JSON search API at $AECH_LEGAL_RESEARCH_URL, queried as
+           GET <url>/cases and GET <url>/statutes with q, jurisdiction and
+           limit parameters, and a bearer token from
+           $AECH_LEGAL_RESEARCH_API_KEY if set. Requests share one pooled
+           keep-alive client (see agents.http_client).
+    local  JSON-lines files cases.jsonl and statutes.jsonl in the directory
+           $AECH_LEGAL_RESEARCH_DATA, one record per line, ranked by the
+           share of query words each record contains. An offline stand-in
+           for the API, for tests and demos.
+    stub   No results. The default when nothing is configured.
+"""
+
+import asyncio
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Optional
+
+KINDS = ("cases", "statutes")
+PROVIDERS = ("http", "local", "stub")
+DEFAULT_LIMIT = 10
+
+# Seconds allowed per HTTP search request (connect: CONNECT_TIMEOUT).
+REQUEST_TIMEOUT = 30.0
+CONNECT_TIMEOUT = 5.0
+
+# Record fields searched by the local provider.
+_LOCAL_FIELDS = ("title", "name", "citation", "summary", "text")
+
+# Parsed local files by path, with the (mtime_ns, size) they were read at.
+_LOCAL_RECORDS: dict[Path, tuple[tuple[int, int], list[tuple[dict, frozenset[str]]]]] = {}
+
+
+def _matches_jurisdiction(record: dict, jurisdiction: Optional[str]) -> bool:
+    """True if record is in jurisdiction or a sub-jurisdiction of it ("US" matches "US-CA")."""
+    if not jurisdiction:
+        return True
+    wanted = jurisdiction.casefold()
+    value = str(record.get("jurisdiction") or "").casefold()
+    return value == wanted or value.startswith(wanted + "-")
+
+
+class ResearchProvider(ABC):
+    """Interface of the research backends."""
+    name = ""
+
+    def config(self) -> dict:
+        """Settings that determine the provider's results; part of the response cache key."""
+        return {}
+
+    @abstractmethod
+    async def search(self, kind: str, query: str, jurisdiction: Optional[str], limit: int) -> list[dict]:
+        """Return up to limit results for query; raises RuntimeError if the source fails."""
+
+
+class StubProvider(ResearchProvider):
+    """Provider with no data."""
+    name = "stub"
+
+    async def search(self, kind: str, query: str, jurisdiction: Optional[str], limit: int) -> list[dict]:
+        return []
+
+
+class LocalProvider(ResearchProvider):
+    """Keyword search over local JSON-lines files."""
+    name = "local"
+
+    def __init__(self, directory: Optional[str] = None):
+        directory = directory or os.environ.get("AECH_LEGAL_RESEARCH_DATA")
+        if not directory:
+            raise ValueError("The local research provider needs $AECH_LEGAL_RESEARCH_DATA")
+        self.directory = Path(directory).expanduser()
+        if not self.directory.is_dir():
+            raise ValueError(f"Research data directory not found: {self.directory}")
+
+    def config(self) -> dict:
+        # The files' versions are included so edits to the data are not masked by cached responses.
+        versions = {}
+        for kind in KINDS:
+            try:
+                st = (self.directory / f"{kind}.jsonl").stat()
+                versions[kind] = [st.st_mtime_ns, st.st_size]
+            except FileNotFoundError:
+                versions[kind] = None
+        return {"directory": str(self.directory.resolve()), "versions": versions}
+
+    def _records(self, kind: str) -> list[tuple[dict, frozenset[str]]]:
+        """Records of kind with their word sets, re-read only when the file changes."""
+        from .embeddings import tokenize
+
+        path = self.directory / f"{kind}.jsonl"
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return []
+        version = (st.st_mtime_ns, st.st_size)
+        cached = _LOCAL_RECORDS.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        records = []
+        with open(path, encoding="utf-8") as handle:
+            for number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise RuntimeError(f"{path}:{number}: invalid JSON ({e})") from e
+                words = tokenize(" ".join(str(record.get(field) or "") for field in _LOCAL_FIELDS))
+                records.append((record, frozenset(words)))
+        _LOCAL_RECORDS[path] = (version, records)
+        return records
+
+    def _search(self, kind: str, query: str, jurisdiction: Optional[str], limit: int) -> list[dict]:
+        from .embeddings import tokenize
+
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        scored = []
+        for record, words in self._records(kind):
+            overlap = len(terms & words)
+            if overlap and _matches_jurisdiction(record, jurisdiction):
+                scored.append((overlap / len(terms), record))
+        scored.sort(key=lambda item: -item[0])
+        return [{**record, "score": round(score, 4)} for score, record in scored[:limit]]
+
+    async def search(self, kind: str, query: str, jurisdiction: Optional[str], limit: int) -> list[dict]:
+        return await asyncio.to_thread(self._search, kind, query, jurisdiction, limit)
+
+
+class HttpProvider(ResearchProvider):
+    """JSON search API over a pooled keep-alive HTTP client."""
+    name = "http"
+
+    def __init__(self, url: Optional[str] = None, api_key: Optional[str] = None):
+        url = url or os.environ.get("AECH_LEGAL_RESEARCH_URL")
+        if not url:
+            raise ValueError("The http research provider needs $AECH_LEGAL_RESEARCH_URL")
+        self.url = url.rstrip("/")
+        self.api_key = api_key or os.environ.get("AECH_LEGAL_RESEARCH_API_KEY")
+
+    def config(self) -> dict:
+        return {"url": self.url}
+
+    async def search(self, kind: str, query: str, jurisdiction: Optional[str], limit: int) -> list[dict]:
+        import httpx
+
+        from .agents import http_client
+
+        client = http_client(f"research:{self.url}", timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT))
+        params: dict[str, Any] = {"q": query, "limit": limit}
+        if jurisdiction:
+            params["jurisdiction"] = jurisdiction
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else None
+        try:
+            response = await client.get(f"{self.url}/{kind}", params=params, headers=headers)
+            response.raise_for_status()
+            payload = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise RuntimeError(f"Research {kind} search failed: {e}") from e
+
+        results = payload.get("results") if isinstance(payload, dict) else payload
+        if not isinstance(results, list):
+            raise RuntimeError(f"Research {kind} search returned no results list")
+        return results[:limit]
+
+
+def default_provider_name() -> str:
+    """$AECH_LEGAL_RESEARCH_PROVIDER, else http or local if configured, else stub."""
+    name = os.environ.get("AECH_LEGAL_RESEARCH_PROVIDER")
+    if name:
+        return name
+    if os.environ.get("AECH_LEGAL_RESEARCH_URL"):
+        return "http"
+    if os.environ.get("AECH_LEGAL_RESEARCH_DATA"):
+        return "local"
+    return "stub"
+
+
+def create_provider(name: Optional[str] = None) -> ResearchProvider:
+    """Build the named provider (default: see default_provider_name) from the environment.
+
+    Raises ValueError for an unknown name or a missing setting. The local
+    provider's word matching uses embeddings.tokenize, imported on first
+    search so `research` commands on other providers do not load numpy.
+    """
+    name = name or default_provider_name()
+    if name == "http":
+        return HttpProvider()
+    if name == "local":
+        return LocalProvider()
+    if name == "stub":
+        return StubProvider()
+    raise ValueError(f"Unknown research provider: {name} (expected one of {', '.join(PROVIDERS)})")
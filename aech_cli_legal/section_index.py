@@ -0,0 +1,200 @@
+"""Constant-time section lookup for a parsed DOCX.
+
+A SectionIndex is built in one pass over a document's Blocks and maps
+
+- section numbers ("3.2", "iv", and qualified list items such as "3.2(a)")
+  to the block range of the section,
+- normalized heading titles ("indemnification") to ranges,
+- defined terms ("material adverse effect") to the paragraph defining them,
+
+plus a loose-key map (stop words dropped, words cut to a short stem,
+sorted) for fuzzy references such as "indemnity" or "liability
+limitations". Indexes are stored in the parsed-document cache next to
+the Blocks they were built from, keyed by the file's content hash.
+"""
+
+import difflib
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .ooxml import MAX_HEADING_LEVEL, Block
+from .parsed import derived, read_docx_cached
+
+# Bump when the index layout or normalization changes.
+SECTION_INDEX_VERSION = "1"
+
+STEM_LENGTH = 5
+FUZZY_CUTOFF = 0.8
+# Numbered paragraphs are indexed by title only if they open with a short lead-in.
+MAX_TITLE_WORDS = 8
+
+_REF_PREFIX_RE = re.compile(
+    r"^(?:sections?|articles?|clauses?|paragraphs?|schedules?|exhibits?|annex|appendix|§+)\s*", re.I
+)
+_WORD_RE = re.compile(r"[^\W_]+")
+_STOP_WORDS = {"a", "an", "and", "the", "of", "to", "in", "on", "for", "or", "by", "with", "section", "article", "clause"}
+
+_QUOTE = "[\"“”]"
+_TERM_RES = (
+    # "Term" means / shall mean / has the meaning ...
+    re.compile(rf"{_QUOTE}([^\"“”]{{1,80}}){_QUOTE}\s+(?:shall\s+)?(?:means?|ha(?:s|ve)\s+the\s+meaning|includes?)\b", re.I),
+    # ... (the "Purchaser") / (each, a "Party")
+    re.compile(rf"\((?:the\s+|each(?:,)?\s+(?:a|an)\s+|a\s+|an\s+)?{_QUOTE}([^\"“”]{{1,60}}){_QUOTE}\)", re.I),
+)
+
+
+def normalize_ref(ref: str) -> str:
+    """Canonical form of a section reference or label: "Section 3.2." -> "3.2", "(a)" -> "a"."""
+    ref = " ".join(ref.split()).casefold()
+    ref = _REF_PREFIX_RE.sub("", ref).strip(" .:")
+    wrapped = re.fullmatch(r"\((\w+)\)", ref)
+    if wrapped:
+        return wrapped.group(1)
+    return re.sub(r"\s+(?=\()", "", ref)
+
+
+def normalize_title(text: str) -> str:
+    """Casefolded words of a heading, punctuation dropped."""
+    return " ".join(_WORD_RE.findall(text.casefold()))
+
+
+def loose_key(text: str) -> str:
+    """Order-insensitive, crudely stemmed key: "Limitation of Liability" -> "liabi limit"."""
+    words = {w[:STEM_LENGTH] for w in _WORD_RE.findall(text.casefold()) if w not in _STOP_WORDS}
+    return " ".join(sorted(words))
+
+
+def rank(block: Block) -> Optional[int]:
+    """Outline rank of a block: headings by level, then list levels; None for body text."""
+    if block.kind != "paragraph" or not block.text.strip():
+        return None
+    if block.is_heading:
+        return block.level
+    if block.number and not block.bullet:
+        return MAX_HEADING_LEVEL + block.depth
+    return None
+
+
+def _qualified(parent: str, label: str, number: str) -> str:
+    """Key for a list item under its parent: "3.2" + "(a)" -> "3.2(a)"."""
+    if not parent or "." in number or number.startswith(parent):
+        return number
+    return f"{parent}({number})" if label.strip().startswith("(") else f"{parent}.{number}"
+
+
+def _title(block: Block) -> str:
+    """Title of a section: the heading, or a short lead-in like "Indemnification." of a numbered paragraph."""
+    if block.is_heading:
+        return block.text.strip()
+    lead, sep, _ = block.text.strip().partition(". ")
+    return lead if sep and len(lead.split()) <= MAX_TITLE_WORDS else ""
+
+
+@dataclass
+class SectionIndex:
+    """Lookup tables from references to block ranges [start, end)."""
+    numbers: dict[str, tuple[int, int]] = field(default_factory=dict)
+    headings: dict[str, tuple[int, int]] = field(default_factory=dict)
+    terms: dict[str, int] = field(default_factory=dict)
+    fuzzy: dict[str, str] = field(default_factory=dict)  # loose key -> heading key
+
+    def lookup(self, ref: str) -> Optional[tuple[int, int]]:
+        """Resolve a section number, heading or defined term; fuzzy heading match as a last resort."""
+        wanted = normalize_ref(ref)
+        if not wanted:
+            return None
+        if wanted in self.numbers:
+            return self.numbers[wanted]
+        title = normalize_title(wanted)
+        if title in self.headings:
+            return self.headings[title]
+        if title in self.terms:
+            return self.terms[title], self.terms[title] + 1
+
+        heading = self.fuzzy.get(loose_key(title))
+        if heading is None:
+            close = difflib.get_close_matches(title, list(self.headings), n=1, cutoff=FUZZY_CUTOFF)
+            heading = close[0] if close else None
+        return self.headings[heading] if heading else None
+
+    def to_json(self) -> dict:
+        return {"numbers": self.numbers, "headings": self.headings, "terms": self.terms, "fuzzy": self.fuzzy}
+
+    @classmethod
+    def from_json(cls, data: dict) -> "SectionIndex":
+        return cls(
+            numbers={k: tuple(v) for k, v in data["numbers"].items()},
+            headings={k: tuple(v) for k, v in data["headings"].items()},
+            terms=data["terms"],
+            fuzzy=data["fuzzy"],
+        )
+
+
+@dataclass
+class Section:
+    """One heading or numbered paragraph and the block range it governs."""
+    start: int
+    end: int
+    rank: int
+    number: str  # Normalized label, e.g. "3.2" or "a"
+    qualified: str  # Label qualified by its parent, e.g. "3.2(a)"
+    title: str  # Heading text or short lead-in; "" if none
+
+
+def outline(blocks: list[Block]) -> list[Section]:
+    """Every section of a document in order, found in one pass.
+
+    A section runs until the next block of equal or higher rank.
+    """
+    sections: list[Section] = []
+    open_sections: list[Section] = []
+    for block in blocks:
+        block_rank = rank(block)
+        if block_rank is None:
+            continue
+        while open_sections and open_sections[-1].rank >= block_rank:
+            open_sections.pop().end = block.index
+        parent = open_sections[-1].qualified if open_sections else ""
+        number = normalize_ref(block.number) if block.number else ""
+        qualified = _qualified(parent, block.number, number) if number else parent
+        section = Section(block.index, len(blocks), block_rank, number, qualified, _title(block))
+        open_sections.append(section)
+        sections.append(section)
+    return sections
+
+
+def build_index(blocks: list[Block]) -> SectionIndex:
+    """Index every heading, numbered paragraph and defined term of a document.
+
+    The first occurrence of a number, heading or term wins.
+    """
+    index = SectionIndex()
+    for block in blocks:
+        if block.kind == "paragraph":
+            for pattern in _TERM_RES:
+                for term in pattern.findall(block.text):
+                    index.terms.setdefault(normalize_title(term), block.index)
+
+    for section in outline(blocks):
+        span = (section.start, section.end)
+        if section.number:
+            index.numbers.setdefault(section.qualified, span)
+            index.numbers.setdefault(section.number, span)
+        title = normalize_title(section.title)
+        if title:
+            index.headings.setdefault(title, span)
+            index.fuzzy.setdefault(loose_key(title), title)
+    return index
+
+
+def load_section_index(path: Path, blocks: Optional[list[Block]] = None, use_cache: bool = True) -> SectionIndex:
+    """Return the section index of a DOCX, from the parsed-document cache when possible.
+
+    blocks, if the caller already has them, saves re-reading the document on a miss.
+    """
+    def build() -> dict:
+        return build_index(blocks if blocks is not None else read_docx_cached(path, use_cache)).to_json()
+
+    return SectionIndex.from_json(derived(path, "section-index", SECTION_INDEX_VERSION, build, use_cache))
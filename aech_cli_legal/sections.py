@@ -0,0 +1,123 @@
+"""Split plain document text into heading-delimited sections and size-bounded chunks."""
+
+import hashlib
+import re
+from dataclasses import dataclass
+
+# Lines that open a new section: Markdown headings, "ARTICLE IV", "Section 3.2",
+# "Schedule 1", and numbered headings such as "3.2 Indemnification".
+HEADING_RE = re.compile(
+    r"""^\s*(?:
+        \#{1,6}\s+\S
+      | (?:ARTICLE|Article|SECTION|Section|SCHEDULE|Schedule|EXHIBIT|Exhibit|ANNEX|Annex|APPENDIX|Appendix)
+        \s+[0-9IVXLC]+[A-Z]?\b
+      | \d+(?:\.\d+)*\.?\s+[A-Z]
+    )""",
+    re.VERBOSE,
+)
+
+
+@dataclass
+class TextSection:
+    """A heading (possibly empty for front matter) and the text it governs."""
+    heading: str
+    text: str  # Full section text, heading line included
+
+    @property
+    def digest(self) -> str:
+        """Content hash of the section text."""
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+
+
+def split_sections(text: str) -> list[TextSection]:
+    """Split text into sections at heading lines; text before the first heading is its own section."""
+    sections: list[TextSection] = []
+    heading = ""
+    lines: list[str] = []
+
+    for line in text.splitlines(keepends=True):
+        if HEADING_RE.match(line) and lines:
+            sections.append(TextSection(heading, "".join(lines)))
+            lines = []
+        if HEADING_RE.match(line):
+            heading = line.strip()
+        lines.append(line)
+
+    if lines:
+        sections.append(TextSection(heading, "".join(lines)))
+    return sections
+
+
+def _split_oversized(section: TextSection, max_chars: int) -> list[TextSection]:
+    """Split a section longer than max_chars on paragraph, then hard, boundaries."""
+    pieces: list[TextSection] = []
+    buffer = ""
+    for paragraph in re.split(r"(?<=\n)(?=\s*\n)", section.text):
+        while len(paragraph) > max_chars:
+            if buffer:
+                pieces.append(TextSection(section.heading, buffer))
+                buffer = ""
+            pieces.append(TextSection(section.heading, paragraph[:max_chars]))
+            paragraph = paragraph[max_chars:]
+        if len(buffer) + len(paragraph) > max_chars and buffer:
+            pieces.append(TextSection(section.heading, buffer))
+            buffer = ""
+        buffer += paragraph
+    if buffer:
+        pieces.append(TextSection(section.heading, buffer))
+    return pieces
+
+
+def chunk_sections(sections: list[TextSection], max_chars: int) -> list[list[TextSection]]:
+    """Pack consecutive sections into chunks of at most max_chars characters.
+
+    Sections are never split across chunks unless a single section is itself
+    larger than max_chars.
+    """
+    chunks: list[list[TextSection]] = []
+    current: list[TextSection] = []
+    size = 0
+
+    for section in sections:
+        for piece in _split_oversized(section, max_chars) if len(section.text) > max_chars else [section]:
+            if current and size + len(piece.text) > max_chars:
+                chunks.append(current)
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece.text)
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def content_defined_chunks(
+    sections: list[TextSection], target_chars: int, max_chars: int
+) -> list[list[TextSection]]:
+    """Group sections into chunks whose boundaries depend on section content, not position.
+
+    A chunk ends after a section with probability len(section) / target_chars,
+    decided by the section's own hash, so chunks average ~target_chars and an
+    edit to one section only changes the chunk containing it (plus its
+    neighbour if the edited section's boundary decision flips). Every other
+    chunk of a revised draft is identical to the previous draft's and hits
+    the cache. max_chars forces a boundary regardless.
+    """
+    chunks: list[list[TextSection]] = []
+    current: list[TextSection] = []
+    size = 0
+
+    for section in sections:
+        for piece in _split_oversized(section, max_chars) if len(section.text) > max_chars else [section]:
+            if current and size + len(piece.text) > max_chars:
+                chunks.append(current)
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece.text)
+            if int(piece.digest[:16], 16) / 2**64 < len(piece.text) / target_chars:
+                chunks.append(current)
+                current, size = [], 0
+
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,205 @@
+"""Warm daemon that answers aech-cli-legal commands over a local Unix socket.
+
+Protocol: JSON lines. Each request is one object per line:
+
+    {"argv": ["clauses", "search", "indemnity", "--top-k", "5"], "cwd": "/work", "env": {...}}
+
+and each response is one object per line:
+
+    {"exit_code": 0, "stdout": "...", "stderr": ""}
+
+`argv` is exactly what would follow `aech-cli-legal` on the command line, so
+the daemon mirrors the Typer commands one-to-one. Relative paths are resolved
+against the request `cwd`, and `env` carries the caller's AECH_* variables.
+
+Commands share process-wide state (stdout, cwd, environment), so the daemon
+runs them one at a time. Commands that wait on an LLM (LLM_COMMANDS) run
+in a pool of spawned worker processes instead, each with its own state, so
+a slow model call does not hold up searches, edits or --help. Process pools
+that commands start (redline, clause indexing) use the spawn start method
+in the daemon too: forking a threaded process is unsafe.
+"""
+
+import io
+import json
+import multiprocessing
+import os
+import signal
+import socketserver
+import sys
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Optional
+
+import click
+import typer
+
+from .client import daemon_available, socket_path
+from .main import SUBCOMMAND_GROUPS, _load_manifest, _should_emit_manifest, app
+
+# Serializes in-process commands; connections are still accepted concurrently.
+_DISPATCH_LOCK = threading.Lock()
+
+# argv prefixes of the commands run in the LLM worker pool.
+LLM_COMMANDS = (("classify",), ("documents", "analyze"), ("documents", "extract-edits"))
+# Overridable via AECH_LEGAL_DAEMON_LLM_WORKERS.
+LLM_WORKERS = 4
+
+_command: Optional[click.Command] = None
+_llm_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _root_command() -> click.Command:
+    """Build the click command tree once and keep it for the daemon's lifetime."""
+    global _command
+    if _command is None:
+        _command = typer.main.get_command(app)
+    return _command
+
+
+def warm_up() -> None:
+    """Import every subcommand group and load the manifest ahead of the first request."""
+    command = _root_command()
+    ctx = click.Context(command)
+    for name in SUBCOMMAND_GROUPS:
+        command.get_command(ctx, name)
+    _load_manifest()
+
+
+def is_llm_command(argv: list[str]) -> bool:
+    """True if argv runs one of LLM_COMMANDS (asking for its help does not)."""
+    if "--help" in argv or "-h" in argv:
+        return False
+    return any(tuple(argv[:len(command)]) == command for command in LLM_COMMANDS)
+
+
+def _llm_workers() -> ProcessPoolExecutor:
+    global _llm_pool
+    if _llm_pool is None:
+        workers = int(os.environ.get("AECH_LEGAL_DAEMON_LLM_WORKERS", LLM_WORKERS))
+        _llm_pool = ProcessPoolExecutor(max_workers=max(1, workers), mp_context=multiprocessing.get_context("spawn"))
+    return _llm_pool
+
+
+def dispatch(argv: list[str], cwd: Optional[str] = None, env: Optional[dict[str, str]] = None) -> dict:
+    """Run one CLI invocation and capture its output: in-process, or in the LLM worker pool."""
+    if not is_llm_command(argv):
+        with _DISPATCH_LOCK:
+            return run_command(argv, cwd, env)
+
+    global _llm_pool
+    # Workers are started on demand; under the lock they inherit the daemon's
+    # own environment rather than another request's.
+    with _DISPATCH_LOCK:
+        pool = _llm_workers()
+        future = pool.submit(run_command, argv, cwd, env)
+    try:
+        return future.result()
+    except BrokenProcessPool as e:
+        with _DISPATCH_LOCK:
+            if _llm_pool is pool:
+                _llm_pool = None
+        return {"exit_code": 1, "stdout": "", "stderr": f"LLM worker failed: {e}\n"}
+
+
+def run_command(argv: list[str], cwd: Optional[str] = None, env: Optional[dict[str, str]] = None) -> dict:
+    """Run one CLI invocation in this process with the request's cwd and environment, capturing its output.
+
+    Callers in a threaded process must hold _DISPATCH_LOCK.
+    """
+    if _should_emit_manifest(["aech-cli-legal", *argv]):
+        return {"exit_code": 0, "stdout": json.dumps(_load_manifest(), indent=2) + "\n", "stderr": ""}
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    previous_cwd = os.getcwd()
+    previous_env = {key: os.environ.get(key) for key in (env or {})}
+    try:
+        if cwd:
+            os.chdir(cwd)
+        os.environ.update(env or {})
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            exit_code = _invoke(argv, stderr)
+    finally:
+        os.chdir(previous_cwd)
+        for key, value in previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    return {"exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def _invoke(argv: list[str], stderr: io.StringIO) -> int:
+    """Invoke the command tree without letting click exit the process."""
+    try:
+        result = _root_command().main(args=argv, prog_name="aech-cli-legal", standalone_mode=False)
+        return result if isinstance(result, int) else 0
+    except click.exceptions.Exit as e:
+        return e.exit_code
+    except click.ClickException as e:
+        e.show(file=stderr)
+        return e.exit_code
+    except click.exceptions.Abort:
+        stderr.write("Aborted!\n")
+        return 1
+    except Exception:
+        traceback.print_exc(file=stderr)
+        return 1
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answer JSON-lines requests until the client closes the connection."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                response = dispatch(request["argv"], request.get("cwd"), request.get("env"))
+            except (ValueError, KeyError, TypeError) as e:
+                response = {"exit_code": 2, "stdout": "", "stderr": f"Invalid request: {e}\n"}
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(path: Optional[Path] = None, preload: bool = True) -> None:
+    """Listen on the Unix socket until interrupted."""
+    path = path or socket_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        if daemon_available(path):
+            raise RuntimeError(f"Daemon already listening on {path}")
+        path.unlink()
+
+    if preload:
+        warm_up()
+    multiprocessing.set_start_method("spawn", force=True)
+
+    server = _Server(str(path), _RequestHandler)
+    os.chmod(path, 0o600)
+    signal.signal(signal.SIGTERM, _interrupt)
+    print(json.dumps({"status": "listening", "socket": str(path), "pid": os.getpid()}), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if _llm_pool is not None:
+            _llm_pool.shutdown(wait=False, cancel_futures=True)
+        path.unlink(missing_ok=True)
+        print(json.dumps({"status": "stopped", "socket": str(path)}), file=sys.stderr, flush=True)
@@ -5,10 +5,46 @@ from pathlib import Path
 from typing import Optional
 
 import typer
+from pydantic import BaseModel
 
 app = typer.Typer()
 
 
+class SigpageResult(BaseModel):
+    """Result of signature page generation."""
+    status: str
+    action: str = "sigpage generate"
+    parties: str
+    output: str
+    template: str
+
+
+# --- In-process API ---
+
+def generate_signature_pages(parties: str, output: str, template: Optional[str] = None) -> SigpageResult:
+    """Generate signature pages for the parties described in a JSON file.
+
+    Raises FileNotFoundError if the parties file does not exist.
+    """
+    parties_file = Path(parties)
+    output_file = Path(output)
+
+    if not parties_file.exists():
+        raise FileNotFoundError(f"Parties file not found: {parties}")
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    # TODO: Generate signature pages from party data
+    return SigpageResult(
+        status="stub",
+        parties=str(parties_file),
+        output=str(output_file),
+        template=template or "standard",
+    )
+
+
+# --- Typer commands ---
+
 @app.command()
 def generate(
     parties: str = typer.Argument(..., help="JSON file with party information"),
@@ -23,24 +59,10 @@ def generate(
     Output: signature pages DOCX.
     Use when user needs execution-ready signature blocks.
     """
-    parties_file = Path(parties)
-    output_file = Path(output)
-
-    if not parties_file.exists():
-        print(json.dumps({"error": f"Parties file not found: {parties}"}))
+    try:
+        result = generate_signature_pages(parties, output, template)
+    except FileNotFoundError as e:
+        print(json.dumps({"error": str(e)}))
         raise typer.Exit(code=1)
 
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-
-    # TODO: Generate signature pages from party data
-    print(
-        json.dumps(
-            {
-                "status": "stub",
-                "action": "sigpage generate",
-                "parties": str(parties_file),
-                "output": str(output_file),
-                "template": template or "standard",
-            }
-        )
-    )
+    print(json.dumps(result.model_dump()))
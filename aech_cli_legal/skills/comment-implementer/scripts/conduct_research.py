@@ -2,38 +2,28 @@
 """
 Conduct legal research on a question.
 
-Uses: aech-cli-legal research cases, aech-cli-legal research statutes
+Uses: aech-cli-legal research query
 """
 import argparse
 import json
 import subprocess
 from pathlib import Path
 
-
-def search_cases(query: str, jurisdiction: str = None) -> dict:
-    """Search case law database."""
-    cmd = ["aech-cli-legal", "research", "cases", query]
-    if jurisdiction:
-        cmd.extend(["--jurisdiction", jurisdiction])
-
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return json.loads(result.stdout)
-    except (subprocess.CalledProcessError, json.JSONDecodeError):
-        return {"status": "stub", "query": query, "results": []}
+from aech_cli_legal.client import run_cli
 
 
-def search_statutes(query: str, jurisdiction: str = None) -> dict:
-    """Search statute database."""
-    cmd = ["aech-cli-legal", "research", "statutes", query]
+def search(query: str, jurisdiction: str = None) -> dict:
+    """Search case law and statutes in one call; the CLI runs both searches concurrently."""
+    cmd = ["aech-cli-legal", "research", "query", query]
     if jurisdiction:
         cmd.extend(["--jurisdiction", jurisdiction])
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = run_cli(cmd, check=True)
         return json.loads(result.stdout)
     except (subprocess.CalledProcessError, json.JSONDecodeError):
-        return {"status": "stub", "query": query, "results": []}
+        stub = {"status": "stub", "query": query, "results": []}
+        return {"status": "stub", "query": query, "cases": stub, "statutes": stub}
 
 
 def main():
@@ -53,8 +43,9 @@ def main():
         return
 
     # Conduct research
-    case_results = search_cases(question, args.jurisdiction)
-    statute_results = search_statutes(question, args.jurisdiction)
+    results = search(question, args.jurisdiction)
+    case_results = results.get("cases", {})
+    statute_results = results.get("statutes", {})
 
     research = {
         "question": question,
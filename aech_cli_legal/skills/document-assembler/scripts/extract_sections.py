@@ -9,6 +9,8 @@ import json
 import subprocess
 from pathlib import Path
 
+from aech_cli_legal.client import run_cli
+
 
 def main():
     parser = argparse.ArgumentParser(description="Extract sections from document")
@@ -27,7 +29,7 @@ def main():
     ]
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = run_cli(cmd, check=True)
         data = json.loads(result.stdout)
         print(json.dumps(data, indent=2))
     except subprocess.CalledProcessError as e:
@@ -2,12 +2,14 @@
 """
 List available precedent deals for a contract type.
 
-Uses: aech-cli-legal clauses search (to find indexed deals)
+Uses: aech-cli-legal clauses deals (deals indexed with --contract-type)
 """
 import argparse
 import json
 import subprocess
 
+from aech_cli_legal.client import run_cli
+
 
 def main():
     parser = argparse.ArgumentParser(description="List precedent deals")
@@ -16,37 +18,35 @@ def main():
     parser.add_argument("--output-format", choices=["json", "table"], default="table")
     args = parser.parse_args()
 
-    # Search for deals of this type
-    cmd = ["aech-cli-legal", "clauses", "search", f"contract type: {args.type}", "--top-k", "20"]
+    cmd = ["aech-cli-legal", "clauses", "deals", "--contract-type", args.type]
+    if args.jurisdiction:
+        cmd += ["--jurisdiction", args.jurisdiction]
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = run_cli(cmd, check=True)
         data = json.loads(result.stdout)
 
-        # TODO: Filter and dedupe by deal name when real implementation exists
         if args.output_format == "json":
             print(json.dumps(data, indent=2))
         else:
-            results = data.get("results", [])
-            if not results:
-                print(f"No precedent deals found for type: {args.type}")
+            deals = data.get("deals", [])
+            if not deals:
+                where = f" in {args.jurisdiction}" if args.jurisdiction else ""
+                print(f"No precedent deals found for type: {args.type}{where}")
                 return
 
             print(f"\nPrecedent deals for '{args.type}':\n")
-            # Group by deal name
-            deals = {}
-            for r in results:
-                deal = r.get("deal_name", "Unknown")
-                if deal not in deals:
-                    deals[deal] = r
-
-            for deal, info in deals.items():
-                print(f"- {deal} ({info.get('deal_date', 'N/A')})")
+            for deal in deals:
+                jurisdictions = ", ".join(deal.get("jurisdictions", [])) or "N/A"
+                print(
+                    f"- {deal['deal_name']} ({deal.get('deal_date') or 'N/A'}; {jurisdictions}) "
+                    f"- {deal['documents']} documents, {deal['clauses']} clauses"
+                )
 
     except subprocess.CalledProcessError as e:
         print(json.dumps({"error": f"CLI failed: {e.stderr}"}))
     except json.JSONDecodeError:
-        print(json.dumps({"status": "stub", "type": args.type}))
+        print(json.dumps({"error": "Unexpected CLI output", "type": args.type}))
 
 
 if __name__ == "__main__":
@@ -11,6 +11,8 @@ import sys
 import tempfile
 from pathlib import Path
 
+from aech_cli_legal.client import run_cli
+
 
 def main():
     parser = argparse.ArgumentParser(description="Parse email for document edits")
@@ -54,7 +56,7 @@ def main():
         if args.output:
             cmd.extend(["--output", args.output])
 
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = run_cli(cmd, check=True)
 
         if args.output_format == "summary":
             # Parse and format as summary
@@ -10,32 +10,39 @@ import subprocess
 import sys
 from pathlib import Path
 
+from aech_cli_legal.client import run_cli
+
 
 def main():
     parser = argparse.ArgumentParser(description="Search for precedent clauses")
     parser.add_argument("query", nargs="?", help="Clause text or type to search for")
-    parser.add_argument("--clause-type", help="Search by clause type (e.g., indemnification)")
+    parser.add_argument("--clause-type", help="Only clauses of this type (e.g., indemnification)")
     parser.add_argument("--file", help="Read clause text from file")
     parser.add_argument("--top-k", type=int, default=5, help="Number of results")
+    parser.add_argument("--all-variants", action="store_true", help="List near-duplicate variants separately")
     parser.add_argument("--output-format", choices=["json", "table"], default="table")
     args = parser.parse_args()
 
     # Determine query text
     if args.file:
         query = Path(args.file).read_text().strip()
-    elif args.clause_type:
-        query = args.clause_type
     elif args.query:
         query = args.query
+    elif args.clause_type:
+        query = args.clause_type  # No text to match: rank the clauses of the type by their type name
     else:
         print(json.dumps({"error": "Must provide query, --clause-type, or --file"}))
         sys.exit(1)
 
     # Call aech-cli-legal clauses search
     cmd = ["aech-cli-legal", "clauses", "search", query, "--top-k", str(args.top_k)]
+    if args.clause_type:
+        cmd.extend(["--clause-type", args.clause_type])
+    if args.all_variants:
+        cmd.append("--all-variants")
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = run_cli(cmd, check=True)
         data = json.loads(result.stdout)
 
         if args.output_format == "json":
@@ -48,11 +55,18 @@ def main():
                 return
 
             print(f"\nFound {len(results)} matching clauses:\n")
-            print("| # | Deal | Date | Similarity | Preview |")
-            print("|---|------|------|------------|---------|")
+            print("| # | Deal | Date | Similarity | Variants | Preview |")
+            print("|---|------|------|------------|----------|---------|")
             for i, r in enumerate(results, 1):
                 preview = r.get("text", "")[:50] + "..."
-                print(f"| {i} | {r.get('deal_name', 'N/A')} | {r.get('deal_date', 'N/A')} | {r.get('similarity', 'N/A')} | {preview} |")
+                deal = r.get("deal_name", "N/A")
+                if r.get("deal_count", 1) > 1:
+                    deal += f" (+{r['deal_count'] - 1} more)"
+                variants = r.get("variants", 0)
+                print(
+                    f"| {i} | {deal} | {r.get('deal_date', 'N/A')} | {r.get('similarity', 'N/A')} | "
+                    f"{variants or '-'} | {preview} |"
+                )
 
     except subprocess.CalledProcessError as e:
         print(json.dumps({"error": f"CLI failed: {e.stderr}"}))
@@ -2,26 +2,52 @@
 """
 Show full context for a matched clause.
 
-Uses: aech-cli-legal (future: clauses get-context)
+Uses: aech-cli-legal clauses get-context
 """
 import argparse
 import json
+import subprocess
+import sys
+
+from aech_cli_legal.client import run_cli
 
 
 def main():
     parser = argparse.ArgumentParser(description="Show full context for a clause")
     parser.add_argument("--clause-id", required=True, help="Clause ID from search results")
     parser.add_argument("--context-lines", type=int, default=20, help="Lines of context")
+    parser.add_argument("--output-format", choices=["json", "text"], default="text")
     args = parser.parse_args()
 
-    # TODO: Implement when aech-cli-legal has clause context retrieval
-    print(json.dumps({
-        "status": "stub",
-        "action": "show_context",
-        "clause_id": args.clause_id,
-        "context_lines": args.context_lines,
-        "message": "Will retrieve full clause context from database"
-    }))
+    cmd = [
+        "aech-cli-legal", "clauses", "get-context",
+        "--clause-id", args.clause_id, "--context-lines", str(args.context_lines),
+    ]
+
+    try:
+        result = run_cli(cmd, check=True)
+        data = json.loads(result.stdout)
+
+        if args.output_format == "json":
+            print(json.dumps(data, indent=2))
+            return
+
+        print(f"\n{data['deal_name']} ({data.get('deal_date') or 'undated'}) - {data['source']}")
+        print(f"Section {data['section'] or 'n/a'}: {data['heading']}\n")
+        if data["before"]:
+            print(data["before"])
+            print()
+        print(">>> " + data["text"].replace("\n", "\n>>> "))
+        if data["after"]:
+            print()
+            print(data["after"])
+
+    except subprocess.CalledProcessError as e:
+        print(json.dumps({"error": f"CLI failed: {e.stdout or e.stderr}"}))
+        sys.exit(1)
+    except json.JSONDecodeError:
+        print(json.dumps({"error": "Invalid JSON from CLI", "raw": result.stdout}))
+        sys.exit(1)
 
 
 if __name__ == "__main__":
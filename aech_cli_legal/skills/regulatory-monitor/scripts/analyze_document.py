@@ -10,6 +10,8 @@ import subprocess
 import sys
 from pathlib import Path
 
+from aech_cli_legal.client import run_cli
+
 
 def main():
     parser = argparse.ArgumentParser(description="Analyze document for regulatory terms")
@@ -28,7 +30,7 @@ def main():
         cmd.extend(["--output", args.output])
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = run_cli(cmd, check=True)
         print(result.stdout)
     except subprocess.CalledProcessError as e:
         print(json.dumps({"error": f"Analysis failed: {e.stderr}"}))
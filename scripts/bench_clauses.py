@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark `clauses search` over a large synthetic clause store.
+
+Fills a temporary clause store with N synthetic clauses, 1000 per
+"document". Each clause mixes words from one of a few hundred topics (as
+real libraries cluster by clause type) with Zipf-distributed filler from a
+generated vocabulary.
+then times top-k searches end to end: open the store, embed the query,
+score the memory-mapped matrix, select the top k and fetch their metadata.
+Queries are perturbed copies of stored clauses, so the source clause should
+rank first; the hit rate is reported as a sanity check. Searches bypass
+the result cache and the query-embedding cache, so every one is timed cold.
+
+Lexical (BM25) and hybrid searches are timed on the same queries; a
+lexical query never embeds the query or touches the vectors.
+
+With --ivf, also builds the IVF index and, for each --nprobe value, reports
+latency and recall@k against the exact (flat) results for the same queries.
+
+Usage:
+    uv run python scripts/bench_clauses.py                    # 100k clauses
+    uv run python scripts/bench_clauses.py --clauses 20000 --queries 200
+    uv run python scripts/bench_clauses.py --clauses 1000000 --ivf --nprobe 4 16 64
+    AECH_LEGAL_ONNX_MODEL=~/models/minilm uv run python scripts/bench_clauses.py --embedder onnx --clauses 20000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+CLAUSES_PER_DOCUMENT = 1000
+VOCABULARY = 5000
+TOPICS = 300
+TOPIC_WORDS = 40
+TOPIC_SHARE = 0.6
+SYLLABLES = "ba be bi bo ca ce co da de di do fa fe ga ge la le li lo ma me mi mo na ne no pa pe po ra re ri ro sa se si so ta te ti to va ve vi".split()
+
+
+def vocabulary(rng: random.Random, size: int = VOCABULARY) -> list[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def synthetic_clause(rng: random.Random, topic: list[str], words: list[str], weights: list[float]) -> str:
+    length = rng.randint(40, 120)
+    on_topic = int(length * TOPIC_SHARE)
+    chosen = rng.choices(topic, k=on_topic) + rng.choices(words, weights, k=length - on_topic)
+    rng.shuffle(chosen)
+    return " ".join(chosen)
+
+
+def perturb(text: str, rng: random.Random, rate: float = 0.3) -> str:
+    """Drop and shuffle some words, as a paraphrased query would."""
+    kept = [word for word in text.split() if rng.random() > rate]
+    rng.shuffle(kept)
+    return " ".join(kept)
+
+
+def build_store(directory: Path, clauses: int, seed: int, embedder: str = "hashing") -> list[str]:
+    from aech_cli_legal.clause_store import Clause, ClauseStore, IndexedDocument
+
+    rng = random.Random(seed)
+    words = vocabulary(rng)
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    topics = [rng.sample(words, TOPIC_WORDS) for _ in range(TOPICS)]
+    store = ClauseStore(directory)
+    with store.connect() as conn:
+        embedder = store.embedder(conn, embedder)
+
+    texts = []
+    for doc in range(0, clauses, CLAUSES_PER_DOCUMENT):
+        batch = [
+            Clause(f"{n + 1}", "", "", synthetic_clause(rng, rng.choice(topics), words, weights), n, n + 1)
+            for n in range(min(CLAUSES_PER_DOCUMENT, clauses - doc))
+        ]
+        store.add_documents("Bench Deal", None, [IndexedDocument(Path(f"doc{doc}.docx"), str(doc), batch)], embedder)
+        texts.extend(c.text for c in batch)
+    return texts
+
+
+def _time_queries(queries: list[str], top_k: int, **kwargs) -> tuple[list[float], list[list[str]]]:
+    from aech_cli_legal.clauses import search_clauses
+
+    timings, ids = [], []
+    for query in queries:
+        started = time.perf_counter()
+        result = search_clauses(query, top_k, use_cache=False, **kwargs)
+        timings.append(1000 * (time.perf_counter() - started))
+        ids.append([r["clause_id"] for r in result.results])
+    return timings, ids
+
+
+def _latency(timings: list[float]) -> dict:
+    ordered = sorted(timings)
+    return {
+        "first_query_ms": round(timings[0], 2),
+        "p50_ms": round(ordered[len(ordered) // 2], 2),
+        "p95_ms": round(ordered[max(0, int(len(ordered) * 0.95) - 1)], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark clause search")
+    parser.add_argument("--clauses", type=int, default=100_000, help="Clauses in the store")
+    parser.add_argument("--queries", type=int, default=100, help="Queries to time")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--ivf", action="store_true", help="Also build and measure the IVF index")
+    parser.add_argument("--nlist", type=int, help="IVF lists (default: ~sqrt(clauses))")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64], help="IVF nprobe values to test")
+    parser.add_argument("--embedder", default="hashing", help="Embedding backend: hashing, onnx or stub")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["AECH_LEGAL_CLAUSE_STORE"] = tmp
+        from aech_cli_legal.clauses import build_clause_index
+
+        started = time.perf_counter()
+        texts = build_store(Path(tmp), args.clauses, args.seed, args.embedder)
+        build_seconds = time.perf_counter() - started
+
+        rng = random.Random(args.seed + 1)
+        picks = [rng.randrange(len(texts)) for _ in range(args.queries)]
+        queries = [perturb(texts[pick], rng) for pick in picks]
+        timings, exact = _time_queries(queries, args.top_k)
+        source_ids = [f"bench-deal_doc{pick - pick % CLAUSES_PER_DOCUMENT}_{pick % CLAUSES_PER_DOCUMENT + 1}" for pick in picks]
+        hits = sum(bool(ids) and ids[0] == source for ids, source in zip(exact, source_ids))
+
+        report = {
+            "clauses": args.clauses,
+            "embedder": args.embedder,
+            "build_seconds": round(build_seconds, 2),
+            "top_k": args.top_k,
+            "flat": {**_latency(timings), "top1_hit_rate": round(hits / len(picks), 3)},
+        }
+        for mode in ("lexical", "hybrid"):
+            timings, ranked = _time_queries(queries, args.top_k, mode=mode)
+            hits = sum(bool(ids) and ids[0] == source for ids, source in zip(ranked, source_ids))
+            report[mode] = {**_latency(timings), "top1_hit_rate": round(hits / len(picks), 3)}
+        if args.ivf:
+            index = build_clause_index(args.nlist)
+            report["ivf"] = {"build_seconds": index.elapsed_seconds, "nlist": index.nlist, "runs": []}
+            for nprobe in args.nprobe:
+                timings, approximate = _time_queries(queries, args.top_k, index_type="ivf", nprobe=nprobe)
+                recall = sum(len(set(a) & set(e)) / max(1, len(e)) for a, e in zip(approximate, exact)) / len(exact)
+                report["ivf"]["runs"].append({"nprobe": nprobe, **_latency(timings), f"recall@{args.top_k}": round(recall, 3)})
+        report["store_mb"] = round(sum(f.stat().st_size for f in Path(tmp).rglob("*") if f.is_file()) / 1e6, 1)
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming DOCX reader against python-docx on a synthetic agreement.
+
+Generates an N-page agreement (numbered articles/sections, sub-clauses and a
+table per article), then, each in a fresh interpreter, times and measures the
+peak RSS growth of:
+  - python-docx: Document() + joining paragraph text (the old analyze path)
+  - aech_cli_legal.ooxml: streaming iterparse into Blocks
+
+Usage:
+    uv run python scripts/bench_convert.py              # 600 pages
+    uv run python scripts/bench_convert.py --pages 1500
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+<Override PartName="/word/numbering.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>
+</Types>"""
+
+ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering" Target="numbering.xml"/>
+</Relationships>"""
+
+STYLES = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles xmlns:w="{W_NS}">
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/>
+<w:pPr><w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr><w:outlineLvl w:val="0"/></w:pPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/><w:basedOn w:val="Normal"/>
+<w:pPr><w:numPr><w:ilvl w:val="1"/><w:numId w:val="1"/></w:numPr><w:outlineLvl w:val="1"/></w:pPr></w:style>
+</w:styles>"""
+
+NUMBERING = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:numbering xmlns:w="{W_NS}">
+<w:abstractNum w:abstractNumId="0">
+<w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="upperRoman"/><w:lvlText w:val="Article %1"/></w:lvl>
+<w:lvl w:ilvl="1"><w:start w:val="1"/><w:isLgl/><w:numFmt w:val="decimal"/><w:lvlText w:val="%1.%2"/></w:lvl>
+<w:lvl w:ilvl="2"><w:start w:val="1"/><w:numFmt w:val="lowerLetter"/><w:lvlText w:val="(%3)"/></w:lvl>
+</w:abstractNum>
+<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>
+</w:numbering>"""
+
+WORDS = (
+    "the seller shall indemnify purchaser against losses arising from breach of any representation "
+    "warranty covenant agreement material adverse effect closing date governing law jurisdiction "
+    "notwithstanding foregoing provided however subject to limitation basket cap escrow"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _para(text: str, style: str = "", ilvl: int | None = None) -> str:
+    ppr = ""
+    if style or ilvl is not None:
+        num = f'<w:numPr><w:ilvl w:val="{ilvl}"/><w:numId w:val="1"/></w:numPr>' if ilvl is not None else ""
+        pstyle = f'<w:pStyle w:val="{style}"/>' if style else ""
+        ppr = f"<w:pPr>{pstyle}{num}</w:pPr>"
+    return f'<w:p>{ppr}<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def _table(rng: random.Random) -> str:
+    rows = "".join(
+        "<w:tr>" + "".join(f"<w:tc>{_para(_sentence(rng, 3))}</w:tc>" for _ in range(3)) + "</w:tr>"
+        for _ in range(4)
+    )
+    return f"<w:tbl>{rows}</w:tbl>"
+
+
+def synthetic_paragraphs(pages: int, seed: int = 7) -> list[str]:
+    """Body XML fragments for a synthetic agreement (~12 paragraphs per page)."""
+    rng = random.Random(seed)
+    body = []
+    sections_per_article = 8
+    for _article in range(max(1, pages // 4)):
+        body.append(_para(_sentence(rng, 4), "Heading1"))
+        for _section in range(sections_per_article):
+            body.append(_para(_sentence(rng, 5), "Heading2"))
+            body.append(_para(" ".join(_sentence(rng, 18) for _ in range(4))))
+            for _clause in range(3):
+                body.append(_para(_sentence(rng, 25), ilvl=2))
+        body.append(_table(rng))
+    return body
+
+
+def write_docx(path: Path, body: list[str]) -> None:
+    """Write a minimal DOCX package whose body is the given XML fragments."""
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W_NS}"><w:body>{"".join(body)}<w:sectPr/></w:body></w:document>'
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", CONTENT_TYPES)
+        package.writestr("_rels/.rels", ROOT_RELS)
+        package.writestr("word/_rels/document.xml.rels", DOCUMENT_RELS)
+        package.writestr("word/document.xml", document)
+        package.writestr("word/styles.xml", STYLES)
+        package.writestr("word/numbering.xml", NUMBERING)
+
+
+def write_synthetic_docx(path: Path, pages: int, seed: int = 7) -> None:
+    """Write a synthetic agreement of roughly the given page count."""
+    write_docx(path, synthetic_paragraphs(pages, seed))
+
+
+READERS = {
+    "python_docx": (
+        "from docx import Document",
+        "len('\\n'.join(p.text for p in Document(path).paragraphs))",
+    ),
+    "streaming": (
+        "from aech_cli_legal.ooxml import block_to_markdown, iter_blocks",
+        "sum(len(block_to_markdown(b)) for b in iter_blocks(path))",
+    ),
+}
+
+MEASURE = """
+import json, resource, sys, time
+{imports}
+path = sys.argv[1]
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+{expr}
+elapsed = time.perf_counter() - started
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": round(elapsed, 3), "peak_rss_mb": round((after - before) / 1024, 1)}}))
+"""
+
+
+def measure(reader: str, path: Path) -> dict:
+    """Time one reader and measure its peak RSS growth in a fresh interpreter."""
+    imports, expr = READERS[reader]
+    code = MEASURE.format(imports=imports, expr=expr)
+    proc = subprocess.run([sys.executable, "-c", code, str(path)], capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming DOCX parsing")
+    parser.add_argument("--pages", type=int, default=600, help="Approximate page count")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "synthetic.docx"
+        write_synthetic_docx(path, args.pages)
+
+        report = {
+            "pages": args.pages,
+            "docx_bytes": path.stat().st_size,
+            "python_docx": measure("python_docx", path),
+            "streaming": measure("streaming", path),
+        }
+        report["speedup"] = round(report["python_docx"]["seconds"] / max(report["streaming"]["seconds"], 1e-9), 2)
+        print(json.dumps(report, indent=2))
+        sys.exit(0 if report["streaming"]["seconds"] <= report["python_docx"]["seconds"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for aech-cli-legal cold start.
+
+Runs each CLI entry path under `python -X importtime` in a fresh interpreter,
+reports the cumulative import cost, and fails if a path pulls in modules it
+should not (e.g. pydantic-ai for `sigpage generate`) or exceeds its budget.
+
+Usage:
+    uv run python scripts/bench_import.py               # Human-readable table
+    uv run python scripts/bench_import.py --json        # JSON report
+    uv run python scripts/bench_import.py --budget-ms 300
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+# Modules that only LLM / DOCX commands may import.
+HEAVY_MODULES = ("pydantic_ai", "docx", "lxml", "openai", "anthropic", "httpx")
+
+# (label, argv after the entry point, modules allowed to be imported)
+CASES = [
+    ("import main", None, ()),
+    ("--help (manifest)", ["--help"], ()),
+    ("sigpage generate --help", ["sigpage", "generate", "--help"], ()),
+    ("research cases --help", ["research", "cases", "--help"], ()),
+    ("dataroom connect --help", ["dataroom", "connect", "--help"], ()),
+    ("clauses search --help", ["clauses", "search", "--help"], ()),
+    ("documents analyze --help", ["documents", "analyze", "--help"], ()),
+]
+
+
+def measure(argv: list[str] | None) -> tuple[int, set[str]]:
+    """Run one entry path and return (total import microseconds, imported top-level modules)."""
+    if argv is None:
+        code = "import aech_cli_legal.main"
+    else:
+        code = (
+            "import sys; from aech_cli_legal.main import run; "
+            f"sys.argv = ['aech-cli-legal', *{argv!r}]; run()"
+        )
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+
+    total_us = 0
+    modules: set[str] = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        stripped = name.strip()
+        modules.add(stripped.split(".")[0])
+        # Top-level imports have no indentation beyond the single separator space.
+        if name.startswith(" ") and not name.startswith("  "):
+            total_us += int(cumulative)
+
+    return total_us, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark aech-cli-legal import time")
+    parser.add_argument("--budget-ms", type=float, default=400.0, help="Max import time per path")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path (best is reported)")
+    parser.add_argument("--json", action="store_true", help="Emit JSON report")
+    args = parser.parse_args()
+
+    report = []
+    failed = False
+    for label, argv, allowed in CASES:
+        runs = [measure(argv) for _ in range(args.repeat)]
+        best_us = min(us for us, _ in runs)
+        modules = runs[0][1]
+        leaked = sorted(m for m in HEAVY_MODULES if m in modules and m not in allowed)
+        over_budget = best_us / 1000 > args.budget_ms
+        failed = failed or bool(leaked) or over_budget
+        report.append({
+            "path": label,
+            "import_ms": round(best_us / 1000, 1),
+            "heavy_modules": leaked,
+            "over_budget": over_budget,
+        })
+
+    if args.json:
+        print(json.dumps({"budget_ms": args.budget_ms, "results": report, "ok": not failed}, indent=2))
+    else:
+        print(f"{'path':<28} {'import ms':>10}  heavy modules")
+        for row in report:
+            flag = " (over budget)" if row["over_budget"] else ""
+            print(f"{row['path']:<28} {row['import_ms']:>10}  {', '.join(row['heavy_modules']) or '-'}{flag}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark `documents redline` scaling on synthetic agreements.
+
+For each size, generates an agreement (see bench_convert.py) and a revised
+draft with ~3% of paragraphs edited, inserted or deleted, then times the
+full redline (parse both, align, word-diff, write DOCX). Reports time per
+thousand paragraphs; near-linear scaling keeps that roughly flat.
+
+Optionally also times naive whole-document word-level difflib on the same
+pairs, for comparison.
+
+Usage:
+    uv run python scripts/bench_redline.py                        # 250..2000 pages
+    uv run python scripts/bench_redline.py --pages 1000 4000
+    uv run python scripts/bench_redline.py --workers 1                # serial baseline
+    uv run python scripts/bench_redline.py --naive --pages 10 20 40   # naive difflib is quadratic; keep sizes small
+"""
+
+import argparse
+import difflib
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_convert import synthetic_paragraphs, write_docx
+
+from aech_cli_legal.redline import DEFAULT_WORKERS, redline_files
+
+EDIT_RATE = 0.03
+
+# Scaling is "near-linear" if time per paragraph at the largest size is
+# within this factor of the smallest.
+LINEAR_TOLERANCE = 2.0
+
+
+def _edit_text(fragment: str, rng: random.Random) -> str:
+    """Change one word of the first text run in a paragraph fragment."""
+    head, sep, rest = fragment.partition('preserve">')
+    text, end, tail = rest.partition("</w:t>")
+    words = text.split(" ")
+    k = rng.randrange(len(words))
+    words[k] = f"{words[k].upper()} as amended"
+    return head + sep + " ".join(words) + end + tail
+
+
+def revise(body: list[str], seed: int = 11, rate: float = EDIT_RATE) -> list[str]:
+    """A revised draft: roughly equal shares of deleted, inserted and edited paragraphs."""
+    rng = random.Random(seed)
+    revised = []
+    for fragment in body:
+        roll = rng.random()
+        if roll < rate / 3:
+            continue
+        revised.append(fragment)
+        if roll < 2 * rate / 3:
+            revised.append(_edit_text(fragment, rng))
+        elif roll < rate and not fragment.startswith("<w:tbl>"):
+            revised[-1] = _edit_text(fragment, rng)
+    return revised
+
+
+def naive_seconds(body: list[str], revised: list[str]) -> float:
+    """Time word-level difflib over the whole document text."""
+    def words(fragments):
+        return re.findall(r"\w+|[^\w\s]", " ".join(re.sub(r"<[^>]+>", " ", f) for f in fragments))
+
+    started = time.perf_counter()
+    difflib.SequenceMatcher(None, words(body), words(revised), autojunk=False).get_opcodes()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark redline scaling")
+    parser.add_argument("--pages", type=int, nargs="+", default=[250, 500, 1000, 2000], help="Page counts to test")
+    parser.add_argument("--naive", action="store_true", help="Also time naive whole-document difflib")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Redline worker processes")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in sorted(args.pages):
+            body = synthetic_paragraphs(pages)
+            revised = revise(body)
+            original, modified, output = (Path(tmp) / f"{name}-{pages}.docx" for name in ("v1", "v2", "redline"))
+            write_docx(original, body)
+            write_docx(modified, revised)
+
+            started = time.perf_counter()
+            stats = redline_files(original, modified, output, workers=args.workers)
+            seconds = time.perf_counter() - started
+
+            row = {
+                "pages": pages,
+                "paragraphs": len(revised),
+                "seconds": round(seconds, 3),
+                "ms_per_1k_paragraphs": round(1e6 * seconds / len(revised), 1),
+                "modified": stats.modified,
+                "inserted": stats.inserted,
+                "deleted": stats.deleted,
+                "revisions": stats.revisions,
+                "workers": stats.workers,
+                "units": len(stats.units),
+            }
+            if args.naive:
+                row["naive_difflib_seconds"] = round(naive_seconds(body, revised), 3)
+            rows.append(row)
+
+    growth = rows[-1]["ms_per_1k_paragraphs"] / max(rows[0]["ms_per_1k_paragraphs"], 1e-9)
+    print(json.dumps({"runs": rows, "per_paragraph_growth": round(growth, 2)}, indent=2))
+    sys.exit(0 if growth <= LINEAR_TOLERANCE else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Shared fixtures: an isolated clause store and cache, and small DOCX contracts."""
+
+from collections import OrderedDict
+from pathlib import Path
+
+import docx
+import pytest
+
+from aech_cli_legal import clause_store
+
+INDEMNITY = (
+    "The Seller shall indemnify defend and hold harmless the Buyer and its affiliates from and against "
+    "all losses damages liabilities costs and expenses including reasonable legal fees arising out of "
+    "any breach of the representations warranties or covenants of the Seller under this Agreement "
+    "provided that a claim is notified within eighteen months after Closing."
+)
+GOVERNING_LAW = (
+    "This Agreement shall be governed by and construed in accordance with the laws of the State of "
+    "Delaware without regard to its conflict of laws principles."
+)
+NOTICES = (
+    "All notices under this Agreement shall be in writing and delivered by hand courier or email to the "
+    "addresses set out in the schedule."
+)
+CONFIDENTIALITY = (
+    "Each party shall keep confidential all information received from the other party and shall not "
+    "disclose it to any third party without prior written consent."
+)
+
+
+def write_docx(path: Path, sections: list[tuple[str, str]], preamble: str = "") -> Path:
+    """Write a DOCX with an optional preamble paragraph and one Heading 1 plus body paragraph per section."""
+    document = docx.Document()
+    if preamble:
+        document.add_paragraph(preamble)
+    for heading, body in sections:
+        document.add_paragraph(heading, style="Heading 1")
+        document.add_paragraph(body)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document.save(str(path))
+    return path
+
+
+@pytest.fixture
+def store_env(tmp_path, monkeypatch):
+    """Point the clause store and every disk cache at tmp_path, with fresh embedder caches."""
+    monkeypatch.setenv("AECH_LEGAL_CLAUSE_STORE", str(tmp_path / "store"))
+    monkeypatch.setenv("AECH_LEGAL_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(clause_store, "_EMBEDDERS", {})
+    monkeypatch.setattr(clause_store, "_QUERY_VECTORS", OrderedDict())
+    return tmp_path
+
+
+@pytest.fixture
+def deals(store_env):
+    """Two deal documents: an SPA (Delaware, 2023) and an APA (New York, 2024) sharing an indemnity clause."""
+    alpha = write_docx(
+        store_env / "docs" / "alpha" / "spa.docx",
+        [("1. Indemnification", INDEMNITY), ("2. Governing Law", GOVERNING_LAW), ("3. Notices", NOTICES)],
+        preamble="This Stock Purchase Agreement is made between Acme Corp and Beta LLC.",
+    )
+    # The same indemnity with one word changed: a near-duplicate, not an identical text.
+    beta = write_docx(
+        store_env / "docs" / "beta" / "apa.docx",
+        [("1. Indemnification", INDEMNITY.replace("eighteen", "twelve")), ("2. Confidentiality", CONFIDENTIALITY)],
+    )
+    return alpha, beta
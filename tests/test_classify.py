@@ -0,0 +1,48 @@
+"""Batch classification input handling, with the LLM call replaced by a canned result."""
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from aech_cli_legal import main
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    async def classify_text_async(text, use_cache=True, rate_limit=None):
+        return main.EmailClassification(
+            classification="informational", confidence=1.0, topic=text[:20], suggested_action="none", reasoning="test"
+        )
+
+    monkeypatch.setattr(main, "classify_text_async", classify_text_async)
+
+
+def test_unreadable_item_becomes_an_error_record(tmp_path, fake_llm):
+    present = tmp_path / "present.txt"
+    present.write_text("Please note the closing date.")
+    batch = tmp_path / "batch.jsonl"
+    batch.write_text(
+        json.dumps({"id": "a", "path": str(present)}) + "\n"
+        + json.dumps({"id": "b", "path": str(tmp_path / "missing.txt")}) + "\n"
+        + "{not json\n"
+        + json.dumps({"id": "d", "text": "FYI"}) + "\n"
+    )
+
+    result = CliRunner().invoke(main.app, ["classify", "--batch", str(batch)])
+    assert result.exit_code == 0
+    *records, summary = [json.loads(line) for line in result.stdout.splitlines()]
+    by_source = {record["source"]: record for record in records}
+    assert by_source["a"]["classification"] == "informational"
+    assert by_source["d"]["topic"] == "FYI"
+    assert "error" in by_source["b"]
+    assert "Invalid JSON" in by_source[f"{batch}:3"]["error"]
+    assert (summary["total"], summary["succeeded"], summary["failed"]) == (4, 2, 2)
+
+
+@pytest.mark.parametrize("rate_limit", ["0", "-5"])
+def test_rate_limit_must_be_positive(tmp_path, rate_limit):
+    batch = tmp_path / "batch.jsonl"
+    batch.write_text(json.dumps({"text": "FYI"}) + "\n")
+    result = CliRunner().invoke(main.app, ["classify", "--batch", str(batch), "--rate-limit", rate_limit])
+    assert result.exit_code != 0
@@ -0,0 +1,233 @@
+"""Clause store: indexing, search modes, re-indexing, context, filters, clustering and the result cache."""
+
+import pytest
+
+from aech_cli_legal import clauses
+from aech_cli_legal.filters import ClauseFilter
+
+from .conftest import CONFIDENTIALITY, GOVERNING_LAW, INDEMNITY, NOTICES, write_docx
+
+
+def index(path, deal_name, embedder="stub", **kwargs):
+    return clauses.index_document(str(path), deal_name, workers=1, embedder=embedder, **kwargs)
+
+
+def index_deals(deals, embedder="stub"):
+    alpha, beta = deals
+    index(alpha, "Alpha", embedder, deal_date="2023-05-01", contract_type="SPA", jurisdiction="Delaware")
+    return index(beta, "Beta", embedder, deal_date="2024-02-01", contract_type="APA", jurisdiction="New York")
+
+
+def types(result):
+    return [hit["clause_type"] for hit in result.results]
+
+
+@pytest.mark.parametrize("mode", ["vector", "lexical", "hybrid"])
+def test_search_modes_rank_matching_clause_first(deals, mode):
+    # The hashing embedder, unlike stub, places related texts near each other.
+    index_deals(deals, embedder="hashing")
+    result = clauses.search_clauses("indemnify and hold harmless against losses", top_k=3, mode=mode)
+    assert result.status == "complete"
+    assert result.mode == mode
+    assert types(result)[0] == "indemnification"
+    assert result.searched == 6
+
+
+def test_stub_search_returns_scored_results(deals):
+    index_deals(deals)
+    result = clauses.search_clauses("governing law", top_k=10, all_variants=True)
+    # Preamble, indemnification x2, governing law, notices, confidentiality.
+    assert result.searched == 6
+    # Stub vectors are unrelated, so about half the clauses score <= 0 and are left out.
+    scores = [hit["similarity"] for hit in result.results]
+    assert scores and all(score > 0 for score in scores)
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_identical_text_is_stored_once(store_env, deals):
+    alpha, _ = deals
+    index(alpha, "Alpha")
+    again = write_docx(store_env / "docs" / "gamma" / "spa-copy.docx", [("3. Notices", NOTICES)])
+    result = index(again, "Gamma")
+    assert (result.clauses_new, result.clauses_duplicate) == (0, 1)
+
+    hit = clauses.search_clauses("notices in writing courier", top_k=1, mode="lexical").results[0]
+    assert hit["deal_count"] == 2
+    assert {deal["deal_name"] for deal in hit["deals"]} == {"Alpha", "Gamma"}
+
+
+def test_reindex_replaces_changed_clauses(store_env, deals):
+    alpha, _ = deals
+    index(alpha, "Alpha")
+    assert index(alpha, "Alpha").documents_unchanged == 1
+
+    assignment = "Neither party may assign or transfer this Agreement without the consent of the other party."
+    write_docx(alpha, [("1. Indemnification", INDEMNITY), ("3. Assignment", assignment)])
+    result = index(alpha, "Alpha")
+    assert result.documents_indexed == 1
+    assert result.clauses_new == 1
+    assert result.clauses_replaced == 3  # Preamble, governing law, notices
+
+    assert clauses.search_clauses("courier", mode="lexical").results == []
+    hits = clauses.search_clauses("assign transfer", mode="lexical").results
+    assert [hit["clause_type"] for hit in hits] == ["assignment"]
+
+
+def test_get_context_returns_neighbouring_lines(deals):
+    index_deals(deals)
+    hit = clauses.search_clauses("Delaware", top_k=1, mode="lexical").results[0]
+    context = clauses.get_clause_context(hit["clause_id"], context_lines=1)
+    assert context.text.startswith("2. Governing Law\n")
+    assert context.before == INDEMNITY
+    assert context.after == "3. Notices"
+
+    wide = clauses.get_clause_context(hit["clause_id"], context_lines=20)
+    assert wide.before.startswith("This Stock Purchase Agreement")
+    assert wide.after.endswith(NOTICES)
+
+    with pytest.raises(ValueError):
+        clauses.get_clause_context("no-such-clause")
+
+
+def test_filters_restrict_search_and_deals(deals):
+    index_deals(deals)
+
+    def deal_names(criteria):
+        result = clauses.search_clauses("agreement party", top_k=10, mode="lexical", filters=criteria, all_variants=True)
+        return {hit["deal_name"] for hit in result.results}
+
+    assert deal_names(ClauseFilter(contract_types=["spa"])) == {"Alpha"}
+    assert deal_names(ClauseFilter(jurisdictions=["New York"])) == {"Beta"}
+    assert deal_names(ClauseFilter(date_from="2024")) == {"Beta"}
+    assert deal_names(ClauseFilter(date_to="2023-12")) == {"Alpha"}
+    assert deal_names(ClauseFilter(contract_types=["SPA"], date_from="2024")) == set()
+
+    result = clauses.search_clauses("party", top_k=10, mode="lexical", filters=ClauseFilter(clause_types=["confidentiality"]))
+    assert [hit["text"].split("\n", 1)[1] for hit in result.results] == [CONFIDENTIALITY]
+
+    listed = clauses.list_deals(ClauseFilter(jurisdictions=["delaware"]))
+    assert [deal["deal_name"] for deal in listed.deals] == ["Alpha"]
+    assert {deal["deal_name"] for deal in clauses.list_deals().deals} == {"Alpha", "Beta"}
+
+    with pytest.raises(ValueError):
+        ClauseFilter(date_from="2024-13-01")
+
+
+def test_near_duplicates_are_clustered(deals):
+    result = index_deals(deals)
+    assert result.clauses_near_duplicate == 1
+
+    collapsed = clauses.search_clauses("indemnify losses breach", top_k=5, mode="lexical")
+    indemnities = [hit for hit in collapsed.results if hit["clause_type"] == "indemnification"]
+    assert len(indemnities) == 1
+    assert indemnities[0]["variants"] == 1
+
+    expanded = clauses.search_clauses("indemnify losses breach", top_k=5, mode="lexical", all_variants=True)
+    assert types(expanded).count("indemnification") == 2
+
+    listed = clauses.list_clusters()
+    assert listed.total_clusters == 1
+    assert listed.clustered_clauses == 2
+
+
+def test_search_cache_is_invalidated_by_generation_bump(store_env, deals):
+    alpha, beta = deals
+    index(alpha, "Alpha")
+
+    assert not clauses.search_clauses("confidential information").cached
+    assert clauses.search_clauses("  confidential   information ").cached
+    assert not clauses.search_clauses("confidential information", use_cache=False).cached
+
+    index(beta, "Beta")
+    fresh = clauses.search_clauses("confidential information", mode="lexical")
+    assert not fresh.cached
+    assert types(fresh)[0] == "confidentiality"
+    assert clauses.search_clauses("confidential information", mode="lexical").cached
+
+    clauses.build_clause_index(nlist=2)
+    assert not clauses.search_clauses("confidential information", mode="lexical").cached
+
+
+def test_same_file_name_in_two_folders_gets_distinct_ids(store_env):
+    data_room = store_env / "dataroom"
+    write_docx(data_room / "x" / "spa.docx", [("1. Indemnification", INDEMNITY)])
+    write_docx(data_room / "y" / "spa.docx", [("1. Confidentiality", CONFIDENTIALITY)])
+    result = index(data_room, "Alpha")
+    assert result.status == "complete"
+    assert result.documents_indexed == 2
+
+    hits = clauses.search_clauses("agreement party indemnify", top_k=10, mode="lexical", all_variants=True).results
+    ids = [hit["clause_id"] for hit in hits]
+    assert len(ids) == 2 and len(set(ids)) == 2
+
+
+def test_merge_keeps_replaced_segments_until_the_next_merge(store_env):
+    from aech_cli_legal.clause_store import ClauseStore
+
+    store = ClauseStore()
+    texts = [INDEMNITY, NOTICES, CONFIDENTIALITY, "Time is of the essence of every obligation."]
+    for n, text in enumerate(texts):
+        index(write_docx(store_env / "docs" / f"d{n}.docx", [("1. Term", text)]), f"Deal {n}")
+    (store.lexicon_dir / "seg-orphan").mkdir()  # Left by a rolled-back write
+    before = {path.name for path in store.lexicon_dir.iterdir()} - {"seg-orphan"}
+    assert len(before) == 4
+
+    store.merge_lexicon()
+    after = {path.name for path in store.lexicon_dir.iterdir()}
+    assert before < after and "seg-orphan" not in after
+    (merged,) = after - before
+    assert clauses.search_clauses("courier", mode="lexical").results
+
+    index(write_docx(store_env / "docs" / "d4.docx", [("1. Term", GOVERNING_LAW)]), "Deal 4")
+    store.merge_lexicon()
+    remaining = {path.name for path in store.lexicon_dir.iterdir()}
+    assert not remaining & before
+    assert merged in remaining and len(remaining) == 3  # Segments just merged, and the new merge
+    assert clauses.search_clauses("courier", mode="lexical", use_cache=False).results
+
+
+def test_filter_columns_keep_the_previous_generation(store_env, deals):
+    from aech_cli_legal.clause_store import ClauseStore
+
+    store = ClauseStore()
+    criteria = ClauseFilter(clause_types=["indemnification"])
+    saved = []
+    for n, path in enumerate([*deals, write_docx(store_env / "docs" / "gamma.docx", [("1. Notices", NOTICES)])]):
+        index(path, f"Deal {n}")
+        assert clauses.search_clauses("indemnify", mode="lexical", filters=criteria).results
+        saved.append(sorted(path.name for path in store.filters_dir.iterdir()))
+    assert len(saved[0]) == 1
+    assert saved[1][0] == saved[0][0] and len(saved[1]) == 2
+    assert saved[2][0] == saved[1][1] and len(saved[2]) == 2
+
+
+def test_clusters_read_without_the_write_lock(deals, monkeypatch):
+    import sqlite3
+
+    from aech_cli_legal.clause_store import ClauseStore
+
+    index_deals(deals)
+    connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", lambda *args, **kwargs: connect(*args, **{**kwargs, "timeout": 0.2}))
+    with ClauseStore().connect() as writer:
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            assert clauses.list_clusters(min_size=2).clustered_clauses == 2
+        finally:
+            writer.execute("ROLLBACK")
+
+
+def test_ivf_builds_switch_atomically_and_keep_the_previous_build(deals):
+    from aech_cli_legal.clause_store import ClauseStore
+
+    index_deals(deals)
+    store = ClauseStore()
+    builds = []
+    for _ in range(3):
+        clauses.build_clause_index(nlist=2)
+        with store.connect() as conn:
+            builds.append(store._meta(conn)["ivf_build"])
+        result = clauses.search_clauses("confidential information", index_type="ivf", nprobe=2)
+        assert types(result)[0] == "confidentiality"
+    assert len(set(builds)) == 3
+    assert sorted(path.name for path in store.ivf_dir.iterdir()) == sorted(builds[1:])
@@ -0,0 +1,87 @@
+"""Daemon client: subprocess fallback only when the daemon never received the request."""
+
+import json
+import socket
+import subprocess
+import threading
+
+import pytest
+
+from aech_cli_legal import client
+
+
+@pytest.fixture
+def daemon_socket(tmp_path, monkeypatch):
+    path = tmp_path / "daemon.sock"
+    monkeypatch.setenv("AECH_LEGAL_SOCKET", str(path))
+    monkeypatch.delenv("AECH_LEGAL_NO_DAEMON", raising=False)
+    return path
+
+
+@pytest.fixture
+def subprocess_calls(monkeypatch):
+    calls = []
+
+    def run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, "fallback\n", "")
+
+    monkeypatch.setattr(client.subprocess, "run", run)
+    return calls
+
+
+def serve_once(path, respond):
+    """Accept one connection on a Unix socket, read the request line and hand the connection to respond."""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen(1)
+
+    def handle():
+        connection, _ = server.accept()
+        with connection, connection.makefile("rwb") as stream:
+            stream.readline()
+            respond(stream)
+        server.close()
+
+    thread = threading.Thread(target=handle, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_response_comes_from_daemon(daemon_socket, subprocess_calls):
+    def respond(stream):
+        stream.write(json.dumps({"exit_code": 0, "stdout": "{}\n", "stderr": ""}).encode() + b"\n")
+
+    thread = serve_once(daemon_socket, respond)
+    completed = client.run_cli(["aech-cli-legal", "clauses", "deals"], check=True)
+    thread.join(5)
+    assert completed.stdout == "{}\n"
+    assert subprocess_calls == []
+
+
+def test_lost_response_is_not_retried(daemon_socket, subprocess_calls, monkeypatch):
+    thread = serve_once(daemon_socket, lambda stream: None)  # Reads the request, closes without replying
+    completed = client.run_cli(["aech-cli-legal", "documents", "edit", "a.docx"])
+    thread.join(5)
+    assert completed.returncode == 1
+    assert "may have run" in completed.stderr
+    assert subprocess_calls == []
+
+    second = daemon_socket.with_name("second.sock")
+    monkeypatch.setenv("AECH_LEGAL_SOCKET", str(second))
+    thread = serve_once(second, lambda stream: stream.write(b"not json\n"))
+    with pytest.raises(subprocess.CalledProcessError):
+        client.run_cli(["aech-cli-legal", "clauses", "index", "x"], check=True)
+    thread.join(5)
+    assert subprocess_calls == []
+
+
+def test_undelivered_request_falls_back_to_subprocess(daemon_socket, subprocess_calls):
+    # A stale socket file with nothing listening: the connection is refused.
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(daemon_socket))
+    stale.close()
+
+    completed = client.run_cli(["aech-cli-legal", "clauses", "deals"])
+    assert completed.stdout == "fallback\n"
+    assert subprocess_calls == [["aech-cli-legal", "clauses", "deals"]]
@@ -0,0 +1,85 @@
+"""Document editing, and analysis argument checks that run before any LLM call."""
+
+import docx
+import pytest
+from docx.oxml.ns import qn
+
+from aech_cli_legal import documents
+
+from .conftest import GOVERNING_LAW, NOTICES, write_docx
+
+
+def edits(*pairs):
+    return documents.ExtractedEdits(
+        edits=[
+            documents.EditInstruction(section=None, original_text=old, replacement_text=new, context="")
+            for old, new in pairs
+        ],
+        summary="",
+    )
+
+
+def test_edit_writes_output_when_an_edit_applies(store_env, tmp_path):
+    source = write_docx(tmp_path / "spa.docx", [("1. Governing Law", GOVERNING_LAW)])
+    result = documents.apply_extracted_edits(str(source), edits(("Delaware", "New York")), str(tmp_path / "out.docx"))
+    assert result.status == "complete"
+    assert result.output == str(tmp_path / "out.docx")
+    assert "New York" in documents.load_document_text(result.output)
+
+
+def test_edit_reports_no_output_when_nothing_applies(store_env, tmp_path):
+    source = write_docx(tmp_path / "spa.docx", [("1. Governing Law", GOVERNING_LAW)])
+    result = documents.apply_extracted_edits(str(source), edits(("Texas", "New York")), str(tmp_path / "out.docx"))
+    assert result.status == "no_changes"
+    assert result.output is None
+    assert not (tmp_path / "out.docx").exists()
+
+
+def wrap_in_content_control(path, first, last):
+    """Move body paragraphs first..last of the DOCX at path into one block-level w:sdt."""
+    document = docx.Document(str(path))
+    body = document.element.body
+    paragraphs = [p._p for p in document.paragraphs][first:last + 1]
+    sdt = body.makeelement(qn("w:sdt"), {})
+    content = sdt.makeelement(qn("w:sdtContent"), {})
+    sdt.append(content)
+    paragraphs[0].addprevious(sdt)
+    content.extend(paragraphs)
+    document.save(str(path))
+
+
+def test_paragraphs_in_content_controls_are_read_and_edited(store_env, tmp_path):
+    source = write_docx(tmp_path / "spa.docx", [("1. Notices", NOTICES), ("2. Governing Law", GOVERNING_LAW)])
+    wrap_in_content_control(source, 2, 3)
+    text = documents.load_document_text(str(source))
+    assert "2. Governing Law" in text and "Delaware" in text
+
+    result = documents.apply_extracted_edits(str(source), edits(("Delaware", "New York")), str(tmp_path / "out.docx"))
+    assert result.status == "complete"
+    assert "New York" in documents.load_document_text(result.output)
+
+
+@pytest.mark.parametrize("chunk_size", [0, -5])
+def test_analyze_rejects_non_positive_chunk_size(chunk_size):
+    with pytest.raises(ValueError):
+        documents.analyze_text_with_stats("1. Definitions\nTerms.\n2. Payment\nFees.", chunk_size=chunk_size)
+
+
+def test_analyze_sends_a_short_document_in_one_request(store_env, monkeypatch):
+    from aech_cli_legal import agents
+
+    prompts = []
+
+    async def fake_run_async(result_type, prompt, cache_key=None, rate_limit=None):
+        prompts.append(prompt)
+        return result_type(regulatory_categories={}, jurisdictions=[], risk_level="none", key_concerns=[], reasoning="")
+
+    monkeypatch.setattr(agents, "run_async", fake_run_async)
+    text = "".join(f"{n}. Section {n}\n{GOVERNING_LAW * 6}\n" for n in range(1, 21))
+    assert len(text) < documents.ANALYZE_CHUNK_SIZE
+
+    _, stats = documents.analyze_text_with_stats(text, use_cache=False)
+    assert (stats.chunks, len(prompts)) == (1, 1)
+
+    _, stats = documents.analyze_text_with_stats(text, use_cache=False, chunk_size=8000, incremental=True)
+    assert stats.chunks > 1 and len(prompts) == 1 + stats.chunks
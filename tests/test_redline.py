@@ -0,0 +1,22 @@
+"""Redline statistics."""
+
+from aech_cli_legal.redline import redline_files
+
+from .conftest import CONFIDENTIALITY, GOVERNING_LAW, NOTICES, write_docx
+
+
+def test_unit_stats_count_blocks_before_the_diff(tmp_path):
+    original = write_docx(tmp_path / "v1.docx", [("1. Notices", NOTICES), ("2. Governing Law", GOVERNING_LAW)])
+    modified = write_docx(tmp_path / "v2.docx", [("1. Confidentiality", CONFIDENTIALITY), ("2. Governing Law", GOVERNING_LAW)])
+    stats = redline_files(original, modified, tmp_path / "redline.docx", workers=1)
+    assert stats.deleted and stats.inserted
+    assert sum(unit["old_blocks"] for unit in stats.units) == 4
+
+
+def test_unit_of_deleted_sections_has_no_new_blocks(tmp_path):
+    original = write_docx(tmp_path / "v1.docx", [("1. Notices", NOTICES), ("2. Governing Law", GOVERNING_LAW)])
+    modified = write_docx(tmp_path / "v2.docx", [("2. Governing Law", GOVERNING_LAW)])
+    stats = redline_files(original, modified, tmp_path / "redline.docx", workers=1)
+    deleted, kept = stats.units
+    assert (deleted["old_blocks"], deleted["new_blocks"]) == (2, 0)
+    assert (kept["old_blocks"], kept["new_blocks"]) == (2, 2)
@@ -0,0 +1,74 @@
+"""Research commands over the local file-backed provider, and the response cache."""
+
+import json
+
+import pytest
+
+from aech_cli_legal import research
+
+CASES = [
+    {"title": "Smith v. Van Gorkom", "jurisdiction": "US-DE", "summary": "Directors breached the duty of care approving a merger."},
+    {"title": "Caparo Industries v Dickman", "jurisdiction": "UK", "summary": "Duty of care test for negligent misstatement."},
+]
+STATUTES = [
+    {"title": "8 Del. C. 251", "jurisdiction": "US-DE", "summary": "Board approval of a merger agreement."},
+]
+
+
+@pytest.fixture
+def research_data(tmp_path, monkeypatch):
+    data = tmp_path / "research"
+    data.mkdir()
+    for name, records in (("cases", CASES), ("statutes", STATUTES)):
+        (data / f"{name}.jsonl").write_text("".join(json.dumps(record) + "\n" for record in records))
+    monkeypatch.setenv("AECH_LEGAL_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("AECH_LEGAL_RESEARCH_DATA", str(data))
+    monkeypatch.delenv("AECH_LEGAL_RESEARCH_PROVIDER", raising=False)
+    monkeypatch.delenv("AECH_LEGAL_RESEARCH_URL", raising=False)
+    return data
+
+
+def titles(result):
+    return [record["title"] for record in result.results]
+
+
+def test_query_searches_cases_and_statutes(research_data):
+    result = research.research_query("merger duty of care")
+    assert result.provider == "local"
+    assert result.status == "complete"
+    assert titles(result.cases)[0] == "Smith v. Van Gorkom"
+    assert titles(result.statutes) == ["8 Del. C. 251"]
+
+
+def test_jurisdiction_matches_sub_jurisdictions(research_data):
+    assert titles(research.search_cases("duty of care", "US")) == ["Smith v. Van Gorkom"]
+    assert titles(research.search_cases("duty of care", "uk")) == ["Caparo Industries v Dickman"]
+    assert titles(research.search_cases("duty of care", "EU")) == []
+
+
+def test_responses_are_cached_until_data_changes(research_data):
+    assert not research.research_query("merger").cases.cached
+    repeated = research.research_query("  merger ")
+    assert repeated.cases.cached and repeated.statutes.cached
+    assert research.search_cases("merger").cached  # Shares entries with research query
+    assert not research.search_cases("merger", use_cache=False).cached
+
+    with open(research_data / "cases.jsonl", "a") as handle:
+        handle.write(json.dumps({"title": "In re Merger Litigation", "summary": "A merger case."}) + "\n")
+    changed = research.search_cases("merger")
+    assert not changed.cached
+    assert "In re Merger Litigation" in titles(changed)
+
+
+def test_stub_provider_and_errors(research_data, monkeypatch):
+    result = research.research_query("merger", provider="stub")
+    assert result.status == "stub"
+    assert result.cases.results == [] and result.statutes.results == []
+
+    with pytest.raises(ValueError):
+        research.search_cases("merger", provider="westlaw")
+    with pytest.raises(ValueError):
+        research.search_cases("   ")
+    monkeypatch.delenv("AECH_LEGAL_RESEARCH_DATA")
+    with pytest.raises(ValueError):
+        research.search_cases("merger", provider="local")
@@ -0,0 +1,38 @@
+"""Daemon dispatch: per-request environment, and LLM commands kept off the in-process lock."""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from aech_cli_legal import server
+
+
+def test_request_environment_selects_the_cache(tmp_path):
+    directories = []
+    for name in ("a", "b"):
+        response = server.dispatch(["documents", "cache"], str(tmp_path), {"AECH_LEGAL_CACHE_DIR": str(tmp_path / name)})
+        assert response["exit_code"] == 0, response["stderr"]
+        directories.append(json.loads(response["stdout"])["directory"])
+    assert directories == [str(tmp_path / "a" / "parsed"), str(tmp_path / "b" / "parsed")]
+
+
+def test_llm_commands_do_not_block_other_requests(tmp_path, monkeypatch):
+    release = threading.Event()
+    run_command = server.run_command
+
+    def fake_run_command(argv, cwd=None, env=None):
+        if server.is_llm_command(argv):
+            assert release.wait(10)
+            return {"exit_code": 0, "stdout": "classified\n", "stderr": ""}
+        return run_command(argv, cwd, env)
+
+    monkeypatch.setattr(server, "run_command", fake_run_command)
+    monkeypatch.setattr(server, "_llm_pool", ThreadPoolExecutor(max_workers=1))
+    with ThreadPoolExecutor(max_workers=1) as requests:
+        slow = requests.submit(server.dispatch, ["classify", "email.txt"], str(tmp_path))
+        assert server.dispatch(["documents", "cache"], str(tmp_path))["exit_code"] == 0
+        assert not slow.done()
+        release.set()
+        assert slow.result(10)["stdout"] == "classified\n"
+    assert server.is_llm_command(["documents", "analyze", "spa.docx"])
+    assert not server.is_llm_command(["documents", "analyze", "--help"])